@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""
+asyncio front end for the banking system exercise.
+"""
+import asyncio
+
+from white_box.class_exercises import BankingSystem
+
+
+class AsyncBankingSystem:
+    """
+    Non-blocking facade over a quiet BankingSystem.
+    Requests are routed by account to one of several bounded queues, each
+    served by a single worker task, so the requests of an account are
+    processed in order. Workers run the calls in the default executor, so
+    slow ones (e.g. password hashing) do not block the event loop; the
+    thread-safe SessionStore and Ledger let them run side by side. When
+    a queue is full callers wait, which gives backpressure instead of
+    unbounded buffering.
+    """
+
+    def __init__(self, bank=None, workers=8, queue_size=1000):
+        """
+        Set the wrapped banking system and the queue layout.
+        """
+        if workers < 1:
+            raise ValueError("There must be at least one worker")
+
+        self.bank = BankingSystem(quiet=True) if bank is None else bank
+        self._queues = [asyncio.Queue(maxsize=queue_size) for _ in range(workers)]
+        self._tasks = []
+
+    async def __aenter__(self):
+        """
+        Starts the workers.
+        """
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """
+        Stops the workers once the queued requests are processed.
+        """
+        await self.close()
+
+    def start(self):
+        """
+        Starts one worker task per queue on the running loop.
+        """
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._worker(queue)) for queue in self._queues
+            ]
+
+    async def close(self):
+        """
+        Waits for the queued requests and stops the workers.
+        """
+        for queue in self._queues:
+            await queue.join()
+
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    @staticmethod
+    async def _worker(queue):
+        """
+        Processes the requests of a queue one at a time.
+        """
+        while True:
+            function, args, future = await queue.get()
+            try:
+                if not future.cancelled():
+                    result = await asyncio.to_thread(function, *args)
+                    if not future.cancelled():
+                        future.set_result(result)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                if not future.cancelled():
+                    future.set_exception(error)
+            finally:
+                queue.task_done()
+
+    async def _submit(self, account, function, *args):
+        """
+        Queues a request on the queue of the account and waits its result.
+        """
+        if not self._tasks:
+            raise RuntimeError("AsyncBankingSystem is not started")
+
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues[hash(account) % len(self._queues)]
+        await queue.put((function, args, future))
+        return await future
+
+    async def authenticate(self, username, password):
+        """
+        User authentication coroutine.
+        """
+        return await self._submit(username, self.bank.authenticate, username, password)
+
+    async def transfer_money(self, sender, receiver, amount, transaction_type):
+        """
+        Money transfer coroutine, ordered with the other sender requests.
+        """
+        return await self._submit(
+            sender, self.bank.transfer_money, sender, receiver, amount, transaction_type
+        )
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+
+"""
+Building blocks for the banking system exercise.
+"""
+import math
+import threading
+from array import array
+
+from white_box.money import (
+    BASIS_POINTS,
+    FEE_BASIS_POINTS,
+    HALF_BASIS_POINT,
+    cents_of,
+    to_cents,
+)
+
+
+def amount_cents(amount):
+    """
+    Provides the cents of an amount of dollars that can be moved, or None
+    when it is not positive and finite or rounds to less than a cent.
+    """
+    if not (amount > 0 and math.isfinite(amount)):
+        return None
+
+    cents = cents_of(amount)
+    return cents if cents > 0 else None
+
+
+def _check_amount(amount):
+    """
+    Provides the cents of an amount, raising a ValueError for an amount
+    that cannot be moved.
+    """
+    cents = amount_cents(amount)
+    if cents is None:
+        raise ValueError(f"Invalid amount: {amount}")
+
+    return cents
+
+
+class SessionStore:
+    """
+    Thread-safe set of logged in users.
+    Users are spread over shards, each guarded by its own lock, so
+    threads working on different users rarely wait for each other.
+    """
+
+    def __init__(self, shards=16):
+        """
+        Creates the shards and their locks.
+        """
+        if shards < 1:
+            raise ValueError("There must be at least one shard")
+
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._shards = [set() for _ in range(shards)]
+
+    def _shard(self, username):
+        """
+        Provides the lock and set holding the given user.
+        """
+        index = hash(username) % len(self._shards)
+        return self._locks[index], self._shards[index]
+
+    def add(self, username):
+        """
+        Logs a user in. Returns False when the user was already logged in.
+        """
+        lock, shard = self._shard(username)
+        with lock:
+            if username in shard:
+                return False
+
+            shard.add(username)
+            return True
+
+    def discard(self, username):
+        """
+        Logs a user out. Returns False when the user was not logged in.
+        """
+        lock, shard = self._shard(username)
+        with lock:
+            if username not in shard:
+                return False
+
+            shard.remove(username)
+            return True
+
+    def __contains__(self, username):
+        """
+        Checks if a user is logged in.
+        """
+        lock, shard = self._shard(username)
+        with lock:
+            return username in shard
+
+    def __len__(self):
+        """
+        Provides the number of logged in users.
+        """
+        return sum(len(shard) for shard in self._shards)
+
+    def __iter__(self):
+        """
+        Iterates over a snapshot of the logged in users.
+        """
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                users = list(shard)
+            yield from users
+
+
+class Ledger:
+    """
+    In-memory account ledger.
+    Balances are stored as integer cents in a compact array indexed by
+    account number, so repeated debits and credits do not drift, and
+    every operation runs under a lock, so they are atomic. Amounts are
+    given in dollars and rounded half up to the cent. Unknown accounts
+    are opened on first use with default_balance.
+    """
+
+    def __init__(self, default_balance=0):
+        """
+        Creates an empty ledger.
+        """
+        self.default_balance = default_balance
+        self._default_cents = to_cents(default_balance)
+        self._index = {}
+        self._balances = array("q")
+        self._lock = threading.Lock()
+
+    def _slot(self, account_number):
+        """
+        Provides the balance position of an account, opening it if needed.
+        Must be called with the lock held.
+        """
+        slot = self._index.get(account_number)
+        if slot is None:
+            slot = self._index[account_number] = len(self._balances)
+            self._balances.append(self._default_cents)
+
+        return slot
+
+    def open_account(self, account_number, balance):
+        """
+        Opens an account (or resets it) with the given balance.
+        """
+        cents = to_cents(balance)
+        with self._lock:
+            self._balances[self._slot(account_number)] = cents
+
+    def cents(self, account_number):
+        """
+        Provides the balance of an account in cents.
+        """
+        with self._lock:
+            slot = self._index.get(account_number)
+            return self._default_cents if slot is None else self._balances[slot]
+
+    def balance(self, account_number):
+        """
+        Provides the balance of an account in dollars.
+        """
+        return self.cents(account_number) / 100
+
+    def __contains__(self, account_number):
+        """
+        Checks if an account has been opened.
+        """
+        return account_number in self._index
+
+    def __len__(self):
+        """
+        Provides the number of accounts.
+        """
+        return len(self._index)
+
+    def deposit(self, account_number, amount):
+        """
+        Credits an account.
+        """
+        cents = _check_amount(amount)
+        with self._lock:
+            self._balances[self._slot(account_number)] += cents
+
+    def withdraw(self, account_number, amount):
+        """
+        Debits an account. Returns False when the funds are insufficient.
+        """
+        cents = _check_amount(amount)
+        with self._lock:
+            slot = self._slot(account_number)
+            if self._balances[slot] < cents:
+                return False
+
+            self._balances[slot] -= cents
+            return True
+
+    def transfer(self, sender, receiver, amount, fee=0):
+        """
+        Moves amount from sender to receiver, also debiting the fee (Money
+        or dollars) from the sender. Returns False when the funds are
+        insufficient and raises a ValueError when the amount is not
+        positive and finite.
+        """
+        return self.transfer_cents(
+            sender, receiver, _check_amount(amount), cents_of(fee)
+        )
+
+    def transfer_cents(self, sender, receiver, cents, fee_cents=0):
+        """
+        Transfer of amounts already in cents (see amount_cents).
+        """
+        with self._lock:
+            return self._transfer(sender, receiver, cents, fee_cents)
+
+    def _transfer(self, sender, receiver, cents, fee_cents):
+        """
+        Transfer of cents without locking. Must be called with the lock held.
+        """
+        sender_slot = self._slot(sender)
+        if self._balances[sender_slot] < cents + fee_cents:
+            return False
+
+        self._balances[sender_slot] -= cents + fee_cents
+        self._balances[self._slot(receiver)] += cents
+        return True
+
+    def transfer_batch(self, transfers):
+        """
+        Applies many (sender, receiver, amount, transaction_type) transfers
+        in order under a single lock, with the fees of money.transfer_fee.
+        Returns one status per transfer: "transfer_processed",
+        "invalid_transaction_type", "invalid_amount" or "insufficient_funds".
+        """
+        statuses = []
+
+        with self._lock:
+            for sender, receiver, amount, transaction_type in transfers:
+                rate = FEE_BASIS_POINTS.get(transaction_type)
+                if rate is None:
+                    statuses.append("invalid_transaction_type")
+                    continue
+
+                cents = amount_cents(amount)
+                if cents is None:
+                    statuses.append("invalid_amount")
+                elif self._transfer(
+                    sender,
+                    receiver,
+                    cents,
+                    (cents * rate + HALF_BASIS_POINT) // BASIS_POINTS,
+                ):
+                    statuses.append("transfer_processed")
+                else:
+                    statuses.append("insufficient_funds")
+
+        return statuses
@@ -0,0 +1,633 @@
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmarks comparing the batch helpers with the per-call exercises.
+Run with: python -m white_box.benchmarks [name ...]
+"""
+import argparse
+import asyncio
+import decimal
+import os
+import random
+import tempfile
+import timeit
+import tracemalloc
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from white_box import class_exercises as ce
+from white_box.async_banking import AsyncBankingSystem
+from white_box.catalog import ProductCatalog
+from white_box.credentials import CredentialStore
+from white_box.fleet import Fleet
+from white_box.loans import LOAN_GRID, loan_decisions
+from white_box.money import (
+    FEE_RATES,
+    Money,
+    order_total,
+    order_totals,
+    total_discount,
+    total_discounts,
+    transfer_fees,
+)
+from white_box.parallel import parallel_map
+from white_box.passwords import validate_passwords
+from white_box.pricing import (
+    calculate_order_totals,
+    calculate_shipping_costs,
+    quote_checkouts,
+    quote_items_shipping,
+)
+from white_box.records import scan_file
+from white_box.telemetry import SensorStream, process_readings
+from white_box.validators import (
+    is_valid_card,
+    scan_card_records,
+    validate_cards,
+    validate_dates,
+    validate_emails,
+    validate_urls,
+)
+
+
+def _report(name, count, seconds):
+    """
+    Prints the throughput of a benchmark.
+    """
+    print(f"{name:<45} {count / seconds:>14,.0f} ops/s")
+
+
+def _allocated(func):
+    """
+    Returns the result of func and the bytes it left allocated.
+    """
+    tracemalloc.start()
+    try:
+        result = func()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def _time(func, repeat):
+    """
+    Returns the best wall time of running func repeat times.
+    """
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def bench_order_totals(size, repeat):
+    """
+    Per-order calculate_order_total vs columnar calculate_order_totals.
+    """
+    rng = random.Random(1)
+    orders = [
+        [
+            {"quantity": rng.randint(1, 20), "price": rng.uniform(1, 100)}
+            for _ in range(rng.randint(1, 10))
+        ]
+        for _ in range(size)
+    ]
+    quantities = array("l", [i["quantity"] for o in orders for i in o])
+    prices = array("d", [i["price"] for o in orders for i in o])
+    sizes = array("l", [len(o) for o in orders])
+
+    seconds = _time(lambda: [ce.calculate_order_total(o) for o in orders], repeat)
+    _report("calculate_order_total (per order)", len(quantities), seconds)
+
+    seconds = _time(lambda: calculate_order_totals(quantities, prices, sizes), repeat)
+    _report("calculate_order_totals (columnar)", len(quantities), seconds)
+
+
+def bench_shipping(size, repeat):
+    """
+    Per-call shipping functions vs the bulk quoting helpers.
+    """
+    rng = random.Random(2)
+    carts = [
+        [{"weight": rng.uniform(0, 4)} for _ in range(rng.randint(1, 10))]
+        for _ in range(size)
+    ]
+    methods = ("standard", "express")
+
+    seconds = _time(
+        lambda: [
+            {m: ce.calculate_items_shipping_cost(c, m) for m in methods} for c in carts
+        ],
+        repeat,
+    )
+    _report("calculate_items_shipping_cost (per call)", len(carts), seconds)
+
+    seconds = _time(lambda: quote_items_shipping(carts, methods), repeat)
+    _report("quote_items_shipping (bulk)", len(carts), seconds)
+
+    columns = [array("d", [rng.uniform(0, 40) for _ in range(size)]) for _ in range(4)]
+
+    seconds = _time(lambda: list(map(ce.calculate_shipping_cost, *columns)), repeat)
+    _report("calculate_shipping_cost (per call)", size, seconds)
+
+    seconds = _time(lambda: calculate_shipping_costs(*columns), repeat)
+    _report("calculate_shipping_costs (columnar)", size, seconds)
+
+
+def bench_passwords(size, repeat):
+    """
+    validate_password vs the single-pass validate_passwords.
+    """
+    rng = random.Random(3)
+    alphabet = "abcdefgABCDEFG0123456789!@#$%&-"
+    passwords = [
+        "".join(rng.choices(alphabet, k=rng.randint(6, 16))) for _ in range(size)
+    ]
+
+    seconds = _time(lambda: list(map(ce.validate_password, passwords)), repeat)
+    _report("validate_password (regex)", size, seconds)
+
+    seconds = _time(lambda: list(validate_passwords(passwords)), repeat)
+    _report("validate_passwords (single pass)", size, seconds)
+
+
+def bench_parallel(size, repeat):
+    """
+    parallel_map scaling with 1, 2, 4, ... workers up to the CPU count.
+    """
+    rng = random.Random(4)
+    passwords = ["".join(rng.choices("aA1@xyz", k=12)) for _ in range(size)]
+    loans = [(rng.randint(0, 100000), rng.randint(300, 850)) for _ in range(size)]
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        seconds = _time(
+            lambda w=workers: list(
+                parallel_map(ce.validate_password, passwords, w, 10_000)
+            ),
+            repeat,
+        )
+        _report(f"validate_password x{workers} workers", size, seconds)
+
+        seconds = _time(
+            lambda w=workers: list(
+                parallel_map(ce.check_loan_eligibility, loans, w, 10_000, True)
+            ),
+            repeat,
+        )
+        _report(f"check_loan_eligibility x{workers} workers", size, seconds)
+        workers *= 2
+
+
+def bench_fleet(size, repeat):
+    """
+    TrafficLight objects vs a Fleet of traffic lights, one tick each.
+    """
+    lights = [ce.TrafficLight() for _ in range(size)]
+    fleet = Fleet(ce.TrafficLight, size)
+
+    seconds = _time(lambda: [light.change_state() for light in lights], repeat)
+    _report("TrafficLight.change_state (objects)", size, seconds)
+
+    seconds = _time(lambda: fleet.apply("change_state"), repeat)
+    _report("Fleet.apply (bytearray)", size, seconds)
+
+
+def _authenticate_and_transfer(bank, usernames):
+    """
+    Logs every user in and makes one transfer each.
+    """
+    for username in usernames:
+        bank.authenticate(username, "secret")
+        bank.transfer_money(username, "user123", 10, "regular")
+
+
+def bench_banking_threads(size, repeat):
+    """
+    Quiet BankingSystem authenticate + transfer throughput by thread count.
+    """
+    threads = 1
+    while threads <= 8:
+
+        def run(threads=threads):
+            bank = ce.BankingSystem(quiet=True)
+            bank.users.update((f"client{n}", "secret") for n in range(size))
+            usernames = [f"client{n}" for n in range(size)]
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                for start in range(threads):
+                    executor.submit(
+                        _authenticate_and_transfer, bank, usernames[start::threads]
+                    )
+
+        _report(f"authenticate + transfer x{threads} threads", size, _time(run, repeat))
+        threads *= 2
+
+
+def bench_ledger(size, repeat):
+    """
+    BankingSystem.transfer_money calls vs one transfer_batch call.
+    """
+    rng = random.Random(5)
+    types = ("regular", "express", "scheduled")
+    accounts = [f"acct{n}" for n in range(1000)]
+    transfers = [
+        (rng.choice(accounts), rng.choice(accounts), 1, rng.choice(types))
+        for _ in range(size)
+    ]
+
+    def make_bank():
+        bank = ce.BankingSystem(quiet=True, max_events=1)
+        for account in accounts:
+            bank.logged_in_users.add(account)
+        return bank
+
+    bank = make_bank()
+    seconds = _time(lambda: [bank.transfer_money(*t) for t in transfers], repeat)
+    _report("BankingSystem.transfer_money (per call)", size, seconds)
+
+    bank = make_bank()
+    seconds = _time(lambda: bank.transfer_batch(transfers), repeat)
+    _report("BankingSystem.transfer_batch", size, seconds)
+
+
+async def _simulate_clients(clients, transfers):
+    """
+    Runs clients concurrent clients that log in and make transfers.
+    """
+    async with AsyncBankingSystem(workers=32, queue_size=1000) as system:
+        system.bank.users.update((f"client{n}", "secret") for n in range(clients))
+
+        async def client(username):
+            await system.authenticate(username, "secret")
+            for _ in range(transfers):
+                await system.transfer_money(username, "user123", 1, "regular")
+
+        await asyncio.gather(*(client(f"client{n}") for n in range(clients)))
+
+
+def bench_async_clients(size, repeat):
+    """
+    Load test of AsyncBankingSystem with size concurrent clients.
+    """
+    seconds = _time(lambda: asyncio.run(_simulate_clients(size, 4)), repeat)
+    _report(f"AsyncBankingSystem ({size:,} clients, 5 requests)", size * 5, seconds)
+
+
+def bench_credentials(size, repeat):
+    """
+    Cold PBKDF2 verification vs cached verification by hashing cost.
+    """
+    logins = max(1, min(size, 20))
+    for iterations in (10_000, 100_000, 600_000):
+        store = CredentialStore(iterations=iterations, cache_size=logins)
+        for n in range(logins):
+            store.set_password(f"user{n}", "secret")
+
+        def verify_all(store=store):
+            for n in range(logins):
+                store.verify(f"user{n}", "secret")
+
+        seconds = _time(
+            lambda store=store, verify_all=verify_all: (
+                store.cache_clear(),
+                verify_all(),
+            ),
+            repeat,
+        )
+        _report(f"cold verify ({iterations:,} iterations)", logins, seconds)
+
+        seconds = _time(verify_all, repeat)
+        _report(f"cached verify ({iterations:,} iterations)", logins, seconds)
+
+
+def bench_url_email(size, repeat):
+    """
+    Naive validate_url/validate_email vs the structured batch validators.
+    """
+    # Every value distinct, like real batches of addresses
+    urls = [f"https://host{n}.test.com/path?q={n}" for n in range(size)]
+    emails = [f"first{n}.last@test{n}.com" for n in range(size)]
+    invalid_urls = [
+        (f"ftp://host{n}.test.com", f"https://host{n}-.test.com", f"not a url {n}")[
+            n % 3
+        ]
+        for n in range(size)
+    ]
+    invalid_emails = [
+        (f"first{n}@test", f"first{n}@-test.com", f"garbage {n}")[n % 3]
+        for n in range(size)
+    ]
+
+    for label, url_batch, email_batch in (
+        ("valid", urls, emails),
+        ("invalid", invalid_urls, invalid_emails),
+    ):
+        seconds = _time(lambda b=url_batch: list(map(ce.validate_url, b)), repeat)
+        _report(f"validate_url (naive, {label})", size, seconds)
+
+        seconds = _time(lambda b=url_batch: list(validate_urls(b)), repeat)
+        _report(f"validate_urls (structured, {label})", size, seconds)
+
+        seconds = _time(lambda b=email_batch: list(map(ce.validate_email, b)), repeat)
+        _report(f"validate_email (naive, {label})", size, seconds)
+
+        seconds = _time(lambda b=email_batch: list(validate_emails(b)), repeat)
+        _report(f"validate_emails (structured, {label})", size, seconds)
+
+
+def bench_cards(size, repeat):
+    """
+    Card checks: length/isdigit only, per-card Luhn and bulk Luhn scans.
+    """
+    rng = random.Random(7)
+    numbers = [str(rng.randrange(10**12, 10**16)) for _ in range(size)]
+    records = "".join(number.rjust(16) for number in numbers).encode()
+
+    seconds = _time(lambda: list(map(ce.validate_credit_card, numbers)), repeat)
+    _report("validate_credit_card (no Luhn)", size, seconds)
+
+    seconds = _time(lambda: list(map(is_valid_card, numbers)), repeat)
+    _report("is_valid_card (Luhn)", size, seconds)
+
+    seconds = _time(lambda: validate_cards(numbers), repeat)
+    _report("validate_cards (bulk Luhn)", size, seconds)
+
+    seconds = _time(lambda: scan_card_records(records), repeat)
+    _report("scan_card_records (fixed-width bytes)", size, seconds)
+
+
+def bench_dates(size, repeat):
+    """
+    Range-only validate_date, datetime.date per row and batch columns.
+    """
+    rng = random.Random(8)
+    years = array("l", [rng.randrange(1890, 2110) for _ in range(size)])
+    months = array("l", [rng.randrange(0, 14) for _ in range(size)])
+    days = array("l", [rng.randrange(0, 33) for _ in range(size)])
+
+    def with_datetime():
+        for year, month, day in zip(years, months, days):
+            try:
+                date(year, month, day)
+            except ValueError:
+                pass
+
+    seconds = _time(lambda: list(map(ce.validate_date, years, months, days)), repeat)
+    _report("validate_date (range only)", size, seconds)
+
+    seconds = _time(with_datetime, repeat)
+    _report("datetime.date per row", size, seconds)
+
+    seconds = _time(lambda: validate_dates(years, months, days), repeat)
+    _report("validate_dates (columns)", size, seconds)
+
+
+def bench_records(size, repeat):
+    """
+    Reading fixed-width records line by line vs the memory-mapped scanner.
+    """
+    rng = random.Random(9)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "records.dat")
+        with open(path, "wb") as stream:
+            for _ in range(size):
+                card = rng.randrange(10**12, 10**16)
+                day = rng.randrange(1890, 2110), rng.randrange(14), rng.randrange(33)
+                stream.write(b"%16d%04d%02d%02d\n" % (card, *day))
+
+        def line_by_line():
+            with open(path, encoding="ascii") as stream:
+                for line in stream:
+                    ce.validate_credit_card(line[:16].strip())
+                    ce.validate_date(
+                        int(line[16:20]), int(line[20:22]), int(line[22:24])
+                    )
+
+        seconds = _time(line_by_line, repeat)
+        _report("line by line (no Luhn, no calendar)", size, seconds)
+
+        checks = {"card": (0, 16, "card"), "date": (16, 8, "date")}
+        seconds = _time(lambda: scan_file(path, 25, checks), repeat)
+        _report("scan_file (mmap, bulk)", size, seconds)
+
+
+def bench_catalog(size, repeat):
+    """
+    Product objects vs a ProductCatalog: memory and category/range queries.
+    """
+    rng = random.Random(10)
+    prices = array("d", [round(rng.uniform(0, 300), 2) for _ in range(size)])
+
+    def items():
+        # Fresh name strings and price floats for every product
+        return ((f"product-{i}", price) for i, price in enumerate(prices))
+
+    products, allocated = _allocated(lambda: [ce.Product(*item) for item in items()])
+    print(f"{'Product objects':<45} {allocated / size:>14,.1f} bytes/product")
+
+    def build():
+        catalog = ProductCatalog(items())
+        catalog.price_order()
+        return catalog
+
+    catalog, allocated = _allocated(build)
+    print(f"{'ProductCatalog':<45} {allocated / size:>14,.1f} bytes/product")
+
+    ranges = [(low, low + 1) for low in range(0, 300, 3)]
+
+    def scan_range():
+        return [[p for p in products if low <= p.price <= high] for low, high in ranges]
+
+    def scan_category():
+        return [p for p in products if ce.categorize_product(p.price) == "Category B"]
+
+    seconds = _time(scan_range, repeat)
+    _report("price range (object scan)", len(ranges), seconds)
+
+    seconds = _time(lambda: [catalog.in_price_range(*r) for r in ranges], repeat)
+    _report("in_price_range (price index)", len(ranges), seconds)
+
+    seconds = _time(scan_category, repeat)
+    _report("Category B (object scan)", 1, seconds)
+
+    seconds = _time(lambda: catalog.in_category("Category B"), repeat)
+    _report("in_category Category B (price index)", 1, seconds)
+
+
+def bench_money(size, repeat):
+    """
+    Order totals, discounts and fees: float, Decimal and int64 cents.
+    """
+    rng = random.Random(11)
+    quantities = array("q", [rng.randint(1, 15) for _ in range(size)])
+    cents = array("q", [rng.randint(1, 100_000) for _ in range(size)])
+    prices = array("d", [c / 100 for c in cents])
+    decimals = [decimal.Decimal(c).scaleb(-2) for c in cents]
+    sizes = [1] * size
+    types = [rng.choice(("regular", "express", "scheduled")) for _ in range(size)]
+    cent = decimal.Decimal("0.01")
+    tiers = [decimal.Decimal(rate) for rate in ("1", "0.95", "0.9", "0", "0.1", "0.2")]
+    fee_rates = {name: decimal.Decimal(str(rate)) for name, rate in FEE_RATES.items()}
+
+    def with_decimal():
+        totals = [
+            (q * p * tiers[0 if q <= 5 else 1 if q <= 10 else 2]).quantize(cent)
+            for q, p in zip(quantities, decimals)
+        ]
+        discounts = [
+            (t * tiers[3 if t < 100 else 4 if t <= 500 else 5]).quantize(cent)
+            for t in totals
+        ]
+        fees = [(p * fee_rates[t]).quantize(cent) for p, t in zip(decimals, types)]
+        return totals, discounts, fees
+
+    def with_cents():
+        totals = order_totals(quantities, cents, sizes)
+        return totals, total_discounts(totals), transfer_fees(cents, types)
+
+    seconds = _time(lambda: calculate_order_totals(quantities, prices, sizes), repeat)
+    _report("order totals only (float)", size, seconds)
+
+    seconds = _time(with_decimal, repeat)
+    _report("totals + discounts + fees (Decimal)", size, seconds)
+
+    seconds = _time(with_cents, repeat)
+    _report("totals + discounts + fees (int64 cents)", size, seconds)
+
+
+def bench_checkout(size, repeat):
+    """
+    Separate subtotal/total/discount/shipping calls vs quote_checkouts.
+    """
+    rng = random.Random(12)
+    carts = [
+        [
+            {
+                "quantity": rng.randint(1, 15),
+                "price": round(rng.uniform(1, 100), 2),
+                "weight": rng.uniform(0.1, 3),
+            }
+            for _ in range(rng.randint(1, 5))
+        ]
+        for _ in range(size)
+    ]
+
+    def separate():
+        quotes = []
+        for items in carts:
+            subtotal = sum(item["quantity"] * item["price"] for item in items)
+            total = ce.calculate_order_total(items)
+            discount = ce.calculate_total_discount(total)
+            shipping = ce.calculate_items_shipping_cost(items, "standard")
+            quotes.append((subtotal, total, discount, shipping))
+        return quotes
+
+    def separate_exact():
+        quotes = []
+        for items in carts:
+            subtotal = sum(Money.of(item["price"]) * item["quantity"] for item in items)
+            total = order_total(items)
+            discount = total_discount(total)
+            shipping = Money.of(ce.calculate_items_shipping_cost(items, "standard"))
+            quotes.append((subtotal, total, discount, shipping))
+        return quotes
+
+    seconds = _time(separate, repeat)
+    _report("separate calls (float)", size, seconds)
+
+    seconds = _time(separate_exact, repeat)
+    _report("separate calls (exact cents)", size, seconds)
+
+    seconds = _time(lambda: quote_checkouts(carts), repeat)
+    _report("quote_checkouts (one pass, exact cents)", size, seconds)
+
+
+def bench_telemetry(size, repeat):
+    """
+    Per-reading conversion and advisory calls vs the batch sensor mode.
+    """
+    rng = random.Random(13)
+    # One reading in a hundred is out of range, like a faulty sensor
+    temperatures = array(
+        "d", [rng.uniform(-30, 45) if i % 100 else 150.0 for i in range(size)]
+    )
+    humidities = array("d", [rng.uniform(0, 100) for _ in range(size)])
+    sensors = [rng.randrange(1_000) for _ in range(size)]
+
+    def per_reading():
+        return [
+            (ce.celsius_to_fahrenheit(t), ce.get_weather_advisory(t, h))
+            for t, h in zip(temperatures, humidities)
+        ]
+
+    seconds = _time(per_reading, repeat)
+    _report("celsius_to_fahrenheit + get_weather_advisory", size, seconds)
+
+    seconds = _time(lambda: process_readings(temperatures, humidities), repeat)
+    _report("process_readings", size, seconds)
+
+    stream = SensorStream()
+    seconds = _time(lambda: stream.process(temperatures, humidities, sensors), repeat)
+    _report("SensorStream.process (1000 sensor windows)", size, seconds)
+
+
+def bench_loans(size, repeat):
+    """
+    check_loan_eligibility per applicant vs the precomputed decision grid.
+    """
+    rng = random.Random(14)
+    incomes = array("q", [rng.randint(0, 100_000) for _ in range(size)])
+    scores = array("q", [rng.randint(300, 850) for _ in range(size)])
+
+    seconds = _time(
+        lambda: list(map(ce.check_loan_eligibility, incomes, scores)), repeat
+    )
+    _report("check_loan_eligibility (labels)", size, seconds)
+
+    seconds = _time(lambda: list(map(LOAN_GRID.decide, incomes, scores)), repeat)
+    _report("LOAN_GRID.decide (code + reasons)", size, seconds)
+
+    seconds = _time(lambda: loan_decisions(incomes, scores), repeat)
+    _report("loan_decisions (code + reasons columns)", size, seconds)
+
+
+BENCHMARKS = {
+    "order_totals": bench_order_totals,
+    "shipping": bench_shipping,
+    "passwords": bench_passwords,
+    "parallel": bench_parallel,
+    "fleet": bench_fleet,
+    "banking_threads": bench_banking_threads,
+    "ledger": bench_ledger,
+    "async_clients": bench_async_clients,
+    "credentials": bench_credentials,
+    "url_email": bench_url_email,
+    "cards": bench_cards,
+    "dates": bench_dates,
+    "records": bench_records,
+    "catalog": bench_catalog,
+    "money": bench_money,
+    "checkout": bench_checkout,
+    "telemetry": bench_telemetry,
+    "loans": bench_loans,
+}
+
+
+def main(argv=None):
+    """
+    Runs the selected benchmarks (all of them by default).
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("names", nargs="*", help=", ".join(BENCHMARKS))
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    for name in args.names or BENCHMARKS:
+        print(f"# {name}")
+        BENCHMARKS[name](args.size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+"""
+Columnar product catalog with a sorted price index.
+"""
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress
+from operator import eq, ne
+
+from white_box.class_exercises import PRODUCT_CATEGORIES
+
+
+class CatalogProduct:
+    """
+    View of a single product of a ProductCatalog.
+    """
+
+    __slots__ = ("catalog", "index")
+
+    def __init__(self, catalog, index):
+        """
+        Set the catalog and the product position.
+        """
+        self.catalog = catalog
+        self.index = index
+
+    @property
+    def name(self):
+        """
+        Provides the product name.
+        """
+        return self.catalog.name(self.index)
+
+    @property
+    def price(self):
+        """
+        Provides the product price.
+        """
+        return self.catalog.prices[self.index]
+
+    @property
+    def category(self):
+        """
+        Provides the price category of the product.
+        """
+        return self.catalog.categories.classify(self.price)
+
+    def view_product(self):
+        """
+        Function to display the product details.
+        """
+        msg = f"The product {self.name} has a price of {self.price}"
+        print(msg)
+        return msg
+
+
+class ProductCatalog:
+    """
+    Products stored as columns: the UTF-8 names in one buffer with their
+    end offsets and the prices in an array of doubles. The product numbers
+    sorted by price form the index, so a category or a price range is found
+    with two bisections and read as one slice: O(log n + k). Products whose
+    price cannot be ordered (NaN) follow the index, in the unordered
+    category of the table like in categorize_product.
+    """
+
+    def __init__(self, products=(), categories=PRODUCT_CATEGORIES):
+        """
+        Stores an iterable of (name, price) pairs. categories is the
+        ThresholdTable used to categorize prices.
+        """
+        self.categories = categories
+        self.prices = array("d")
+        self._names = bytearray()
+        self._name_ends = array("q")
+        self._order = None
+        self._ordered = 0
+        self.extend(products)
+
+    @classmethod
+    def from_products(cls, products):
+        """
+        Builds a catalog from objects with name and price attributes.
+        """
+        return cls((product.name, product.price) for product in products)
+
+    def __len__(self):
+        """
+        Provides the number of products.
+        """
+        return len(self.prices)
+
+    def __getitem__(self, index):
+        """
+        Provides a view of a single product.
+        """
+        if not -len(self.prices) <= index < len(self.prices):
+            raise IndexError("Catalog index out of range")
+
+        return CatalogProduct(self, index % len(self.prices))
+
+    @property
+    def nbytes(self):
+        """
+        Provides the memory used by the columns and the price index.
+        """
+        columns = (self.prices, self._names, self._name_ends, self._order)
+        return sum(sys.getsizeof(column) for column in columns if column is not None)
+
+    def add(self, name, price):
+        """
+        Adds a product and returns its number.
+        """
+        self.extend([(name, price)])
+        return len(self.prices) - 1
+
+    def extend(self, products):
+        """
+        Adds an iterable of (name, price) pairs.
+        The price index is rebuilt by the next query.
+        """
+        for name, price in products:
+            self._names += name.encode("utf-8")
+            self._name_ends.append(len(self._names))
+            self.prices.append(price)
+        self._order = None
+
+    def name(self, index):
+        """
+        Provides the name of a product by number.
+        """
+        start = self._name_ends[index - 1] if index else 0
+        return self._names[start : self._name_ends[index]].decode("utf-8")
+
+    def price_order(self):
+        """
+        Provides the product numbers sorted by price (the price index),
+        followed by the products with a NaN price.
+        """
+        if self._order is None:
+            prices = self.prices
+            ordered = list(compress(range(len(prices)), map(eq, prices, prices)))
+            self._order = array("q", sorted(ordered, key=prices.__getitem__))
+            self._ordered = len(ordered)
+            if self._ordered < len(prices):
+                self._order.extend(
+                    compress(range(len(prices)), map(ne, prices, prices))
+                )
+
+        return self._order
+
+    def _views(self, start, stop):
+        """
+        Provides the products between two positions of the price index.
+        """
+        return [CatalogProduct(self, index) for index in self.price_order()[start:stop]]
+
+    def in_price_range(self, low, high):
+        """
+        Provides the products with low <= price <= high, sorted by price.
+        """
+        order = self.price_order()
+        key = self.prices.__getitem__
+        return self._views(
+            bisect_left(order, low, 0, self._ordered, key=key),
+            bisect_right(order, high, 0, self._ordered, key=key),
+        )
+
+    def _category_bounds(self):
+        """
+        Yields (label, start, stop) positions of the price index for every
+        label position of the categories table, then the positions of the
+        NaN prices with the unordered label.
+        """
+        order = self.price_order()
+        key = self.prices.__getitem__
+        table = self.categories
+        for position, label in enumerate(table.labels):
+            start = table.lower_bound(order, position, key, self._ordered)
+            stop = table.lower_bound(order, position + 1, key, self._ordered)
+            yield label, start, stop
+
+        yield table.labels[table.unordered], self._ordered, len(order)
+
+    def in_category(self, category):
+        """
+        Provides the products of a price category, sorted by price.
+        """
+        if category not in self.categories.labels:
+            raise ValueError(f"Invalid category: {category}")
+
+        return [
+            product
+            for label, start, stop in self._category_bounds()
+            if label == category
+            for product in self._views(start, stop)
+        ]
+
+    def category_counts(self):
+        """
+        Provides the number of products of every category.
+        """
+        counts = dict.fromkeys(self.categories.labels, 0)
+        for label, start, stop in self._category_bounds():
+            counts[label] += stop - start
+        return counts
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+
+"""
+Splits streams into bounded chunks for the batch pipelines.
+"""
+from itertools import islice
+
+
+def read_chunks(records, chunk_size):
+    """
+    Groups records into lists of at most chunk_size records.
+    """
+    records = iter(records)
+    while chunk := list(islice(records, chunk_size)):
+        yield chunk
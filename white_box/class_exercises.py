@@ -4,6 +4,21 @@
 White-box code examples.
 """
 import re
+from collections import deque
+
+from white_box.banking import Ledger, SessionStore, amount_cents
+from white_box.fsm import StateMachine, event_method
+from white_box.money import (
+    BASIS_POINTS,
+    FEE_BASIS_POINTS,
+    QUANTITY_RATES,
+    TOTAL_DISCOUNT_RATES_CENTS,
+    Money,
+    cents_of,
+    round_div,
+    transfer_fee,
+)
+from white_box.rules import ThresholdTable
 
 
 def is_even(num):
@@ -23,19 +38,14 @@ def divide(a, b):
     return result
 
 
+GRADES = ThresholdTable(["F", "C", "B", "A"], [(70, ">="), (80, ">="), (90, ">=")])
+
+
 def get_grade(score):
     """
     Grade function.
     """
-    if score >= 90:
-        grade = "A"
-    elif score >= 80:
-        grade = "B"
-    elif score >= 70:
-        grade = "C"
-    else:
-        grade = "F"
-    return grade
+    return GRADES.classify(score)
 
 
 def is_triangle(a, b, c):
@@ -85,17 +95,26 @@ def validate_password(password):
 
 
 # 3
+# Same tiers as money.TOTAL_DISCOUNT_RATES_CENTS, in dollars and fractions
+TOTAL_DISCOUNT_RATES = ThresholdTable(
+    [rate / BASIS_POINTS for rate in TOTAL_DISCOUNT_RATES_CENTS.labels],
+    [
+        (cents // 100, operator)
+        for cents, operator in TOTAL_DISCOUNT_RATES_CENTS.breakpoints
+    ],
+    TOTAL_DISCOUNT_RATES_CENTS.unordered,
+)
+
+
 def calculate_total_discount(total_amount):
     """
     Calculates the discount for a customer's purchase based on the total amount.
     """
-    if total_amount < 100:
+    rate = TOTAL_DISCOUNT_RATES.classify(total_amount)
+    if not rate:
         return 0
 
-    if 100 <= total_amount <= 500:
-        return 0.1 * total_amount
-
-    return 0.2 * total_amount
+    return rate * total_amount
 
 
 # 4
@@ -164,31 +183,38 @@ def validate_login(username, password):
 
 
 # 7
+AGE_ELIGIBILITY = ThresholdTable(
+    ["Not Eligible", "Eligible", "Not Eligible"], [(18, ">="), (65, ">")]
+)
+
+
 def verify_age(age):
     """
     Determines whether a person is eligible for a certain service based on their age.
     """
-    if 18 <= age <= 65:
-        return "Eligible"
-
-    return "Not Eligible"
+    return AGE_ELIGIBILITY.classify(age)
 
 
 # 8
+PRODUCT_CATEGORIES = ThresholdTable(
+    [
+        "Category D",
+        "Category A",
+        "Category D",
+        "Category B",
+        "Category D",
+        "Category C",
+        "Category D",
+    ],
+    [(10, ">="), (50, ">"), (51, ">="), (100, ">"), (101, ">="), (200, ">")],
+)
+
+
 def categorize_product(price):
     """
     Determines the price category of a product based on its price.
     """
-    if 10 <= price <= 50:
-        return "Category A"
-
-    if 51 <= price <= 100:
-        return "Category B"
-
-    if 101 <= price <= 200:
-        return "Category C"
-
-    return "Category D"
+    return PRODUCT_CATEGORIES.classify(price)
 
 
 # 9
@@ -251,24 +277,33 @@ def validate_url(url):
     """
     Validates URLs.
     """
-    if len(url) <= 255 and url.startswith("http://") or url.startswith("https://"):
+    if len(url) <= 255 and (url.startswith("http://") or url.startswith("https://")):
         return "Valid URL"
 
     return "Invalid URL"
 
 
 # 15
+# Same tiers as money.QUANTITY_RATES, labelled
+QUANTITY_DISCOUNTS = ThresholdTable(
+    [
+        (
+            f"{(BASIS_POINTS - rate) // 100}% Discount"
+            if rate < BASIS_POINTS
+            else "No Discount"
+        )
+        for rate in QUANTITY_RATES.labels
+    ],
+    QUANTITY_RATES.breakpoints,
+    QUANTITY_RATES.unordered,
+)
+
+
 def calculate_quantity_discount(quantity):
     """
     Calculates discounts based on the quantity of a product.
     """
-    if 1 <= quantity <= 5:
-        return "No Discount"
-
-    if 6 <= quantity <= 10:
-        return "5% Discount"
-
-    return "10% Discount"
+    return QUANTITY_DISCOUNTS.classify(quantity)
 
 
 # 16
@@ -283,23 +318,22 @@ def check_file_size(size_in_bytes):
 
 
 # 17
+LOAN_TYPES = ThresholdTable(
+    [
+        ThresholdTable(["Not Eligible"]),
+        ThresholdTable(["Secured Loan", "Standard Loan"], [(700, ">")]),
+        ThresholdTable(["Standard Loan", "Premium Loan"], [(750, ">")]),
+    ],
+    [(30000, ">="), (60000, ">")],
+    unordered=2,
+)
+
+
 def check_loan_eligibility(income, credit_score):
     """
     Checks if and which loan can be granted based on the income and credit score.
     """
-    if income < 30000:
-        return "Not Eligible"
-
-    if 30000 <= income <= 60000:
-        if credit_score > 700:
-            return "Standard Loan"
-
-        return "Secured Loan"
-
-    if credit_score > 750:
-        return "Premium Loan"
-
-    return "Standard Loan"
+    return LOAN_TYPES.classify(income).classify(credit_score)
 
 
 # 18
@@ -336,12 +370,20 @@ def grade_quiz(correct_answers, incorrect_answers):
 
 
 # 20
-def authenticate_user(username, password):
+def authenticate_user(username, password, credentials=None):
     """
     Authenticates users based on their username and password.
+    The admin password is checked against credentials (e.g. a
+    CredentialStore) when given.
     """
-    if username == "admin" and password == "admin123":
-        return "Admin"
+    if username == "admin":
+        if credentials is None:
+            is_admin = password == "admin123"
+        else:
+            is_admin = credentials.verify(username, password)
+
+        if is_admin:
+            return "Admin"
 
     if len(username) >= 5 and len(password) >= 8:
         return "User"
@@ -364,61 +406,62 @@ def get_weather_advisory(temperature, humidity):
 
 
 # 22
-class VendingMachine:
+class VendingMachine(StateMachine):
     """
     A simple vending machine that dispenses drinks.
     It has two states: "Ready" and "Dispensing."
     """
 
-    def __init__(self):
-        """
-        Defines the vending machine initial state.
-        """
-        self.state = "Ready"
+    __slots__ = ()
 
+    STATES = ("Ready", "Dispensing")
+    INITIAL_STATE = "Ready"
+    TRANSITIONS = {
+        "insert_coin": {
+            "Ready": ("Dispensing", "Coin Inserted. Select your drink."),
+        },
+        "select_drink": {
+            "Dispensing": ("Ready", "Drink Dispensed. Thank you!"),
+        },
+    }
+    INVALID_MESSAGE = "Invalid operation in current state."
+
+    @event_method
     def insert_coin(self):
         """
         Function called when a coin is inserted.
         """
-        if self.state == "Ready":
-            self.state = "Dispensing"
-            return "Coin Inserted. Select your drink."
-
-        return "Invalid operation in current state."
 
+    @event_method
     def select_drink(self):
         """
         Function called after selecting a drink.
         """
-        if self.state == "Dispensing":
-            self.state = "Ready"
-            return "Drink Dispensed. Thank you!"
-
-        return "Invalid operation in current state."
 
 
 # 23
-class TrafficLight:
+class TrafficLight(StateMachine):
     """
     A traffic light system with three states: "Green," "Yellow," and "Red."
     """
 
-    def __init__(self):
-        """
-        Defines the traffic light initial state.
-        """
-        self.state = "Red"
+    __slots__ = ()
 
+    STATES = ("Red", "Green", "Yellow")
+    INITIAL_STATE = "Red"
+    TRANSITIONS = {
+        "change_state": {
+            "Red": ("Green", None),
+            "Green": ("Yellow", None),
+            "Yellow": ("Red", None),
+        },
+    }
+
+    @event_method
     def change_state(self):
         """
         Function that changes the traffic light state.
         """
-        if self.state == "Red":
-            self.state = "Green"
-        elif self.state == "Green":
-            self.state = "Yellow"
-        elif self.state == "Yellow":
-            self.state = "Red"
 
     def get_current_state(self):
         """
@@ -428,112 +471,97 @@ class TrafficLight:
 
 
 # 24
-class UserAuthentication:
+class UserAuthentication(StateMachine):
     """
     A user authentication system with states "Logged Out" and "Logged In."
     """
 
-    def __init__(self):
-        """
-        Defines the user initial state.
-        """
-        self.state = "Logged Out"
+    __slots__ = ()
+
+    STATES = ("Logged Out", "Logged In")
+    INITIAL_STATE = "Logged Out"
+    TRANSITIONS = {
+        "login": {"Logged Out": ("Logged In", "Login successful")},
+        "logout": {"Logged In": ("Logged Out", "Logout successful")},
+    }
 
+    @event_method
     def login(self):
         """
         Function to login a user.
         """
-        if self.state == "Logged Out":
-            self.state = "Logged In"
-            return "Login successful"
-
-        return "Invalid operation in current state"
 
+    @event_method
     def logout(self):
         """
         Function to logout a user.
         """
-        if self.state == "Logged In":
-            self.state = "Logged Out"
-            return "Logout successful"
-
-        return "Invalid operation in current state"
 
 
 # 25
-class DocumentEditingSystem:
+class DocumentEditingSystem(StateMachine):
     """
     A document editing system with states "Editing" and "Saved."
     """
 
-    def __init__(self):
-        """
-        Defines the initial state.
-        """
-        self.state = "Editing"
+    __slots__ = ()
+
+    STATES = ("Editing", "Saved")
+    INITIAL_STATE = "Editing"
+    TRANSITIONS = {
+        "save_document": {"Editing": ("Saved", "Document saved successfully")},
+        "edit_document": {"Saved": ("Editing", "Editing resumed")},
+    }
 
+    @event_method
     def save_document(self):
         """
         Function to save a document.
         """
-        if self.state == "Editing":
-            self.state = "Saved"
-            return "Document saved successfully"
-
-        return "Invalid operation in current state"
 
+    @event_method
     def edit_document(self):
         """
         Function to edit a document.
         """
-        if self.state == "Saved":
-            self.state = "Editing"
-            return "Editing resumed"
-
-        return "Invalid operation in current state"
 
 
 # 26
-class ElevatorSystem:
+class ElevatorSystem(StateMachine):
     """
     An elevator system with states "Idle," "Moving Up," and "Moving Down."
     """
 
-    def __init__(self):
-        """
-        Defines the elevator initial state.
-        """
-        self.state = "Idle"
+    __slots__ = ()
+
+    STATES = ("Idle", "Moving Up", "Moving Down")
+    INITIAL_STATE = "Idle"
+    TRANSITIONS = {
+        "move_up": {"Idle": ("Moving Up", "Elevator moving up")},
+        "move_down": {"Idle": ("Moving Down", "Elevator moving down")},
+        "stop": {
+            "Moving Up": ("Idle", "Elevator stopped"),
+            "Moving Down": ("Idle", "Elevator stopped"),
+        },
+    }
 
+    @event_method
     def move_up(self):
         """
         Function to move up the elevator.
         """
-        if self.state == "Idle":
-            self.state = "Moving Up"
-            return "Elevator moving up"
-
-        return "Invalid operation in current state"
 
+    @event_method
     def move_down(self):
         """
         Function to move down the elevator.
         """
-        if self.state == "Idle":
-            self.state = "Moving Down"
-            return "Elevator moving down"
-
-        return "Invalid operation in current state"
 
+    @event_method
     def stop(self):
         """
         Function to stop the elevator.
         """
-        if self.state in ["Moving Up", "Moving Down"]:
-            self.state = "Idle"
-            return "Elevator stopped"
-
-        return "Invalid operation in current state"
 
 
 # 27
@@ -561,26 +589,61 @@ class BankingSystem:
     Banking system class.
     """
 
-    def __init__(self):
+    def __init__(self, quiet=False, max_events=10000, ledger=None, credentials=None):
         """
         Mock users.
+        Passwords are checked against credentials (e.g. a CredentialStore)
+        when given, otherwise against the plaintext users dict. The logged
+        in users are kept in a thread-safe SessionStore and the balances in
+        a Ledger, where new accounts start with 1000. With quiet=True the
+        messages are not printed but recorded as structured events in
+        self.events (the last max_events of them).
         """
         self.users = {"user123": "pass123"}  # Simplified user database
-        self.logged_in_users = set()
+        self.credentials = credentials
+        self.logged_in_users = SessionStore()
+        self.ledger = Ledger(default_balance=1000) if ledger is None else ledger
+        self.quiet = quiet
+        self.events = deque(maxlen=max_events)
+
+    def _notify(self, message, event, **details):
+        """
+        Prints a message or, in quiet mode, records it as an event.
+        """
+        if self.quiet:
+            self.events.append({"event": event, **details})
+        else:
+            print(message)
+
+    def _check_password(self, username, password):
+        """
+        Checks a user password.
+        """
+        if self.credentials is not None:
+            return self.credentials.verify(username, password)
+
+        return username in self.users and self.users[username] == password
 
     def authenticate(self, username, password):
         """
         User authentication function.
         """
-        if username in self.users and self.users[username] == password:
-            if username not in self.logged_in_users:
-                self.logged_in_users.add(username)
-                print(f"User {username} authenticated successfully.")
+        if self._check_password(username, password):
+            if self.logged_in_users.add(username):
+                self._notify(
+                    f"User {username} authenticated successfully.",
+                    "authenticated",
+                    username=username,
+                )
                 return True
 
-            print("User already logged in.")
+            self._notify(
+                "User already logged in.", "already_logged_in", username=username
+            )
         else:
-            print("Authentication failed.")
+            self._notify(
+                "Authentication failed.", "authentication_failed", username=username
+            )
 
         return False
 
@@ -589,31 +652,63 @@ class BankingSystem:
         Function to perform a money transfer.
         """
         if sender not in self.logged_in_users:
-            print("Sender not authenticated.")
+            self._notify(
+                "Sender not authenticated.", "not_authenticated", sender=sender
+            )
             return False
 
-        # Simulate transaction processing logic
-        if transaction_type == "regular":
-            fee = 0.02 * amount
-        elif transaction_type == "express":
-            fee = 0.05 * amount
-        elif transaction_type == "scheduled":
-            fee = 0.01 * amount
-        else:
-            print("Invalid transaction type.")
+        if transaction_type not in FEE_BASIS_POINTS:
+            self._notify(
+                "Invalid transaction type.",
+                "invalid_transaction_type",
+                transaction_type=transaction_type,
+            )
             return False
 
-        # Simulate checking for sufficient funds
-        if BankAccount(sender, 1000).balance < (amount + fee):
-            print("Insufficient funds.")
+        cents = amount_cents(amount)
+        if cents is None:
+            self._notify("Invalid amount.", "invalid_amount", amount=amount)
             return False
 
-        print(
+        fee = transfer_fee(Money(cents), transaction_type)
+        if not self.ledger.transfer_cents(sender, receiver, cents, fee.cents):
+            self._notify(
+                "Insufficient funds.",
+                "insufficient_funds",
+                sender=sender,
+                amount=amount,
+            )
+            return False
+
+        self._notify(
             f"Money transfer of ${amount} ({transaction_type} transfer)"
-            f" from {sender} to {receiver} processed successfully."
+            f" from {sender} to {receiver} processed successfully.",
+            "transfer_processed",
+            sender=sender,
+            receiver=receiver,
+            amount=amount,
+            fee=fee.to_decimal(),
+            transaction_type=transaction_type,
         )
         return True
 
+    def transfer_batch(self, transfers):
+        """
+        Performs many (sender, receiver, amount, transaction_type) transfers
+        without printing or recording events. Returns one status per
+        transfer: "transfer_processed", "not_authenticated",
+        "invalid_transaction_type", "invalid_amount" or "insufficient_funds".
+        """
+        transfers = list(transfers)
+        authenticated = [transfer[0] in self.logged_in_users for transfer in transfers]
+        statuses = iter(
+            self.ledger.transfer_batch(
+                transfer for transfer, ok in zip(transfers, authenticated) if ok
+            )
+        )
+
+        return [next(statuses) if ok else "not_authenticated" for ok in authenticated]
+
 
 # 28
 class Product:  # pylint: disable=too-few-public-methods
@@ -645,37 +740,88 @@ class ShoppingCart:
     def __init__(self):
         """
         Initialize the shopping cart.
+        Items are indexed by product and the subtotal is kept up to date
+        in integer cents on every change, so adding, removing and totaling
+        are O(1) and the total does not drift. Every item keeps the cents it
+        added, so a price change between adding and removing a product
+        cannot unbalance the total. Prices are rounded to the cent.
+        """
+        self._items = {}
+        self._cents = 0
+
+    @property
+    def items(self):
+        """
+        Provides copies of the cart items in insertion order.
         """
-        self.items = []
+        return [
+            {"product": item["product"], "quantity": item["quantity"]}
+            for item in self._items.values()
+        ]
+
+    @items.setter
+    def items(self, items):
+        """
+        Replaces the cart content with a list of {product, quantity} items.
+        """
+        self._items = {}
+        self._cents = 0
+        for item in items:
+            self.add_product(item["product"], item["quantity"])
+
+    @property
+    def total(self):
+        """
+        Provides the running total of the shopping cart as a Decimal.
+        """
+        return Money(self._cents).to_decimal()
 
     def add_product(self, product, quantity=1):
         """
         Function to add a product to the shopping cart.
-        """
-        for item in self.items:
-            if item["product"] == product:
-                item["quantity"] += quantity
-                break
+        Quantities must be integers, as in money.order_total.
+        """
+        if not isinstance(quantity, int):
+            raise TypeError(f"Quantities must be integers: {quantity!r}")
+
+        cents = cents_of(product.price) * quantity
+        item = self._items.get(product)
+        if item is None:
+            self._items[product] = {
+                "product": product,
+                "quantity": quantity,
+                "cents": cents,
+            }
         else:
-            self.items.append({"product": product, "quantity": quantity})
+            item["quantity"] += quantity
+            item["cents"] += cents
+
+        self._cents += cents
 
     def remove_product(self, product, quantity=1):
         """
         Function to remove a product from the shopping cart.
+        The removed units take their share of the cents the item added.
         """
-        for item in self.items:
-            if item["product"] == product:
-                if item["quantity"] <= quantity:
-                    self.items.remove(item)
-                else:
-                    item["quantity"] -= quantity
-                break
+        item = self._items.get(product)
+        if item is None:
+            return
+
+        if item["quantity"] <= quantity:
+            del self._items[product]
+            cents = item["cents"]
+        else:
+            cents = round_div(item["cents"] * quantity, item["quantity"])
+            item["quantity"] -= quantity
+            item["cents"] -= cents
+
+        self._cents -= cents
 
     def view_cart(self):
         """
         Function to display the shopping cart content.
         """
-        for item in self.items:
+        for item in self._items.values():
             print(
                 f"{item['quantity']} x {item['product'].name}"
                 f" - ${item['product'].price * item['quantity']}"
@@ -684,7 +830,8 @@ class ShoppingCart:
     def checkout(self):
         """
         Function to checkout the items from the shopping cart.
+        The total is printed in its shortest exact form from the rounded
+        cents: 2.5 x 2 prints "$5" and 0.333 x 3 prints "$0.99".
         """
-        total = sum(item["product"].price * item["quantity"] for item in self.items)
-        print(f"Total: ${total}")
+        print(f"Total: ${self.total.normalize():f}")
         print("Checkout completed. Thank you for shopping!")
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+"""
+Column comparisons on the bytes of 64-bit numbers, for the batch helpers.
+Masks are big integers with a 0 or 1 byte per value, so they combine with
+&, | and ^ and turn into a bytes mask with to_bytes(count, "big").
+"""
+import struct
+import sys
+from array import array
+
+
+def _byte_table(function):
+    """
+    Builds a bytes.translate table mapping every byte through function.
+    """
+    return bytes(function(byte) for byte in range(256))
+
+
+IS_NEGATIVE = _byte_table(lambda b: b >= 0x80)
+IS_NOT_ZERO = _byte_table(lambda b: b != 0)
+CLEAR_SIGN = _byte_table(lambda b: b & 0x7F)
+# Tables of every byte value giving 2 above it, 1 equal to it, 0 below it
+BYTE_TABLES = [
+    _byte_table(lambda b, v=value: (b > v) << 1 | (b == v)) for value in range(256)
+]
+
+
+def int64_bytes(values):
+    """
+    Provides a column of integers as little-endian 64-bit values.
+    """
+    if isinstance(values, array) and values.itemsize == 8 and sys.byteorder == "little":
+        if values.typecode == "d":
+            raise TypeError("The column must hold integers")
+        return values.tobytes()
+
+    column = array("q", values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def double_bytes(values):
+    """
+    Provides a column of numbers as an array("d") and as little-endian
+    IEEE 754 bytes.
+    """
+    if not (isinstance(values, array) and values.typecode == "d"):
+        values = array("d", values)
+    if sys.byteorder == "little":
+        return values, values.tobytes()
+
+    swapped = array("d", values)
+    swapped.byteswap()
+    return values, swapped.tobytes()
+
+
+def number(column):
+    """
+    Provides a bytes column as a big integer, first byte first.
+    """
+    return int.from_bytes(column, "big")
+
+
+class DoubleColumn:
+    """
+    A column of numbers stored as doubles and compared with limits a byte
+    column at a time. IEEE 754 magnitudes sort like their bits, so every
+    comparison is a few bytes.translate calls on the significant bytes of
+    the limit. Comparisons are false for NaN, as in Python.
+    """
+
+    def __init__(self, values):
+        """
+        Converts the values and splits their sign and magnitude bytes.
+        """
+        self.values, data = double_bytes(values)
+        self.count = len(self.values)
+        self.ones = number(b"\x01" * self.count)
+        signs = data[7::8]
+        self.negative = number(signs.translate(IS_NEGATIVE))
+        # Magnitude bytes, from the lowest one to the sign and exponent one
+        self._bytes = [data[position::8] for position in range(7)]
+        self._bytes.append(signs.translate(CLEAR_SIGN))
+        # Masks of the lower bytes, of single bytes and of magnitudes
+        self._masks = {}
+        self.nan = self._magnitude(float("inf"))[0]
+
+    def _rest(self, position):
+        """
+        Provides the mask of the values with a nonzero byte below position.
+        """
+        key = "rest", position
+        if key not in self._masks:
+            rest = 0
+            for column in self._bytes[:position]:
+                rest |= number(column)
+            rest = rest.to_bytes(self.count, "big").translate(IS_NOT_ZERO)
+            self._masks[key] = number(rest)
+        return self._masks[key]
+
+    def _byte(self, position, value):
+        """
+        Provides the (above, equal) masks of a byte column against a value,
+        shared by the limits with the same byte there.
+        """
+        key = "byte", position, value
+        if key not in self._masks:
+            codes = number(self._bytes[position].translate(BYTE_TABLES[value]))
+            self._masks[key] = codes >> 1 & self.ones, codes & self.ones
+        return self._masks[key]
+
+    def _magnitude(self, limit):
+        """
+        Provides the (above, equal) masks of the magnitudes against the
+        magnitude of a limit, comparing its bytes from the lowest nonzero
+        one up: above here, or equal here and above on the lower bytes.
+        """
+        if limit != limit:  # pylint: disable=comparison-with-itself
+            raise ValueError("Cannot compare with NaN")
+
+        limit = struct.pack("<d", abs(limit))
+        key = "magnitude", limit
+        if key not in self._masks:
+            lowest = next((position for position in range(8) if limit[position]), 8)
+            above = self._rest(lowest)
+            equal = self.ones ^ above
+            for position in range(lowest, 8):
+                position_above, position_equal = self._byte(position, limit[position])
+                above = position_above | position_equal & above
+                equal &= position_equal
+            self._masks[key] = above, equal
+        return self._masks[key]
+
+    def equal(self, limit):
+        """
+        Provides the mask of the values equal to limit.
+        """
+        equal = self._magnitude(limit)[1]
+        if limit == 0:
+            return equal
+        return equal & (self.negative if limit < 0 else self.ones ^ self.negative)
+
+    def above(self, limit):
+        """
+        Provides the mask of the values greater than limit.
+        """
+        above, equal = self._magnitude(limit)
+        positive = self.ones ^ self.negative
+        if limit >= 0:
+            return positive & above & (self.ones ^ self.nan)
+        # Negative values of a smaller magnitude, or non-negative ones
+        return (positive | self.negative & (self.ones ^ above ^ equal)) & (
+            self.ones ^ self.nan
+        )
+
+    def below(self, limit):
+        """
+        Provides the mask of the values lower than limit.
+        """
+        return self.ones ^ self.above(limit) ^ self.equal(limit) ^ self.nan
+
+    def at_least(self, limit):
+        """
+        Provides the mask of the values greater than or equal to limit.
+        """
+        return self.above(limit) | self.equal(limit)
+
+    def at_most(self, limit):
+        """
+        Provides the mask of the values lower than or equal to limit.
+        """
+        return self.ones ^ self.above(limit) ^ self.nan
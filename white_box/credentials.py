@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+"""
+Hashed credential store for the authentication exercises.
+"""
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+
+SALT_SIZE = 16
+
+
+class CredentialStore:  # pylint: disable=too-many-instance-attributes
+    """
+    Stores salted PBKDF2-SHA256 password hashes.
+    iterations is the hashing cost. Recent successful verifications are
+    kept in an LRU cache of cache_size entries for cache_ttl seconds, so
+    repeated logins skip the expensive hash. The cache only holds a keyed
+    HMAC of the password, never the password itself, and every comparison
+    is constant-time.
+    """
+
+    def __init__(self, iterations=100_000, cache_size=1024, cache_ttl=300, clock=None):
+        """
+        Creates an empty store.
+        """
+        if iterations < 1:
+            raise ValueError("There must be at least one iteration")
+
+        self.iterations = iterations
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self._clock = time.monotonic if clock is None else clock
+        self._hashes = {}
+        self._cache = OrderedDict()
+        self._cache_key = os.urandom(32)
+        self._lock = threading.Lock()
+        # Unknown users are still hashed with this salt to take the same time
+        self._dummy_salt = os.urandom(SALT_SIZE)
+
+    @staticmethod
+    def _hash(password, salt, iterations):
+        """
+        Provides the PBKDF2 hash of a password.
+        """
+        return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+    def _cache_digest(self, username, password):
+        """
+        Provides the cheap keyed digest used by the verification cache.
+        """
+        message = f"{username}\0{password}".encode()
+        return hmac.new(self._cache_key, message, hashlib.sha256).digest()
+
+    def set_password(self, username, password):
+        """
+        Stores the hash of a user password with a new salt.
+        """
+        salt = os.urandom(SALT_SIZE)
+        record = (salt, self.iterations, self._hash(password, salt, self.iterations))
+
+        with self._lock:
+            self._hashes[username] = record
+            self._cache.pop(username, None)
+
+    def remove_user(self, username):
+        """
+        Removes a user and its cached verifications.
+        """
+        with self._lock:
+            self._hashes.pop(username, None)
+            self._cache.pop(username, None)
+
+    def cache_clear(self):
+        """
+        Forgets every cached verification.
+        """
+        with self._lock:
+            self._cache.clear()
+
+    def __contains__(self, username):
+        """
+        Checks if a user has a password.
+        """
+        return username in self._hashes
+
+    def _cached(self, username, digest):
+        """
+        Checks the verification cache, dropping an expired entry.
+        """
+        with self._lock:
+            entry = self._cache.get(username)
+            if entry is None:
+                return False
+
+            cached_digest, expires = entry
+            if expires <= self._clock():
+                del self._cache[username]
+                return False
+
+            self._cache.move_to_end(username)
+            return hmac.compare_digest(cached_digest, digest)
+
+    def _remember(self, username, digest, record):
+        """
+        Caches a successful verification, evicting the least recent ones.
+        Nothing is cached if the password changed since record was read.
+        """
+        if self.cache_size < 1:
+            return
+
+        with self._lock:
+            if self._hashes.get(username) is not record:
+                return
+
+            self._cache[username] = (digest, self._clock() + self.cache_ttl)
+            self._cache.move_to_end(username)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def verify(self, username, password):
+        """
+        Checks a user password.
+        """
+        digest = self._cache_digest(username, password)
+        if self._cached(username, digest):
+            return True
+
+        record = self._hashes.get(username)
+        if record is None:
+            self._hash(password, self._dummy_salt, self.iterations)
+            return False
+
+        salt, iterations, expected = record
+        if not hmac.compare_digest(self._hash(password, salt, iterations), expected):
+            return False
+
+        self._remember(username, digest, record)
+        return True
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+"""
+Array-backed fleets of state machines for large simulations.
+"""
+
+
+class FleetMachine:
+    """
+    View of a single machine of a Fleet.
+    """
+
+    __slots__ = ("fleet", "index")
+
+    def __init__(self, fleet, index):
+        """
+        Set the fleet and the machine position.
+        """
+        self.fleet = fleet
+        self.index = index
+
+    @property
+    def state(self):
+        """
+        Provides the current state name.
+        """
+        return self.fleet.machine_class.STATES[self.fleet.states[self.index]]
+
+    @state.setter
+    def state(self, name):
+        """
+        Sets the current state by name.
+        """
+        try:
+            self.fleet.states[self.index] = self.fleet.machine_class.state_codes[name]
+        except KeyError:
+            raise ValueError(f"Invalid state: {name}") from None
+
+    def fire(self, event):
+        """
+        Applies an event to this machine and returns its message.
+        """
+        machine_class = self.fleet.machine_class
+        states = self.fleet.states
+        transition = machine_class.transition_table[event][states[self.index]]
+        if transition is None:
+            return machine_class.INVALID_MESSAGE
+
+        states[self.index], message = transition
+        return message
+
+
+class Fleet:
+    """
+    The states of many machines of a StateMachine subclass, stored as one
+    byte per machine. Events are applied to the whole fleet with
+    bytearray.translate, so a step costs a single C-level pass.
+    """
+
+    def __init__(self, machine_class, size):
+        """
+        Creates size machines in the initial state and compiles the
+        256-byte translation tables of every event.
+        """
+        n_states = len(machine_class.STATES)
+        events = list(machine_class.transition_table)
+
+        # Event code 0 means "no event", events are numbered from 1
+        if (len(events) + 1) * n_states > 256:
+            raise ValueError("Too many states and events for a byte fleet")
+
+        self.machine_class = machine_class
+        self.event_codes = {event: code for code, event in enumerate(events, 1)}
+        initial = machine_class.state_codes[machine_class.INITIAL_STATE]
+        self.states = bytearray([initial]) * size
+
+        self._tables = {}
+        combined = bytearray(256)
+        combined[:n_states] = range(n_states)
+
+        for code, event in enumerate(events, 1):
+            table = bytearray(range(256))
+            for state, transition in enumerate(machine_class.transition_table[event]):
+                if transition is not None:
+                    table[state] = transition[0]
+            self._tables[event] = bytes(table)
+            combined[code * n_states : (code + 1) * n_states] = table[:n_states]
+
+        self._combined = bytes(combined)
+        self._scale = bytes(
+            code * n_states if code <= len(events) else 0 for code in range(256)
+        )
+
+    def __len__(self):
+        """
+        Provides the number of machines.
+        """
+        return len(self.states)
+
+    def __getitem__(self, index):
+        """
+        Provides a view of a single machine.
+        """
+        if not -len(self.states) <= index < len(self.states):
+            raise IndexError("Fleet index out of range")
+
+        return FleetMachine(self, index % len(self.states))
+
+    def apply(self, event):
+        """
+        Applies the same event (e.g. a tick) to every machine.
+        Machines for which the event is invalid keep their state.
+        """
+        self.states[:] = self.states.translate(self._tables[event])
+
+    def apply_events(self, events):
+        """
+        Applies one event per machine. events is a bytes-like vector of
+        event codes (see event_codes, 0 leaves the machine unchanged).
+        """
+        events = bytes(events)
+        if len(events) != len(self.states):
+            raise ValueError("There must be one event per machine")
+
+        if events and max(events) > len(self.event_codes):
+            raise ValueError("Invalid event code")
+
+        # Each byte of event * n_states + state stays below 256, so adding
+        # both vectors as big integers never carries between machines.
+        size = len(self.states)
+        combined = int.from_bytes(events.translate(self._scale), "big")
+        combined += int.from_bytes(self.states, "big")
+        self.states[:] = combined.to_bytes(size, "big").translate(self._combined)
+
+    def count(self, state):
+        """
+        Provides the number of machines in the given state.
+        """
+        return self.states.count(self.machine_class.state_codes[state])
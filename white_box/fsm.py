@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""
+Table-driven finite state machine core for the state exercises.
+"""
+
+
+def event_method(method):
+    """
+    Declares an event method of a StateMachine subclass. The declared
+    body is replaced by a method firing the TRANSITIONS entry of the same
+    name, so it only holds the docstring.
+    """
+    method.fsm_event = True
+    return method
+
+
+def _compile_event(cls, method):
+    """
+    Builds the method firing an event: the fire path with the event's row
+    of the transition table bound, instead of looked up on every call.
+    """
+    transitions = cls.transition_table[method.__name__]
+    invalid_message = cls.INVALID_MESSAGE
+
+    def fire_event(self):
+        # pylint: disable=protected-access
+        transition = transitions[self._state]
+        if transition is None:
+            return invalid_message
+
+        self._state, message = transition
+        return message
+
+    fire_event.__name__ = method.__name__
+    fire_event.__qualname__ = method.__qualname__
+    fire_event.__doc__ = method.__doc__
+    fire_event.__module__ = method.__module__
+    return fire_event
+
+
+class StateMachine:
+    """
+    Base class for finite state machines with integer-encoded states.
+    Subclasses declare STATES (state names), INITIAL_STATE and TRANSITIONS
+    as {event: {state: (next_state, message)}}. The transitions are compiled
+    once per class into tuples indexed by state code, so firing an event is
+    a lookup instead of a chain of string comparisons. Methods decorated
+    with event_method fire the event of the same name.
+    """
+
+    __slots__ = ("_state",)
+
+    STATES = ()
+    INITIAL_STATE = None
+    TRANSITIONS = {}
+    INVALID_MESSAGE = "Invalid operation in current state"
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Compiles the transition table of the subclass.
+        """
+        super().__init_subclass__(**kwargs)
+
+        codes = {name: code for code, name in enumerate(cls.STATES)}
+        cls.state_codes = codes
+        cls.transition_table = {
+            event_name: tuple(
+                (
+                    (codes[transitions[name][0]], transitions[name][1])
+                    if name in transitions
+                    else None
+                )
+                for name in cls.STATES
+            )
+            for event_name, transitions in cls.TRANSITIONS.items()
+        }
+
+        for name, value in list(vars(cls).items()):
+            if getattr(value, "fsm_event", False):
+                setattr(cls, name, _compile_event(cls, value))
+
+    def __init__(self):
+        """
+        Defines the initial state.
+        """
+        self._state = self.state_codes[self.INITIAL_STATE]
+
+    @property
+    def state(self):
+        """
+        Provides the current state name.
+        """
+        return self.STATES[self._state]
+
+    @state.setter
+    def state(self, name):
+        """
+        Sets the current state by name.
+        """
+        try:
+            self._state = self.state_codes[name]
+        except KeyError:
+            raise ValueError(f"Invalid state: {name}") from None
+
+    def fire(self, event):
+        """
+        Applies an event and returns its message, or INVALID_MESSAGE when
+        the event is not allowed in the current state.
+        """
+        transition = self.transition_table[event][self._state]
+        if transition is None:
+            return self.INVALID_MESSAGE
+
+        self._state, message = transition
+        return message
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+
+"""
+Opt-in call, latency and branch-outcome metrics for the class exercises.
+"""
+import functools
+import inspect
+import json
+import threading
+import time
+from bisect import bisect_left
+from enum import Enum
+
+from white_box import class_exercises
+
+# Upper bounds (in seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (1e-06, 2.5e-06, 5e-06, 1e-05, 2.5e-05, 5e-05, 0.0001, 0.001, 0.01)
+
+# Distinct outcomes kept per function, the others are counted as "other"
+MAX_OUTCOMES = 32
+
+# Prometheus metric names
+CALLS_TOTAL = "white_box_calls_total"
+LATENCY = "white_box_call_duration_seconds"
+OUTCOMES_TOTAL = "white_box_branch_outcomes_total"
+
+
+def _order_total_outcomes(args, kwargs, _):
+    """
+    Quantity discount tier hit by every item of calculate_order_total.
+    """
+    items = args[0] if args else kwargs.get("items")
+    if not isinstance(items, (list, tuple)):
+        return ()
+
+    return [class_exercises.QUANTITY_DISCOUNTS.classify(i["quantity"]) for i in items]
+
+
+def _total_discount_outcomes(args, kwargs, _):
+    """
+    Discount rate applied by calculate_total_discount.
+    """
+    total_amount = args[0] if args else kwargs["total_amount"]
+    return [f"{class_exercises.TOTAL_DISCOUNT_RATES.classify(total_amount):.0%}"]
+
+
+def _result_outcomes(_, __, result):
+    """
+    Default outcome: the result itself when it is a flag, an enum member
+    or a label string. Numbers would give a label per value.
+    """
+    if isinstance(result, Enum):
+        return [result.name]
+
+    if isinstance(result, (str, bool)):
+        return [str(result)]
+
+    return ()
+
+
+OUTCOMES = {
+    "calculate_order_total": _order_total_outcomes,
+    "calculate_total_discount": _total_discount_outcomes,
+}
+
+
+def _escape(value):
+    """
+    Escapes a Prometheus label value.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _FunctionMetrics:  # pylint: disable=too-few-public-methods
+    """
+    Metrics of an instrumented function.
+    """
+
+    __slots__ = ("calls", "seconds", "histogram", "outcomes")
+
+    def __init__(self, buckets):
+        """
+        Creates empty counters for the given number of histogram buckets.
+        """
+        self.calls = 0
+        self.seconds = 0
+        self.histogram = [0] * (buckets + 1)
+        self.outcomes = {}
+
+
+class Instrumentation:
+    """
+    Records call counts, latency histograms and branch outcomes of the
+    functions of a module (class_exercises by default).
+    enable() replaces the module functions with instrumented wrappers and
+    disable() puts the originals back, so nothing is paid while disabled.
+    Only calls made through the module attributes are seen, not through
+    names imported before enable(), which is why the validate CLI, pricing
+    and benchmarks call the exercises through the module.
+    """
+
+    def __init__(self, module=class_exercises, buckets=DEFAULT_BUCKETS):
+        """
+        Creates an instrumentation with empty metrics.
+        """
+        self.module = module
+        self.buckets = tuple(sorted(buckets))
+        self._originals = {}
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __enter__(self):
+        """
+        Enables the instrumentation for a with block.
+        """
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        """
+        Disables the instrumentation at the end of a with block.
+        """
+        self.disable()
+
+    @property
+    def enabled(self):
+        """
+        Checks if any function is instrumented.
+        """
+        return bool(self._originals)
+
+    def functions(self):
+        """
+        Provides the names of the public functions defined in the module.
+        """
+        return [
+            name
+            for name, value in vars(self.module).items()
+            if inspect.isfunction(value)
+            and value.__module__ == self.module.__name__
+            and not name.startswith("_")
+        ]
+
+    def enable(self, names=None):
+        """
+        Instruments the given functions (all of them by default).
+        """
+        for name in self.functions() if names is None else names:
+            if name not in self._originals:
+                function = getattr(self.module, name)
+                self._originals[name] = function
+                setattr(self.module, name, self._wrap(name, function))
+
+    def disable(self):
+        """
+        Restores the original functions. The metrics are kept.
+        """
+        for name, function in self._originals.items():
+            setattr(self.module, name, function)
+
+        self._originals = {}
+
+    def reset(self):
+        """
+        Clears the metrics.
+        """
+        with self._lock:
+            self._metrics = {}
+
+    def _wrap(self, name, function):
+        """
+        Builds the instrumented version of a function.
+        """
+        outcomes_of = OUTCOMES.get(name, _result_outcomes)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except Exception:
+                self._record(name, time.perf_counter() - start, ["exception"])
+                raise
+
+            elapsed = time.perf_counter() - start
+            self._record(name, elapsed, outcomes_of(args, kwargs, result))
+            return result
+
+        return wrapper
+
+    def _record(self, name, elapsed, outcomes):
+        """
+        Adds a call to the metrics.
+        """
+        with self._lock:
+            metrics = self._metrics.get(name)
+            if metrics is None:
+                metrics = self._metrics[name] = _FunctionMetrics(len(self.buckets))
+
+            metrics.calls += 1
+            metrics.seconds += elapsed
+            metrics.histogram[bisect_left(self.buckets, elapsed)] += 1
+
+            counters = metrics.outcomes
+            for outcome in outcomes:
+                if outcome not in counters and len(counters) >= MAX_OUTCOMES:
+                    outcome = "other"
+                counters[outcome] = counters.get(outcome, 0) + 1
+
+    def snapshot(self):
+        """
+        Provides a copy of the metrics as plain data.
+        Histogram bucket counts are cumulative, as in Prometheus.
+        """
+        with self._lock:
+            snapshot = {}
+            for name, metrics in self._metrics.items():
+                cumulative, total = [], 0
+                for count in metrics.histogram:
+                    total += count
+                    cumulative.append(total)
+
+                snapshot[name] = {
+                    "calls": metrics.calls,
+                    "latency_seconds": {
+                        "sum": metrics.seconds,
+                        "buckets": dict(
+                            zip([str(b) for b in self.buckets] + ["+Inf"], cumulative)
+                        ),
+                    },
+                    "outcomes": dict(metrics.outcomes),
+                }
+
+        return snapshot
+
+    def to_json(self):
+        """
+        Exports the metrics as JSON.
+        """
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        """
+        Exports the metrics in the Prometheus text format.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {CALLS_TOTAL} Calls per function.",
+            f"# TYPE {CALLS_TOTAL} counter",
+        ]
+        lines += [
+            f'{CALLS_TOTAL}{{function="{_escape(name)}"}} {metrics["calls"]}'
+            for name, metrics in snapshot.items()
+        ]
+
+        lines += [
+            f"# HELP {LATENCY} Call latency per function.",
+            f"# TYPE {LATENCY} histogram",
+        ]
+        for name, metrics in snapshot.items():
+            label = f'function="{_escape(name)}"'
+            latency = metrics["latency_seconds"]
+            lines += [
+                f'{LATENCY}_bucket{{{label},le="{bound}"}} {count}'
+                for bound, count in latency["buckets"].items()
+            ]
+            lines.append(f"{LATENCY}_sum{{{label}}} {latency['sum']}")
+            lines.append(f"{LATENCY}_count{{{label}}} {metrics['calls']}")
+
+        lines += [
+            f"# HELP {OUTCOMES_TOTAL} Branch outcomes per function.",
+            f"# TYPE {OUTCOMES_TOTAL} counter",
+        ]
+        for name, metrics in snapshot.items():
+            for outcome, count in metrics["outcomes"].items():
+                label = f'function="{_escape(name)}",outcome="{_escape(outcome)}"'
+                lines.append(f"{OUTCOMES_TOTAL}{{{label}}} {count}")
+
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+"""
+Precomputed decision grid for check_loan_eligibility at portfolio scale.
+"""
+from array import array
+from collections import namedtuple
+
+from white_box.class_exercises import LOAN_TYPES
+from white_box.columns import int64_bytes, number
+from white_box.rules import ThresholdTable
+
+LoanDecisions = namedtuple("LoanDecisions", "codes reasons")
+# Integer credit scores below this bound are read from the score grid
+SCORE_DOMAIN = 1 << 16
+
+
+def _breakpoint_key(threshold):
+    """
+    Sorts (value, operator) breakpoints by value, ">=" before ">" on the
+    same value.
+    """
+    value, operator = threshold
+    return value, operator == ">"
+
+
+class LoanDecisionGrid:
+    """
+    A two-level table like LOAN_TYPES (income tiers, then a credit score
+    table per tier) precomputed as a grid of income tiers by credit score
+    intervals, the intervals between all the score breakpoints.
+    A decision is a code, the position of its label in labels, and a
+    reason bitmask with one bit per breakpoint met (see reasons).
+    """
+
+    def __init__(self, table=LOAN_TYPES):
+        """
+        Builds the grid of codes and reasons of every cell.
+        """
+        tiers = [
+            tier if isinstance(tier, ThresholdTable) else ThresholdTable([tier])
+            for tier in table.labels
+        ]
+        breakpoints = sorted(
+            {threshold for tier in tiers for threshold in tier.breakpoints},
+            key=_breakpoint_key,
+        )
+
+        self.incomes = table
+        self.scores = ThresholdTable(range(len(breakpoints) + 1), breakpoints)
+        self.labels = tuple(
+            dict.fromkeys(label for tier in tiers for label in tier.labels)
+        )
+        self.reasons = tuple(
+            f"{name} {operator} {value}"
+            for name, table_breakpoints in (
+                ("income", table.breakpoints),
+                ("credit_score", breakpoints),
+            )
+            for value, operator in table_breakpoints
+        )
+        if len(tiers) * len(self.scores.labels) > 256 or len(self.reasons) > 8:
+            raise ValueError("The grid must fit in byte cells and byte reasons")
+
+        self._width = len(self.scores.labels)
+        codes, reasons = bytearray(256), bytearray(256)
+        for position, tier in enumerate(tiers):
+            tier_breakpoints = set(tier.breakpoints)
+            for interval in range(self._width):
+                cell = position * self._width + interval
+                label = sum(b in tier_breakpoints for b in breakpoints[:interval])
+                codes[cell] = self.labels.index(tier.labels[label])
+                # Tier and interval positions are the numbers of breakpoints met
+                income_bits = (1 << position) - 1
+                score_bits = (1 << interval) - 1
+                reasons[cell] = income_bits | score_bits << len(table.breakpoints)
+        # (codes, reasons) translation tables from cell numbers
+        self._cells = bytes(codes), bytes(reasons)
+        self._score_grid = self._build_score_grid()
+
+    def _build_score_grid(self):
+        """
+        Precomputes the interval of every score of SCORE_DOMAIN as a grid
+        of 256 rows (high byte) by 256 columns (low byte). The rows without
+        a breakpoint hold a single interval, kept in one table of the high
+        byte; the others keep a table of the low byte.
+        Returns (table of the high byte, [(row selector, row table)]).
+        """
+        intervals = self.scores.index_many(range(SCORE_DOMAIN))
+        score_rows = bytearray(256)
+        split_rows = []
+        for row in range(256):
+            cells = bytes(intervals[row * 256 : (row + 1) * 256])
+            if cells.count(cells[0]) == len(cells):
+                score_rows[row] = cells[0]
+            else:
+                selector = bytes(255 if byte == row else 0 for byte in range(256))
+                split_rows.append((selector, cells))
+        return bytes(score_rows), split_rows
+
+    def _cell(self, income, credit_score):
+        """
+        Provides the grid cell of an income and a credit score.
+        """
+        tier = self.incomes.index(income)
+        return tier * self._width + self.scores.index(credit_score)
+
+    def decide(self, income, credit_score):
+        """
+        Provides the (code, reasons) decision of a single applicant.
+        """
+        cell = self._cell(income, credit_score)
+        codes, reasons = self._cells
+        return codes[cell], reasons[cell]
+
+    def _score_intervals(self, credit_scores):
+        """
+        Provides the score intervals of a sequence of credit scores as a
+        big integer with one byte per score.
+        When all the scores are integers of SCORE_DOMAIN the grid gives
+        them with a few bytes.translate calls on their two low bytes,
+        otherwise they are bisected.
+        """
+
+        def bisected():
+            return number(bytes(self.scores.index_many(credit_scores)))
+
+        if isinstance(credit_scores, array) and credit_scores.typecode in "fd":
+            return bisected()
+        try:
+            data = int64_bytes(credit_scores)
+        except (TypeError, OverflowError):
+            # Not all integers
+            return bisected()
+
+        upper = 0
+        for position in range(2, 8):
+            upper |= number(data[position::8])
+        if upper:
+            # Some scores are outside SCORE_DOMAIN
+            return bisected()
+
+        score_rows, split_rows = self._score_grid
+        high, low = data[1::8], data[0::8]
+        intervals = number(high.translate(score_rows))
+        for selector, cells in split_rows:
+            intervals |= number(high.translate(selector)) & number(low.translate(cells))
+        return intervals
+
+    def decide_many(self, incomes, credit_scores):
+        """
+        Decides sequences of incomes and credit scores.
+        Returns LoanDecisions with a bytes of codes and a bytes of reasons.
+        Income tiers are bisections mapped in C and score intervals come
+        from the score grid. The cell numbers, one per byte, are
+        tier * width + interval in big-int arithmetic, so codes and reasons
+        are a bytes.translate each.
+        """
+        count = len(incomes)
+        if len(credit_scores) != count:
+            raise ValueError("Incomes and credit scores must have the same length")
+
+        tiers = number(bytes(self.incomes.index_many(incomes)))
+        intervals = self._score_intervals(credit_scores)
+        cells = (tiers * self._width + intervals).to_bytes(count, "big")
+        codes, reasons = self._cells
+        return LoanDecisions(cells.translate(codes), cells.translate(reasons))
+
+    def label(self, code):
+        """
+        Provides the check_loan_eligibility label of a code.
+        """
+        return self.labels[code]
+
+    def explain(self, reasons):
+        """
+        Provides the breakpoints met by a reason bitmask.
+        """
+        return [name for bit, name in enumerate(self.reasons) if reasons >> bit & 1]
+
+
+LOAN_GRID = LoanDecisionGrid()
+
+
+def loan_decisions(incomes, credit_scores):
+    """
+    Batch version of check_loan_eligibility with LOAN_GRID.
+    """
+    return LOAN_GRID.decide_many(incomes, credit_scores)
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+"""
+Size-bounded memoization for the validator exercises.
+"""
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+# Approximate bookkeeping cost of a cache entry (dict slot, node, tuple)
+ENTRY_OVERHEAD = 160
+
+
+class _CacheCounters:  # pylint: disable=too-few-public-methods
+    """
+    Lookup and eviction counters of a MemoCache.
+    """
+
+    __slots__ = ("hits", "misses", "evictions")
+
+    def __init__(self):
+        """
+        Starts every counter at zero.
+        """
+        self.hits = self.misses = self.evictions = 0
+
+
+class MemoCache:
+    """
+    LRU cache limited by the approximate memory of its entries in bytes,
+    with an optional time to live in seconds.
+    """
+
+    def __init__(self, max_bytes=1 << 20, ttl=None, clock=None):
+        """
+        Creates an empty cache.
+        """
+        if max_bytes < 0:
+            raise ValueError("The size limit can't be negative")
+
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = time.monotonic if clock is None else clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self._counters = _CacheCounters()
+
+    @staticmethod
+    def entry_size(key, value):
+        """
+        Provides the approximate memory used by an entry.
+        """
+        return (
+            ENTRY_OVERHEAD
+            + sys.getsizeof(key)
+            + sum(map(sys.getsizeof, key))
+            + sys.getsizeof(value)
+        )
+
+    def get(self, key):
+        """
+        Provides (True, value) for a live entry or (False, None).
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, size, expires = entry
+                if expires is None or expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self._counters.hits += 1
+                    return True, value
+
+                del self._entries[key]
+                self.size -= size
+
+            self._counters.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        """
+        Stores an entry, evicting the least recently used ones to fit.
+        Entries bigger than the whole cache are not stored.
+        """
+        size = self.entry_size(key, value)
+        if size > self.max_bytes:
+            return
+
+        expires = None if self.ttl is None else self._clock() + self.ttl
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+
+            self._entries[key] = (value, size, expires)
+            self.size += size
+
+            while self.size > self.max_bytes:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self._counters.evictions += 1
+
+    def clear(self):
+        """
+        Removes every entry and resets the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self._counters = _CacheCounters()
+
+    def __len__(self):
+        """
+        Provides the number of entries.
+        """
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Provides the cache statistics.
+        """
+        with self._lock:
+            counters = self._counters
+            lookups = counters.hits + counters.misses
+            return {
+                "hits": counters.hits,
+                "misses": counters.misses,
+                "hit_rate": counters.hits / lookups if lookups else 0.0,
+                "evictions": counters.evictions,
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def memoize(function=None, *, max_bytes=1 << 20, ttl=None, clock=None):
+    """
+    Memoizes a function of hashable positional arguments, such as
+    validate_email, in a MemoCache available as wrapper.cache.
+    Usable as @memoize, @memoize(max_bytes=...) or memoize(function).
+    """
+
+    def decorate(function):
+        cache = MemoCache(max_bytes, ttl, clock)
+
+        @functools.wraps(function)
+        def wrapper(*args):
+            found, value = cache.get(args)
+            if found:
+                return value
+
+            value = function(*args)
+            cache.put(args, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    if function is None:
+        return decorate
+
+    return decorate(function)
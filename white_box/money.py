@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+
+"""
+Exact integer-cents money for the pricing, discount and banking exercises.
+"""
+from array import array
+from collections import namedtuple
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import lru_cache
+from itertools import accumulate
+from operator import mul
+
+from white_box.rules import ThresholdTable
+
+# Rates are integer basis points: 10_000 is 100%
+BASIS_POINTS = 10_000
+# Added before dividing non-negative amounts to round half up
+HALF_BASIS_POINT = BASIS_POINTS // 2
+# BankingSystem transfer fee rate by transaction type
+FEE_RATES = {
+    "regular": 0.02,
+    "express": 0.05,
+    "scheduled": 0.01,
+}
+
+
+def _to_units(amount, places):
+    """
+    Converts an amount (int, decimal string, Decimal or float through its
+    shortest repr) to an integer number of 10 ** -places units, rounding
+    half away from zero.
+    """
+    if isinstance(amount, int):
+        return amount * 10**places
+
+    # Floats far from a tie round the same as their repr, without Decimal
+    if isinstance(amount, float) and abs(amount) < 1e12:
+        scaled = amount * 10**places
+        nearest = round(scaled)
+        if abs(scaled - nearest) < 0.49:
+            return nearest
+
+    try:
+        value = Decimal(repr(amount) if isinstance(amount, float) else amount)
+        return int(value.scaleb(places).quantize(1, ROUND_HALF_UP))
+    except (InvalidOperation, TypeError):
+        raise ValueError(f"Invalid amount: {amount!r}") from None
+
+
+def to_cents(amount):
+    """
+    Converts an amount of dollars to integer cents (1.005 -> 101).
+    """
+    return _to_units(amount, 2)
+
+
+def to_basis_points(rate):
+    """
+    Converts a rate to integer basis points (0.95 -> 9500).
+    """
+    return _to_units(rate, 4)
+
+
+def round_div(numerator, denominator):
+    """
+    Divides integers rounding half away from zero, like ROUND_HALF_UP.
+    """
+    quotient = (2 * abs(numerator) + denominator) // (2 * denominator)
+    return quotient if numerator >= 0 else -quotient
+
+
+# tuple.__new__ skips the checks of Money() for already valid cents
+_new_money = tuple.__new__
+
+
+class Money(namedtuple("Money", "cents")):
+    """
+    An exact amount of money stored as integer cents.
+    Additions and integer multiplications are exact and applying a rate
+    rounds once to the cent.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, cents=0):
+        """
+        Creates an amount from integer cents (see Money.of for dollars).
+        """
+        if not isinstance(cents, int):
+            raise TypeError("Money takes integer cents, use Money.of for dollars")
+
+        return _new_money(cls, (cents,))
+
+    @classmethod
+    def of_basis_points(cls, amount):
+        """
+        Creates an amount from cents times basis points, rounding once.
+        """
+        return _new_money(cls, (round_div(amount, BASIS_POINTS),))
+
+    @classmethod
+    def of(cls, amount):
+        """
+        Creates an amount from dollars, e.g. Money.of("19.99").
+        """
+        return cls(to_cents(amount))
+
+    def __str__(self):
+        dollars, cents = divmod(abs(self.cents), 100)
+        return f"{'-' if self.cents < 0 else ''}${dollars}.{cents:02d}"
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return _new_money(Money, (self.cents + other.cents,))
+        return NotImplemented
+
+    def __radd__(self, other):
+        # Lets sum() start from 0
+        return self if other == 0 else NotImplemented
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return _new_money(Money, (self.cents - other.cents,))
+        return NotImplemented
+
+    def __neg__(self):
+        return _new_money(Money, (-self.cents,))
+
+    def __mul__(self, quantity):
+        if isinstance(quantity, int):
+            return _new_money(Money, (self.cents * quantity,))
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def apply_rate(self, basis_points):
+        """
+        Provides basis_points / 10_000 of the amount, rounded to the cent.
+        """
+        return _new_money(Money, (round_div(self.cents * basis_points, BASIS_POINTS),))
+
+    def to_decimal(self):
+        """
+        Provides the amount as a Decimal of dollars.
+        """
+        return Decimal(self.cents).scaleb(-2)
+
+
+@lru_cache(maxsize=1 << 16)
+def cents_of(amount):
+    """
+    Provides the cents of a Money or of an amount of dollars.
+    Cached, as the same catalog prices come up again and again.
+    """
+    return amount.cents if isinstance(amount, Money) else to_cents(amount)
+
+
+# calculate_order_total price multiplier by quantity, in basis points: the
+# single definition of the quantity tiers (fractions from 5 to 6 fall in
+# the else branch, like in the original if/elif ladder)
+QUANTITY_RATES = ThresholdTable(
+    [9_000, 10_000, 9_000, 9_500, 9_000],
+    [(1, ">="), (5, ">"), (6, ">="), (10, ">")],
+    unordered=4,
+)
+# calculate_total_discount rate by total, in cents and basis points: the
+# single definition of the total discount tiers
+TOTAL_DISCOUNT_RATES_CENTS = ThresholdTable(
+    [0, 1_000, 2_000], [(10_000, ">="), (50_000, ">")], unordered=2
+)
+FEE_BASIS_POINTS = {name: to_basis_points(rate) for name, rate in FEE_RATES.items()}
+
+
+class _QuantityRates(dict):
+    """
+    Maps quantities to their QUANTITY_RATES rate.
+    """
+
+    def __missing__(self, quantity):
+        return QUANTITY_RATES.classify(quantity)
+
+
+# Precomputed for the usual quantities, other values are computed on demand
+QUANTITY_BASIS_POINTS = _QuantityRates(
+    (quantity, QUANTITY_RATES.classify(quantity)) for quantity in range(101)
+)
+
+
+def order_total(items):
+    """
+    Exact version of calculate_order_total: items are dicts with an
+    integer quantity and a price (Money or dollars). Rounds once, on the
+    total.
+    """
+    exact = 0
+    for item in items:
+        quantity = item["quantity"]
+        if not isinstance(quantity, int):
+            raise TypeError(f"Quantities must be integers: {quantity!r}")
+        exact += quantity * cents_of(item["price"]) * QUANTITY_BASIS_POINTS[quantity]
+
+    return Money.of_basis_points(exact)
+
+
+def total_discount(total):
+    """
+    Exact version of calculate_total_discount for a Money total.
+    """
+    return total.apply_rate(TOTAL_DISCOUNT_RATES_CENTS.classify(total.cents))
+
+
+def transfer_fee(amount, transaction_type):
+    """
+    Exact fee of a BankingSystem transfer of a Money amount.
+    """
+    try:
+        return amount.apply_rate(FEE_BASIS_POINTS[transaction_type])
+    except KeyError:
+        raise ValueError(f"Invalid transaction type: {transaction_type}") from None
+
+
+def cart_total(cart):
+    """
+    Exact total of a ShoppingCart, to use at checkout.
+    """
+    return sum(
+        (Money.of(item["product"].price) * item["quantity"] for item in cart.items),
+        Money(),
+    )
+
+
+def _check_cents(*columns):
+    """
+    Checks the batch columns hold no negative amounts.
+    """
+    for column in columns:
+        if len(column) and min(column) < 0:
+            raise ValueError("Batch amounts and quantities must not be negative")
+
+
+def order_totals(quantities, prices, order_sizes):
+    """
+    Batch version of order_total on int64 columns of quantities and prices
+    in cents, with order_sizes consecutive lines per order (as in
+    pricing.calculate_order_totals). Returns an array("q") of cents.
+    """
+    if len(quantities) != len(prices):
+        raise ValueError("Quantities and prices must have the same length")
+    _check_cents(quantities, prices)
+
+    ends = list(accumulate(order_sizes))
+    if (ends[-1] if ends else 0) != len(quantities):
+        raise ValueError("Order sizes do not match the number of order lines")
+
+    line_totals = accumulate(
+        map(
+            mul,
+            map(mul, quantities, prices),
+            map(QUANTITY_BASIS_POINTS.__getitem__, quantities),
+        )
+    )
+    # Running sums at the end of every order, the difference of two
+    # consecutive ones is an order total
+    sums = [0, *line_totals]
+    ends = list(map(sums.__getitem__, ends))
+    return array(
+        "q",
+        [
+            (end - start + HALF_BASIS_POINT) // BASIS_POINTS
+            for start, end in zip([0, *ends], ends)
+        ],
+    )
+
+
+def total_discounts(totals):
+    """
+    Batch version of total_discount on an int64 column of cents.
+    Returns an array("q") of cents.
+    """
+    _check_cents(totals)
+
+    rates = TOTAL_DISCOUNT_RATES_CENTS.labels
+    tiers = TOTAL_DISCOUNT_RATES_CENTS.index_many(totals)
+    return array(
+        "q",
+        [
+            (total * rates[tier] + HALF_BASIS_POINT) // BASIS_POINTS
+            for total, tier in zip(totals, tiers)
+        ],
+    )
+
+
+def transfer_fees(amounts, transaction_types):
+    """
+    Batch version of transfer_fee on an int64 column of cents.
+    Returns an array("q") of cents.
+    """
+    if len(amounts) != len(transaction_types):
+        raise ValueError("Amounts and transaction types must have the same length")
+    _check_cents(amounts)
+
+    try:
+        rates = list(map(FEE_BASIS_POINTS.__getitem__, transaction_types))
+    except KeyError as error:
+        raise ValueError(f"Invalid transaction type: {error.args[0]}") from None
+
+    return array(
+        "q",
+        [
+            (amount * rate + HALF_BASIS_POINT) // BASIS_POINTS
+            for amount, rate in zip(amounts, rates)
+        ],
+    )
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""
+Process-pool map for running the exercises over large batches.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import starmap
+
+from white_box.chunks import read_chunks
+
+
+def _apply_chunk(func, chunk, star):
+    """
+    Runs func over a chunk inside a worker process.
+    """
+    if star:
+        return list(starmap(func, chunk))
+
+    return list(map(func, chunk))
+
+
+def parallel_map(func, iterable, workers=None, chunk_size=1000, star=False):
+    """
+    Lazily maps func over iterable using a pool of worker processes.
+    The input is sent to the workers in chunks of chunk_size items and at
+    most two chunks per worker are in flight, so the input can be a stream.
+    Results are yielded in input order. With star=True every item is
+    unpacked as the arguments of func (like itertools.starmap).
+    func must be picklable, e.g. a module level function.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1")
+
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+
+        for chunk in read_chunks(iterable, chunk_size):
+            pending.append(executor.submit(_apply_chunk, func, chunk, star))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+
+"""
+Fast password validation with the rules of validate_password.
+"""
+import string
+
+UPPERCASE = frozenset(string.ascii_uppercase)
+LOWERCASE = frozenset(string.ascii_lowercase)
+DIGITS = frozenset(string.digits)
+SPECIAL_CHARACTERS = frozenset("!@#$%&")
+
+
+def is_valid_password(password):
+    """
+    Validates a password in a single pass over its characters.
+    Same rules as validate_password: at least 8 characters with one
+    uppercase letter, one lowercase letter, one digit and one special
+    character.
+    """
+    if len(password) < 8:
+        return False
+
+    chars = set(password)
+
+    if (
+        chars.isdisjoint(UPPERCASE)
+        or chars.isdisjoint(LOWERCASE)
+        or chars.isdisjoint(SPECIAL_CHARACTERS)
+    ):
+        return False
+
+    # \d also matches non-ASCII decimal digits, so fall back to isdecimal
+    return not chars.isdisjoint(DIGITS) or any(char.isdecimal() for char in chars)
+
+
+def validate_passwords(passwords):
+    """
+    Lazily validates an iterable of passwords, yielding one result each.
+    """
+    return map(is_valid_password, passwords)
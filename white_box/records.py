@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+"""
+Memory-mapped fixed-width record files for bulk validation.
+Usage: python -m white_box.records INPUT --record-size N [--card N] [--date N]
+"""
+import argparse
+import json
+import mmap
+import os
+import time
+from collections import namedtuple
+
+from white_box.validators import scan_card_records, scan_date_records
+
+CARD_WIDTH = 16
+DATE_WIDTH = 8
+
+
+def _scan_cards(block, record_size, offset, width):
+    """
+    Validates the right-aligned card numbers of a block of records.
+    """
+    return scan_card_records(block, width, record_size, offset)[0]
+
+
+def _scan_dates(block, record_size, offset, width):
+    """
+    Validates the YYYYMMDD dates of a block of records.
+    """
+    if width != DATE_WIDTH:
+        raise ValueError("Dates must be YYYYMMDD fields")
+
+    return scan_date_records(block, record_size, offset)[0]
+
+
+# kind: bulk validator(block, record size, field offset, field width) -> mask
+SCANNERS = {"card": _scan_cards, "date": _scan_dates}
+
+
+class ScanReport(namedtuple("ScanReport", "rows bytes seconds valid")):
+    """
+    Totals of a scan: valid maps every checked field to its valid rows.
+    """
+
+    __slots__ = ()
+
+    @property
+    def rows_per_second(self):
+        """
+        Provides the scanned rows per second.
+        """
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self):
+        """
+        Provides the scanned bytes per second.
+        """
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+    def to_dict(self):
+        """
+        Provides the report as a dictionary, throughputs included.
+        """
+        return {
+            **self._asdict(),
+            "rows_per_second": self.rows_per_second,
+            "bytes_per_second": self.bytes_per_second,
+        }
+
+
+class RecordFile:
+    """
+    Read-only memory map of a file of fixed-width records.
+    Records and fields are memoryview slices of the map, so nothing is
+    copied or decoded until a validator reads them. Slices must be released
+    before closing the file.
+    """
+
+    def __init__(self, path, record_size, fields=None):
+        """
+        fields maps the field names to their (offset, width) in a record.
+        """
+        if record_size <= 0:
+            raise ValueError("The record size must be positive")
+
+        self.record_size = record_size
+        self.fields = dict(fields or {})
+        for name, (offset, width) in self.fields.items():
+            if offset < 0 or width <= 0 or offset + width > record_size:
+                raise ValueError(f"The field {name} must fit in the record")
+
+        with open(path, "rb") as stream:
+            if os.fstat(stream.fileno()).st_size:
+                self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._map = b""
+        self.view = memoryview(self._map)
+
+        self._count, remainder = divmod(len(self.view), record_size)
+        if remainder:
+            self.close()
+            raise ValueError("The file size is not a multiple of the record size")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        """
+        Provides a record as a memoryview.
+        """
+        if not -self._count <= index < self._count:
+            raise IndexError("Record index out of range")
+
+        start = index % self._count * self.record_size
+        return self.view[start : start + self.record_size]
+
+    def close(self):
+        """
+        Releases the memory map.
+        """
+        self.view.release()
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def field(self, index, name):
+        """
+        Provides a field of a record as a memoryview.
+        """
+        offset, width = self.fields[name]
+        return self[index][offset : offset + width]
+
+    def blocks(self, block_records=65536):
+        """
+        Yields (first record index, memoryview) blocks of whole records.
+        """
+        if block_records <= 0:
+            raise ValueError("The block size must be positive")
+
+        block_size = block_records * self.record_size
+        for start in range(0, len(self.view), block_size):
+            yield start // self.record_size, self.view[start : start + block_size]
+
+    def scan(self, checks, block_records=65536):
+        """
+        Runs bulk validators over the records one block at a time.
+        checks maps field names to a kind of SCANNERS.
+        Yields (first record index, {field: validity mask}) for every block.
+        """
+        for name, kind in checks.items():
+            if name not in self.fields:
+                raise ValueError(f"Invalid field: {name}")
+            if kind not in SCANNERS:
+                raise ValueError(f"Invalid check: {kind}")
+
+        for start, block in self.blocks(block_records):
+            with block:
+                yield start, {
+                    name: SCANNERS[kind](block, self.record_size, *self.fields[name])
+                    for name, kind in checks.items()
+                }
+
+
+def scan_file(path, record_size, checks, block_records=65536, clock=None):
+    """
+    Validates every record of a file and returns a ScanReport with the
+    valid rows per checked field and the throughput of the run.
+    checks maps field names to their (offset, width, kind of SCANNERS).
+    """
+    clock = clock or time.perf_counter
+    fields = {name: (offset, width) for name, (offset, width, _) in checks.items()}
+    kinds = {name: kind for name, (_, _, kind) in checks.items()}
+    valid = dict.fromkeys(checks, 0)
+
+    started = clock()
+    with RecordFile(path, record_size, fields) as records:
+        for _, masks in records.scan(kinds, block_records):
+            for name, mask in masks.items():
+                valid[name] += mask.count(1)
+        rows, size = len(records), len(records.view)
+
+    return ScanReport(rows, size, clock() - started, valid)
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+    """
+    parser = argparse.ArgumentParser(description="Validate fixed-width records.")
+    parser.add_argument("input", help="input file")
+    parser.add_argument("--record-size", type=int, required=True)
+    parser.add_argument("--card", type=int, metavar="OFFSET", help="card offset")
+    parser.add_argument("--card-width", type=int, default=CARD_WIDTH)
+    parser.add_argument("--date", type=int, metavar="OFFSET", help="YYYYMMDD offset")
+    parser.add_argument("--block-records", type=int, default=65536)
+    args = parser.parse_args(argv)
+
+    checks = {}
+    if args.card is not None:
+        checks["card"] = args.card, args.card_width, "card"
+    if args.date is not None:
+        checks["date"] = args.date, DATE_WIDTH, "date"
+
+    try:
+        report = scan_file(args.input, args.record_size, checks, args.block_records)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    print(json.dumps(report.to_dict()))
+
+
+if __name__ == "__main__":
+    main()
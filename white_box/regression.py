@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+
+"""
+Performance regression suite for every function and class of class_exercises.
+Run with: python -m white_box.regression [--output results.json]
+          [--compare white_box/perf_baseline.json] [--scale 0.1]
+Each case is timed several times; a case regresses when its time per
+operation is both significantly (one-sided Mann-Whitney U test) and
+noticeably (over --threshold) slower than the baseline.
+white_box/perf_baseline.json is recorded with --scale 0.1 --output and has
+to be recorded again whenever the workload of a case changes.
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+from itertools import starmap
+
+from white_box import class_exercises as ce
+
+CASES = {}
+
+
+def case(name, size):
+    """
+    Registers a benchmark case.
+    The decorated setup function gets the number of operations and returns
+    the function to time.
+    """
+
+    def register(setup):
+        CASES[name] = (setup, size)
+        return setup
+
+    return register
+
+
+def _rng():
+    """
+    Provides a seeded random generator so every run uses the same inputs.
+    """
+    return random.Random(42)
+
+
+def _scalar_case(name, function, make_args, size=100_000):
+    """
+    Registers a case that calls function once per generated argument tuple.
+    """
+
+    def setup(count):
+        rng = _rng()
+        args = [make_args(rng) for _ in range(count)]
+        return lambda: list(starmap(function, args))
+
+    case(name, size)(setup)
+
+
+_scalar_case("is_even", ce.is_even, lambda r: (r.randint(-1000, 1000),))
+_scalar_case("divide", ce.divide, lambda r: (r.random(), r.randint(0, 3)))
+_scalar_case("get_grade", ce.get_grade, lambda r: (r.randint(0, 100),))
+_scalar_case(
+    "is_triangle", ce.is_triangle, lambda r: tuple(r.randint(1, 10) for _ in range(3))
+)
+_scalar_case(
+    "check_number_status", ce.check_number_status, lambda r: (r.randint(-5, 5),)
+)
+_scalar_case(
+    "validate_password",
+    ce.validate_password,
+    lambda r: ("".join(r.choices("aZ9@xY-", k=r.randint(6, 14))),),
+    size=1_000_000,
+)
+_scalar_case(
+    "calculate_total_discount",
+    ce.calculate_total_discount,
+    lambda r: (r.uniform(0, 1000),),
+)
+_scalar_case(
+    "calculate_items_shipping_cost",
+    ce.calculate_items_shipping_cost,
+    lambda r: (
+        [{"weight": r.uniform(0, 4)} for _ in range(r.randint(1, 5))],
+        r.choice(("standard", "express")),
+    ),
+)
+_scalar_case(
+    "validate_login",
+    ce.validate_login,
+    lambda r: ("u" * r.randint(3, 22), "p" * r.randint(6, 17)),
+)
+_scalar_case("verify_age", ce.verify_age, lambda r: (r.randint(0, 100),))
+_scalar_case(
+    "categorize_product", ce.categorize_product, lambda r: (r.randint(0, 250),)
+)
+_scalar_case(
+    "validate_email",
+    ce.validate_email,
+    lambda r: (r.choice(("email@test.com", "email.test", "a@b")),),
+)
+_scalar_case(
+    "celsius_to_fahrenheit", ce.celsius_to_fahrenheit, lambda r: (r.uniform(-150, 150),)
+)
+_scalar_case(
+    "validate_credit_card",
+    ce.validate_credit_card,
+    lambda r: (str(r.randrange(10**11, 10**17)),),
+)
+_scalar_case(
+    "validate_date",
+    ce.validate_date,
+    lambda r: (r.randint(1850, 2150), r.randint(0, 13), r.randint(0, 32)),
+)
+_scalar_case(
+    "check_flight_eligibility",
+    ce.check_flight_eligibility,
+    lambda r: (r.randint(0, 100), r.random() < 0.5),
+)
+_scalar_case(
+    "validate_url",
+    ce.validate_url,
+    lambda r: (r.choice(("http://a.com", "https://b.org/x", "ftp://c")),),
+)
+_scalar_case(
+    "calculate_quantity_discount",
+    ce.calculate_quantity_discount,
+    lambda r: (r.randint(0, 20),),
+)
+_scalar_case(
+    "check_file_size", ce.check_file_size, lambda r: (r.randint(-10, 2_000_000),)
+)
+_scalar_case(
+    "check_loan_eligibility",
+    ce.check_loan_eligibility,
+    lambda r: (r.randint(0, 100_000), r.randint(300, 850)),
+)
+_scalar_case(
+    "calculate_shipping_cost",
+    ce.calculate_shipping_cost,
+    lambda r: tuple(r.uniform(0, 35) for _ in range(4)),
+)
+_scalar_case(
+    "grade_quiz", ce.grade_quiz, lambda r: (r.randint(0, 10), r.randint(0, 10))
+)
+_scalar_case(
+    "authenticate_user",
+    ce.authenticate_user,
+    lambda r: r.choice((("admin", "admin123"), ("nicolas", "password"), ("a", "b"))),
+)
+_scalar_case(
+    "get_weather_advisory",
+    ce.get_weather_advisory,
+    lambda r: (r.uniform(-10, 40), r.uniform(0, 100)),
+)
+
+
+@case("calculate_order_total", 10_000)
+def _order_total(count):
+    rng = _rng()
+    items = [
+        {"quantity": rng.randint(1, 20), "price": rng.uniform(1, 100)}
+        for _ in range(count)
+    ]
+    return lambda: ce.calculate_order_total(items)
+
+
+def _fsm_case(name, machine_class, events):
+    """
+    Registers a case firing 1M transitions on a state machine.
+    """
+
+    def setup(count):
+        machine = machine_class()
+        methods = [getattr(machine, event) for event in events]
+        calls = methods * (count // len(methods))
+        return lambda: [method() for method in calls]
+
+    case(name, 1_000_000)(setup)
+
+
+_fsm_case("VendingMachine", ce.VendingMachine, ("insert_coin", "select_drink"))
+_fsm_case("TrafficLight", ce.TrafficLight, ("change_state",))
+_fsm_case("UserAuthentication", ce.UserAuthentication, ("login", "logout"))
+_fsm_case(
+    "DocumentEditingSystem",
+    ce.DocumentEditingSystem,
+    ("save_document", "edit_document"),
+)
+_fsm_case("ElevatorSystem", ce.ElevatorSystem, ("move_up", "stop", "move_down", "stop"))
+
+
+@case("BankAccount", 100_000)
+def _bank_account(count):
+    return lambda: [ce.BankAccount(number, 1000) for number in range(count)]
+
+
+@case("BankingSystem", 100_000)
+def _banking_system(count):
+    def run():
+        # Enough funds for every transfer to be processed
+        ledger = ce.Ledger(default_balance=2 * count)
+        bank = ce.BankingSystem(quiet=True, max_events=1, ledger=ledger)
+        bank.authenticate("user123", "pass123")
+        for _ in range(count):
+            bank.transfer_money("user123", "bob", 1, "regular")
+
+    return run
+
+
+@case("Product", 100_000)
+def _product(count):
+    return lambda: [ce.Product("Apple", price) for price in range(count)]
+
+
+@case("ShoppingCart", 10_000)
+def _shopping_cart(count):
+    products = [ce.Product(f"Product {n}", n) for n in range(count)]
+
+    def run():
+        cart = ce.ShoppingCart()
+        for product in products:
+            cart.add_product(product, 2)
+        for product in products:
+            cart.remove_product(product)
+        return cart.total
+
+    return run
+
+
+def run_suite(names=None, scale=1.0, samples=7):
+    """
+    Times the selected cases and returns the results as plain data.
+    """
+    results = {}
+    for name, (setup, size) in CASES.items():
+        if names and name not in names:
+            continue
+
+        count = max(1, int(size * scale))
+        function = setup(count)
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+
+        results[name] = {"operations": count, "seconds": timings}
+
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": results,
+    }
+
+
+def _rank_sum(baseline, current):
+    """
+    Provides the rank sum of current in the pooled samples (tied values
+    share their average rank) and the tie correction term.
+    """
+    values = sorted(
+        (value, group)
+        for group, sample in enumerate((baseline, current))
+        for value in sample
+    )
+    total = len(values)
+
+    rank_sum, ties, position = 0, 0, 0
+    while position < total:
+        end = position
+        while end + 1 < total and values[end + 1][0] == values[position][0]:
+            end += 1
+        tied = end - position + 1
+        ties += tied**3 - tied
+        average_rank = (position + end) / 2 + 1
+        rank_sum += average_rank * sum(g for _, g in values[position : end + 1])
+        position = end + 1
+
+    return rank_sum, ties
+
+
+def mann_whitney_p(baseline, current):
+    """
+    One-sided p-value of the Mann-Whitney U test (normal approximation
+    with tie correction) for current being larger than baseline.
+    """
+    n_base, n_current = len(baseline), len(current)
+    total = n_base + n_current
+    rank_sum, ties = _rank_sum(baseline, current)
+
+    u_current = rank_sum - n_current * (n_current + 1) / 2
+    mean = n_base * n_current / 2
+    variance = n_base * n_current / 12 * ((total + 1) - ties / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+
+    z = (u_current - mean - 0.5) / math.sqrt(variance)
+    return 1 - statistics.NormalDist().cdf(z)
+
+
+def compare(baseline, current, alpha=0.01, threshold=0.1):
+    """
+    Compares two suite results per operation.
+    Returns (name, baseline median, current median, change, p-value,
+    regressed) rows for the cases present in both.
+    """
+    rows = []
+    for name, result in current["cases"].items():
+        reference = baseline["cases"].get(name)
+        if reference is None:
+            continue
+
+        before = [s / reference["operations"] for s in reference["seconds"]]
+        after = [s / result["operations"] for s in result["seconds"]]
+        change = statistics.median(after) / statistics.median(before) - 1
+        p_value = mann_whitney_p(before, after)
+        regressed = p_value < alpha and change > threshold
+        rows.append(
+            (
+                name,
+                statistics.median(before),
+                statistics.median(after),
+                change,
+                p_value,
+                regressed,
+            )
+        )
+
+    return rows
+
+
+def _print_results(results):
+    """
+    Prints the median time per operation of every case.
+    """
+    for name, result in results["cases"].items():
+        median = statistics.median(result["seconds"]) / result["operations"]
+        print(f"{name:<32} {median * 1e9:>12,.1f} ns/op")
+
+
+def _print_comparison(rows):
+    """
+    Prints the rows of compare, flagging the regressions.
+    """
+    for name, before, after, change, p_value, regressed in rows:
+        print(
+            f"{name:<32} {before * 1e9:>10,.1f} -> {after * 1e9:>10,.1f} ns/op"
+            f" {change:>+8.1%} p={p_value:.4f}{'  REGRESSION' if regressed else ''}"
+        )
+
+
+def main(argv=None):
+    """
+    Runs the suite, optionally saving and comparing the results.
+    Exits with status 1 when a regression is found.
+    """
+    parser = argparse.ArgumentParser(description="Performance regression suite.")
+    parser.add_argument("names", nargs="*", help="cases to run (all by default)")
+    parser.add_argument("--scale", type=float, default=1.0, help="input size factor")
+    parser.add_argument("--samples", type=int, default=7)
+    parser.add_argument("--output", help="file to save the results as JSON")
+    parser.add_argument("--compare", help="baseline results JSON file")
+    parser.add_argument("--alpha", type=float, default=0.01)
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    results = run_suite(args.names, args.scale, args.samples)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            json.dump(results, stream, indent=2, sort_keys=True)
+            stream.write("\n")
+
+    if not args.compare:
+        _print_results(results)
+        return
+
+    with open(args.compare, encoding="utf-8") as stream:
+        baseline = json.load(stream)
+
+    rows = compare(baseline, results, args.alpha, args.threshold)
+    _print_comparison(rows)
+    if any(row[-1] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
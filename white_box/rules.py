@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+"""
+Declarative threshold tables for the if/elif classifier exercises.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress, repeat
+from operator import add, ne
+
+OPERATORS = (">=", ">")
+INTEGER_TYPECODES = "bBhHiIlLqQ"
+
+
+class ThresholdTable:
+    """
+    A threshold ladder stored as a sorted table of breakpoints.
+    labels has one entry more than breakpoints. Each breakpoint is a
+    (value, operator) pair: with ">=" a value equal to the breakpoint
+    already gets the next label, with ">" only greater values do.
+    Values that cannot be ordered (NaN) fail every comparison of an
+    if/elif ladder and get its else label: unordered is its position.
+    """
+
+    def __init__(self, labels, breakpoints=(), unordered=0):
+        """
+        Validates and stores the table.
+        """
+        if len(labels) != len(breakpoints) + 1:
+            raise ValueError("There must be one label more than breakpoints")
+
+        if not 0 <= unordered < len(labels):
+            raise ValueError("The unordered label must be one of the labels")
+
+        for _, operator in breakpoints:
+            if operator not in OPERATORS:
+                raise ValueError(f"Invalid breakpoint operator: {operator}")
+
+        values = [value for value, _ in breakpoints]
+        if any(low >= high for low, high in zip(values, values[1:])):
+            raise ValueError("Breakpoints must be strictly increasing")
+
+        self.labels = tuple(labels)
+        self._values = values
+        self._inclusive = [operator == ">=" for _, operator in breakpoints]
+        self.unordered = unordered
+
+    @property
+    def breakpoints(self):
+        """
+        Provides the (value, operator) breakpoints.
+        """
+        return [
+            (value, ">=" if inclusive else ">")
+            for value, inclusive in zip(self._values, self._inclusive)
+        ]
+
+    def index(self, value):
+        """
+        Returns the position of the label for the given value.
+        """
+        if value != value:  # pylint: disable=comparison-with-itself
+            return self.unordered
+
+        position = bisect_left(self._values, value)
+        if (
+            position < len(self._values)
+            and self._values[position] == value
+            and self._inclusive[position]
+        ):
+            position += 1
+
+        return position
+
+    def index_many(self, values):
+        """
+        Returns the label positions for every value of a sequence.
+        Same result as index, with the bisection and the equality check
+        mapped in C instead of a Python call per value.
+        """
+        if (
+            isinstance(values, array)
+            and values.typecode in INTEGER_TYPECODES
+            and all(isinstance(value, int) for value in self._values)
+        ):
+            # For integers x >= value is x > value - 1: one bisection
+            keys = [
+                value - 1 if inclusive else value
+                for value, inclusive in zip(self._values, self._inclusive)
+            ]
+            return list(map(bisect_left, repeat(keys), values))
+
+        positions = map(bisect_left, repeat(self._values), values)
+        inclusive = {
+            value for value, included in zip(self._values, self._inclusive) if included
+        }
+        if inclusive:
+            positions = map(add, positions, map(inclusive.__contains__, values))
+        positions = list(positions)
+
+        # NaN bisects to 0, the only value not equal to itself
+        if self.unordered:
+            for index in compress(range(len(positions)), map(ne, values, values)):
+                positions[index] = self.unordered
+        return positions
+
+    def lower_bound(self, values, position, key=None, hi=None):
+        """
+        Returns the first index of the sorted values whose label position
+        is position or greater (bisect with the table operators). As in
+        bisect, hi bounds the values searched.
+        """
+        if hi is None:
+            hi = len(values)
+        if position <= 0:
+            return 0
+        if position > len(self._values):
+            return hi
+
+        value = self._values[position - 1]
+        if self._inclusive[position - 1]:
+            return bisect_left(values, value, 0, hi, key=key)
+        return bisect_right(values, value, 0, hi, key=key)
+
+    def classify(self, value):
+        """
+        Returns the label for the given value.
+        """
+        return self.labels[self.index(value)]
+
+    def classify_many(self, values):
+        """
+        Returns the labels for every value of an iterable.
+        """
+        return list(map(self.classify, values))
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch and streaming sensor mode for the temperature exercises.
+"""
+import math
+from array import array
+from collections import defaultdict, deque, namedtuple
+from itertools import compress
+
+from white_box.columns import DoubleColumn
+
+# Codes of the get_weather_advisory messages
+ADVISORIES = (
+    "No Specific Advisory",
+    "High Temperature and Humidity. Stay Hydrated.",
+    "Low Temperature. Bundle Up!",
+)
+NO_ADVISORY, HEAT_ADVISORY, COLD_ADVISORY = range(len(ADVISORIES))
+
+TelemetryBatch = namedtuple("TelemetryBatch", "fahrenheit valid advisories")
+WindowStats = namedtuple("WindowStats", "count mean minimum maximum")
+
+
+def _fahrenheit(temperatures, valid):
+    """
+    Converts a column of Celsius temperatures, with NaN where the valid
+    bytes mask is 0.
+    """
+    fahrenheit = array("d", [(c * 9 / 5) + 32 for c in temperatures])
+    index = valid.find(0)
+    while index >= 0:
+        fahrenheit[index] = math.nan
+        index = valid.find(0, index + 1)
+    return fahrenheit
+
+
+def process_readings(temperatures, humidities):
+    """
+    Converts and classifies columns of Celsius temperatures and humidities.
+    Returns a TelemetryBatch with an array of Fahrenheit values (NaN where
+    celsius_to_fahrenheit is "Invalid Temperature"), a bytearray validity
+    mask and a bytes of advisory codes (see ADVISORIES).
+    The mask and the codes come from DoubleColumn comparisons on whole
+    columns, so only the conversion itself runs Python code per reading.
+    """
+    if len(humidities) != len(temperatures):
+        raise ValueError("Temperatures and humidities must have the same length")
+
+    temperature = DoubleColumn(temperatures)
+    humidity = DoubleColumn(humidities)
+    count = temperature.count
+
+    # Same checks as celsius_to_fahrenheit and get_weather_advisory, all
+    # false for NaN
+    valid = temperature.at_least(-100.0) & temperature.at_most(100.0)
+    heat = temperature.above(30.0) & humidity.above(70.0)
+    cold = temperature.below(0.0)
+
+    valid = bytearray(valid.to_bytes(count, "big"))
+    return TelemetryBatch(
+        _fahrenheit(temperature.values, valid),
+        valid,
+        (heat | cold << 1).to_bytes(count, "big"),
+    )
+
+
+class SensorStream:
+    """
+    Processes batches of readings and keeps, for every sensor, a sliding
+    window with its last valid Celsius temperatures.
+    """
+
+    def __init__(self, window=60):
+        """
+        Set the number of readings kept per sensor.
+        """
+        if window < 1:
+            raise ValueError("The window must hold at least one reading")
+
+        self.window = window
+        self._windows = defaultdict(lambda: deque(maxlen=window))
+
+    def __contains__(self, sensor):
+        """
+        Checks if a sensor has valid readings.
+        """
+        return sensor in self._windows
+
+    def process(self, temperatures, humidities, sensors=None):
+        """
+        Runs process_readings and, when the sensor of every reading is
+        given, adds the valid temperatures to the sensor windows.
+        """
+        batch = process_readings(temperatures, humidities)
+        if sensors is None:
+            return batch
+
+        if len(sensors) != len(temperatures):
+            raise ValueError("There must be one sensor per reading")
+
+        # Appends every valid reading to its window without a Python loop
+        windows = map(self._windows.__getitem__, compress(sensors, batch.valid))
+        deque(map(deque.append, windows, compress(temperatures, batch.valid)), maxlen=0)
+        return batch
+
+    async def stream(self, chunks):
+        """
+        Processes an async iterator of (temperatures, humidities) or
+        (temperatures, humidities, sensors) chunks, yielding a
+        TelemetryBatch per chunk.
+        """
+        async for chunk in chunks:
+            yield self.process(*chunk)
+
+    def stats(self, sensor):
+        """
+        Provides the WindowStats of the current window of a sensor.
+        """
+        readings = self._windows.get(sensor)
+        if not readings:
+            return WindowStats(0, math.nan, math.nan, math.nan)
+
+        return WindowStats(
+            len(readings),
+            math.fsum(readings) / len(readings),
+            min(readings),
+            max(readings),
+        )
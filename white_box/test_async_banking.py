@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+"""
+asyncio banking front end unit tests.
+"""
+import asyncio
+import threading
+import unittest
+from unittest.mock import patch
+
+from white_box.async_banking import AsyncBankingSystem
+
+
+class TestAsyncBankingSystem(unittest.IsolatedAsyncioTestCase):
+    """
+    Non-blocking authentication and transfers.
+    """
+
+    async def test_async_banking_authenticate(self):
+        """
+        Checks authentication results match BankingSystem
+        """
+        async with AsyncBankingSystem(workers=2) as system:
+            results = await asyncio.gather(
+                system.authenticate("user123", "wrong"),
+                system.authenticate("user123", "pass123"),
+                system.authenticate("user123", "pass123"),
+            )
+
+        self.assertEqual(results, [False, True, False])
+
+    async def test_async_banking_transfers_keep_order(self):
+        """
+        Checks the transfers of an account are applied in submission order
+        """
+        async with AsyncBankingSystem(workers=4, queue_size=2) as system:
+            await system.authenticate("user123", "pass123")
+            results = await asyncio.gather(
+                *(
+                    system.transfer_money("user123", "bob", 100, "regular")
+                    for _ in range(10)
+                )
+            )
+
+        self.assertEqual(results, [True] * 9 + [False])
+        self.assertEqual(system.bank.ledger.balance("bob"), 1900)
+
+    async def test_async_banking_slow_call_keeps_loop_responsive(self):
+        """
+        Checks a blocking bank call runs outside the event loop
+        """
+        released = threading.Event()
+
+        async with AsyncBankingSystem(workers=1) as system:
+            with patch.object(
+                system.bank, "authenticate", lambda *_: released.wait(timeout=5)
+            ):
+                request = asyncio.create_task(system.authenticate("user123", "x"))
+                # The loop keeps running while the call blocks its thread
+                await asyncio.sleep(0.05)
+                self.assertFalse(request.done())
+
+                released.set()
+                self.assertTrue(await request)
+
+    async def test_async_banking_not_started(self):
+        """
+        Checks requests are refused before the workers are started
+        """
+        system = AsyncBankingSystem()
+
+        with self.assertRaises(RuntimeError):
+            await system.authenticate("user123", "pass123")
+
+    async def test_async_banking_errors_are_propagated(self):
+        """
+        Checks an exception of the banking system reaches the caller
+        """
+        async with AsyncBankingSystem(workers=1) as system:
+            await system.authenticate("user123", "pass123")
+
+            with self.assertRaises(TypeError):
+                await system.transfer_money("user123", "bob", "ten", "regular")
+
+    def test_async_banking_invalid_workers(self):
+        """
+        Checks at least one worker is required
+        """
+        with self.assertRaises(ValueError):
+            AsyncBankingSystem(workers=0)
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+
+"""
+Banking building blocks unit tests.
+"""
+import math
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from white_box.banking import Ledger, SessionStore
+
+
+class TestSessionStore(unittest.TestCase):
+    """
+    Thread-safe session store.
+    """
+
+    def setUp(self):
+        self.sessions = SessionStore(shards=4)
+
+    def test_session_store_add(self):
+        """
+        Checks a user can only be added once
+        """
+        self.assertTrue(self.sessions.add("user123"))
+        self.assertFalse(self.sessions.add("user123"))
+        self.assertIn("user123", self.sessions)
+        self.assertEqual(len(self.sessions), 1)
+
+    def test_session_store_discard(self):
+        """
+        Checks a user can be logged out
+        """
+        self.sessions.add("user123")
+
+        self.assertTrue(self.sessions.discard("user123"))
+        self.assertFalse(self.sessions.discard("user123"))
+        self.assertNotIn("user123", self.sessions)
+
+    def test_session_store_iter(self):
+        """
+        Checks every user of every shard is listed
+        """
+        users = {f"user{n}" for n in range(20)}
+        for user in users:
+            self.sessions.add(user)
+
+        self.assertEqual(set(self.sessions), users)
+
+    def test_session_store_concurrent_add(self):
+        """
+        Checks concurrent logins of the same user succeed only once
+        """
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(self.sessions.add, ["user123"] * 200))
+
+        self.assertEqual(results.count(True), 1)
+
+    def test_session_store_invalid_shards(self):
+        """
+        Checks at least one shard is required
+        """
+        with self.assertRaises(ValueError):
+            SessionStore(shards=0)
+
+
+class TestLedger(unittest.TestCase):
+    """
+    In-memory account ledger.
+    """
+
+    def setUp(self):
+        self.ledger = Ledger(default_balance=100)
+
+    def test_ledger_default_balance(self):
+        """
+        Checks unknown accounts have the default balance and are not opened
+        """
+        self.assertEqual(self.ledger.balance("alice"), 100)
+        self.assertNotIn("alice", self.ledger)
+        self.assertEqual(len(self.ledger), 0)
+
+    def test_ledger_deposit_and_withdraw(self):
+        """
+        Checks credits and debits, refusing overdrafts
+        """
+        self.ledger.open_account("alice", 50)
+        self.ledger.deposit("alice", 25)
+
+        self.assertTrue(self.ledger.withdraw("alice", 70))
+        self.assertFalse(self.ledger.withdraw("alice", 10))
+        self.assertEqual(self.ledger.balance("alice"), 5)
+
+    def test_ledger_cents_do_not_drift(self):
+        """
+        Checks dollar amounts are kept as exact cents
+        """
+        self.ledger.open_account("alice", 0.3)
+
+        self.assertTrue(self.ledger.withdraw("alice", 0.1))
+        self.assertTrue(self.ledger.withdraw("alice", 0.2))
+        self.assertEqual(self.ledger.cents("alice"), 0)
+
+        self.ledger.deposit("alice", 1.005)
+        self.assertEqual(self.ledger.cents("alice"), 101)
+        self.assertEqual(self.ledger.balance("alice"), 1.01)
+        self.assertEqual(self.ledger.cents("bob"), 10_000)
+
+    def test_ledger_transfer(self):
+        """
+        Checks the fee is debited from the sender only
+        """
+        self.assertTrue(self.ledger.transfer("alice", "bob", 50, 2))
+        self.assertFalse(self.ledger.transfer("alice", "bob", 48, 1))
+
+        self.assertEqual(self.ledger.balance("alice"), 48)
+        self.assertEqual(self.ledger.balance("bob"), 150)
+        self.assertTrue(self.ledger.transfer_cents("alice", "bob", 4_700, 100))
+        self.assertEqual(self.ledger.cents("alice"), 0)
+
+    def test_ledger_invalid_amounts(self):
+        """
+        Checks negative, zero, NaN and sub-cent amounts are rejected
+        """
+        for amount in (-900, 0, math.nan, math.inf, 0.004):
+            with self.assertRaises(ValueError):
+                self.ledger.transfer("alice", "bob", amount)
+            with self.assertRaises(ValueError):
+                self.ledger.deposit("alice", amount)
+            with self.assertRaises(ValueError):
+                self.ledger.withdraw("alice", amount)
+
+        statuses = self.ledger.transfer_batch(
+            [("alice", "bob", amount, "regular") for amount in (-5000, 0, math.nan)]
+        )
+
+        self.assertEqual(statuses, ["invalid_amount"] * 3)
+        self.assertEqual(self.ledger.balance("alice"), 100)
+        self.assertEqual(self.ledger.balance("bob"), 100)
+
+    def test_ledger_transfer_batch(self):
+        """
+        Checks every transfer gets a status and balances persist
+        """
+        statuses = self.ledger.transfer_batch(
+            [
+                ("alice", "bob", 50, "regular"),
+                ("alice", "bob", 10, "instant"),
+                ("alice", "bob", 49, "express"),
+                ("bob", "alice", 100, "scheduled"),
+            ]
+        )
+
+        self.assertEqual(
+            statuses,
+            [
+                "transfer_processed",
+                "invalid_transaction_type",
+                "insufficient_funds",
+                "transfer_processed",
+            ],
+        )
+        self.assertEqual(self.ledger.balance("alice"), 100 - 50 - 0.02 * 50 + 100)
+        self.assertEqual(self.ledger.balance("bob"), 150 - 100 - 0.01 * 100)
+
+    def test_ledger_concurrent_withdrawals(self):
+        """
+        Checks concurrent debits never overdraw an account
+        """
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(self.ledger.withdraw, ["alice"] * 50, [3] * 50))
+
+        self.assertEqual(results.count(True), 33)
+        self.assertEqual(self.ledger.balance("alice"), 1)
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+"""
+Product catalog unit tests.
+"""
+import io
+import math
+import unittest
+from contextlib import redirect_stdout
+
+from white_box.catalog import CatalogProduct, ProductCatalog
+from white_box.class_exercises import Product, categorize_product
+
+PRODUCTS = [
+    ("pen", 5),
+    ("book", 10),
+    ("lamp", 50),
+    ("chair", 50.5),
+    ("desk", 51),
+    ("café", 100),
+    ("shelf", 101),
+    ("sofa", 200),
+    ("bed", 200.01),
+]
+
+
+class TestProductCatalog(unittest.TestCase):
+    """
+    Columnar version of the Product class and Exercise #8
+    """
+
+    def setUp(self):
+        self.catalog = ProductCatalog(reversed(PRODUCTS))
+
+    def test_products(self):
+        """
+        Checks products are views over the columns
+        """
+        product = self.catalog[3]
+
+        self.assertIsInstance(product, CatalogProduct)
+        self.assertEqual((product.name, product.price), ("café", 100))
+        self.assertEqual(product.category, "Category B")
+        self.assertEqual(self.catalog[-1].name, "pen")
+        self.assertEqual(len(self.catalog), len(PRODUCTS))
+
+        with self.assertRaises(IndexError):
+            _ = self.catalog[len(PRODUCTS)]
+
+        with self.assertRaises(AttributeError):
+            product.color = "red"  # pylint: disable=assigning-non-slot
+
+    def test_view_product(self):
+        """
+        Checks the view prints the same message as Product
+        """
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            message = self.catalog[0].view_product()
+
+        self.assertEqual(message, Product("bed", 200.01).view_product())
+        self.assertEqual(stdout.getvalue(), message + "\n")
+
+    def test_in_category(self):
+        """
+        Checks every category matches categorize_product
+        """
+        for category in ("Category A", "Category B", "Category C", "Category D"):
+            expected = [
+                name
+                for name, price in PRODUCTS
+                if categorize_product(price) == category
+            ]
+
+            products = self.catalog.in_category(category)
+
+            self.assertEqual([product.name for product in products], expected)
+
+        with self.assertRaises(ValueError):
+            self.catalog.in_category("Category E")
+
+    def test_in_price_range(self):
+        """
+        Checks price ranges include both ends and are sorted by price
+        """
+        products = self.catalog.in_price_range(50, 101)
+
+        self.assertEqual(
+            [product.name for product in products],
+            ["lamp", "chair", "desk", "café", "shelf"],
+        )
+        self.assertEqual(self.catalog.in_price_range(300, 400), [])
+
+    def test_add_rebuilds_index(self):
+        """
+        Checks products added after a query are found by the next one
+        """
+        self.catalog.in_price_range(0, 1000)
+
+        index = self.catalog.add("mug", 7)
+
+        self.assertEqual(index, len(PRODUCTS))
+        self.assertEqual(
+            [product.name for product in self.catalog.in_price_range(0, 9)],
+            ["pen", "mug"],
+        )
+
+    def test_category_counts(self):
+        """
+        Checks the products are counted per category
+        """
+        self.assertEqual(
+            self.catalog.category_counts(),
+            {"Category D": 3, "Category A": 2, "Category B": 2, "Category C": 2},
+        )
+
+    def test_nan_prices(self):
+        """
+        Checks NaN prices stay out of the price ranges and count as Category D
+        """
+        prices = [10, 50, 50.5, 51, math.nan, 200, 5]
+        catalog = ProductCatalog((f"p{price}", price) for price in prices)
+
+        self.assertEqual(
+            [product.price for product in catalog.in_price_range(10, 51)],
+            [10, 50, 50.5, 51],
+        )
+        counts = dict.fromkeys(catalog.category_counts(), 0)
+        for price in prices:
+            counts[categorize_product(price)] += 1
+        self.assertEqual(catalog.category_counts(), counts)
+        self.assertEqual(
+            [product.name for product in catalog.in_category("Category D")],
+            ["p5", "p50.5", "pnan"],
+        )
+
+    def test_from_products(self):
+        """
+        Checks a catalog can be built from Product objects
+        """
+        catalog = ProductCatalog.from_products(Product(*item) for item in PRODUCTS)
+
+        self.assertEqual(catalog.name(5), "café")
+        self.assertGreater(catalog.nbytes, 0)
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+"""
+Chunking unit tests.
+"""
+import unittest
+
+from white_box.chunks import read_chunks
+
+
+class TestReadChunks(unittest.TestCase):
+    """
+    Bounded chunks of a stream.
+    """
+
+    def test_read_chunks(self):
+        """
+        Checks records are grouped in bounded chunks
+        """
+        self.assertEqual(list(read_chunks(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(read_chunks(iter([]), 2)), [])
@@ -3,9 +3,16 @@
 """
 White-box unit testing examples.
 """
+import math
 import unittest
+from decimal import Decimal
+from unittest.mock import patch
 
 from white_box.class_exercises import (
+    BankingSystem,
+    ElevatorSystem,
+    Product,
+    ShoppingCart,
     TrafficLight,
     VendingMachine,
     calculate_items_shipping_cost,
@@ -21,6 +28,7 @@ from white_box.class_exercises import (
     validate_email,
     validate_login,
     validate_password,
+    validate_url,
     verify_age,
 )
 
@@ -198,6 +206,12 @@ class TestCalculateTotalDiscount(unittest.TestCase):
         """
         self.assertEqual(calculate_total_discount(501), 0.2 * 501)
 
+    def test_calculate_total_discount_nan(self):
+        """
+        Checks NaN gets the else branch of the original ladder, like before
+        """
+        self.assertTrue(math.isnan(calculate_total_discount(math.nan)))
+
 
 class TestCalculateOrderTotal(unittest.TestCase):
     """
@@ -526,6 +540,33 @@ class TestCelsiusToFahrenheit(unittest.TestCase):
         self.assertEqual(celsius_to_fahrenheit(101), "Invalid Temperature")
 
 
+class TestValidateUrl(unittest.TestCase):
+    """
+    Exercise #14
+    """
+
+    def test_validate_url_http_and_https(self):
+        """
+        Checks http and https URLs up to 255 characters
+        """
+        self.assertEqual(validate_url("http://test.com"), "Valid URL")
+        self.assertEqual(validate_url("https://test.com"), "Valid URL")
+
+    def test_validate_url_too_long(self):
+        """
+        Checks URLs longer than 255 characters with either scheme
+        """
+        path = "a" * 255
+        self.assertEqual(validate_url(f"http://test.com/{path}"), "Invalid URL")
+        self.assertEqual(validate_url(f"https://test.com/{path}"), "Invalid URL")
+
+    def test_validate_url_wrong_scheme(self):
+        """
+        Checks URLs that are not http or https
+        """
+        self.assertEqual(validate_url("ftp://test.com"), "Invalid URL")
+
+
 class TestWhiteBoxVendingMachine(unittest.TestCase):
     """
     Exercise #22 Vending Machine unit tests.
@@ -600,3 +641,315 @@ class TestTrafficLight(unittest.TestCase):
 
         self.traffic_light.change_state()
         self.assertIsNot(self.traffic_light.state, "Yellow")
+
+
+class TestElevatorSystem(unittest.TestCase):
+    """
+    Exercise #26
+    """
+
+    def setUp(self):
+        self.elevator = ElevatorSystem()
+        self.assertEqual(self.elevator.state, "Idle")
+
+    def test_elevator_system_move_and_stop(self):
+        """
+        Checks the elevator moves from idle and stops while moving
+        """
+        self.assertEqual(self.elevator.move_up(), "Elevator moving up")
+        self.assertEqual(self.elevator.state, "Moving Up")
+        self.assertEqual(self.elevator.stop(), "Elevator stopped")
+        self.assertEqual(self.elevator.move_down(), "Elevator moving down")
+        self.assertEqual(self.elevator.state, "Moving Down")
+        self.assertEqual(self.elevator.stop(), "Elevator stopped")
+
+    def test_elevator_system_invalid_operations(self):
+        """
+        Checks invalid operations keep the current state
+        """
+        self.assertEqual(self.elevator.stop(), "Invalid operation in current state")
+
+        self.elevator.move_up()
+
+        self.assertEqual(
+            self.elevator.move_down(), "Invalid operation in current state"
+        )
+        self.assertEqual(self.elevator.state, "Moving Up")
+
+
+class TestBankingSystem(unittest.TestCase):
+    """
+    Exercise #27
+    """
+
+    def setUp(self):
+        self.bank = BankingSystem(quiet=True)
+
+    def test_banking_system_authenticate(self):
+        """
+        Checks a user can authenticate only once
+        """
+        self.assertTrue(self.bank.authenticate("user123", "pass123"))
+        self.assertFalse(self.bank.authenticate("user123", "pass123"))
+        self.assertFalse(self.bank.authenticate("user123", "wrong"))
+
+        self.assertEqual(
+            [event["event"] for event in self.bank.events],
+            ["authenticated", "already_logged_in", "authentication_failed"],
+        )
+
+    def test_banking_system_transfer_money(self):
+        """
+        Checks transfers need an authenticated sender, a valid type and funds
+        """
+        self.assertFalse(self.bank.transfer_money("user123", "bob", 10, "regular"))
+
+        self.bank.authenticate("user123", "pass123")
+
+        self.assertTrue(self.bank.transfer_money("user123", "bob", 100, "express"))
+        self.assertFalse(self.bank.transfer_money("user123", "bob", 10, "instant"))
+        self.assertFalse(self.bank.transfer_money("user123", "bob", 990, "regular"))
+
+        events = list(self.bank.events)
+        self.assertEqual(events[0]["event"], "not_authenticated")
+        self.assertEqual(events[2]["event"], "transfer_processed")
+        self.assertEqual(events[2]["fee"], 0.05 * 100)
+        self.assertEqual(events[3]["event"], "invalid_transaction_type")
+        self.assertEqual(events[4]["event"], "insufficient_funds")
+
+    def test_banking_system_transfer_invalid_amount(self):
+        """
+        Checks negative, zero and NaN amounts move no money
+        """
+        self.bank.authenticate("user123", "pass123")
+
+        for amount in (-900, 0, math.nan):
+            self.assertFalse(
+                self.bank.transfer_money("user123", "victim", amount, "regular")
+            )
+
+        self.assertEqual(
+            self.bank.transfer_batch([("user123", "victim", -5000, "regular")]),
+            ["invalid_amount"],
+        )
+        self.assertEqual(self.bank.ledger.balance("user123"), 1000)
+        self.assertEqual(self.bank.ledger.balance("victim"), 1000)
+        self.assertEqual(
+            [event["event"] for event in self.bank.events][1:],
+            ["invalid_amount"] * 3,
+        )
+
+    def test_banking_system_balances_persist(self):
+        """
+        Checks transfers move money between ledger accounts
+        """
+        self.bank.authenticate("user123", "pass123")
+
+        self.assertTrue(self.bank.transfer_money("user123", "bob", 500, "scheduled"))
+        self.assertFalse(self.bank.transfer_money("user123", "bob", 500, "scheduled"))
+
+        self.assertEqual(self.bank.ledger.balance("user123"), 1000 - 500 - 5)
+        self.assertEqual(self.bank.ledger.balance("bob"), 1500)
+
+    def test_banking_system_fees_in_cents(self):
+        """
+        Checks fees are rounded to the cent and balances do not drift
+        """
+        self.bank.authenticate("user123", "pass123")
+
+        for _ in range(3):
+            self.assertTrue(self.bank.transfer_money("user123", "bob", 0.1, "regular"))
+        self.assertTrue(self.bank.transfer_money("user123", "bob", 0.5, "express"))
+
+        self.assertEqual(self.bank.ledger.cents("user123"), 100_000 - 30 - 50 - 3)
+        self.assertEqual(self.bank.ledger.cents("bob"), 100_000 + 30 + 50)
+        self.assertEqual(self.bank.ledger.balance("bob"), 1000.8)
+        self.assertEqual(self.bank.events[-1]["fee"], Decimal("0.03"))
+
+    def test_banking_system_transfer_batch(self):
+        """
+        Checks batch transfers report one status per transfer
+        """
+        self.bank.authenticate("user123", "pass123")
+
+        statuses = self.bank.transfer_batch(
+            [
+                ("user123", "bob", 100, "regular"),
+                ("bob", "user123", 100, "regular"),
+                ("user123", "bob", 10, "instant"),
+                ("user123", "bob", 1000, "express"),
+            ]
+        )
+
+        self.assertEqual(
+            statuses,
+            [
+                "transfer_processed",
+                "not_authenticated",
+                "invalid_transaction_type",
+                "insufficient_funds",
+            ],
+        )
+        self.assertEqual(len(self.bank.events), 1)
+
+    def test_banking_system_prints_when_not_quiet(self):
+        """
+        Checks messages are printed by default
+        """
+        bank = BankingSystem()
+
+        with patch("builtins.print") as mock_print:
+            bank.authenticate("user123", "pass123")
+
+        mock_print.assert_called_once_with("User user123 authenticated successfully.")
+        self.assertEqual(len(bank.events), 0)
+
+
+class TestShoppingCart(unittest.TestCase):
+    """
+    Exercise #28
+    """
+
+    def setUp(self):
+        self.cart = ShoppingCart()
+        self.apple = Product("Apple", 2)
+        self.pear = Product("Pear", 3)
+
+    def test_shopping_cart_add_product(self):
+        """
+        Checks adding products merges quantities and updates the total
+        """
+        self.cart.add_product(self.apple)
+        self.cart.add_product(self.pear, 2)
+        self.cart.add_product(self.apple, 4)
+
+        self.assertEqual(
+            self.cart.items,
+            [
+                {"product": self.apple, "quantity": 5},
+                {"product": self.pear, "quantity": 2},
+            ],
+        )
+        self.assertEqual(self.cart.total, 16)
+
+    def test_shopping_cart_remove_product_partial(self):
+        """
+        Checks removing less than the stored quantity keeps the product
+        """
+        self.cart.add_product(self.apple, 5)
+        self.cart.remove_product(self.apple, 2)
+
+        self.assertEqual(self.cart.items, [{"product": self.apple, "quantity": 3}])
+        self.assertEqual(self.cart.total, 6)
+
+    def test_shopping_cart_remove_product_all(self):
+        """
+        Checks removing the whole quantity (or more) drops the product
+        """
+        self.cart.add_product(self.apple, 2)
+        self.cart.add_product(self.pear, 1)
+        self.cart.remove_product(self.apple, 5)
+
+        self.assertEqual(self.cart.items, [{"product": self.pear, "quantity": 1}])
+        self.assertEqual(self.cart.total, 3)
+
+    def test_shopping_cart_remove_missing_product(self):
+        """
+        Checks removing a product that is not in the cart does nothing
+        """
+        self.cart.add_product(self.apple)
+        self.cart.remove_product(self.pear)
+
+        self.assertEqual(self.cart.total, 2)
+
+    def test_shopping_cart_total_does_not_drift(self):
+        """
+        Checks float prices are added and removed in exact cents
+        """
+        products = [Product(name, price) for name, price in (("a", 0.1), ("b", 0.2))]
+        self.cart.add_product(products[0])
+        self.cart.add_product(products[1])
+        self.cart.add_product(Product("c", 0.3))
+        self.cart.remove_product(products[0])
+        self.cart.remove_product(products[1])
+
+        with patch("builtins.print") as mock_print:
+            self.cart.checkout()
+
+        mock_print.assert_any_call("Total: $0.3")
+
+        self.cart.add_product(products[0], 3)
+        self.cart.remove_product(products[0])
+        self.assertEqual(self.cart.total, Decimal("0.5"))
+
+    def test_shopping_cart_items_are_copies(self):
+        """
+        Checks changing the returned items does not change the cart
+        """
+        self.cart.add_product(self.apple, 2)
+        self.cart.items[0]["quantity"] = 5
+
+        self.assertEqual(self.cart.items, [{"product": self.apple, "quantity": 2}])
+        self.assertEqual(self.cart.total, 4)
+
+    def test_shopping_cart_assign_items(self):
+        """
+        Checks assigning items replaces the content and the total
+        """
+        self.cart.add_product(self.apple, 2)
+        self.cart.items = [
+            {"product": self.pear, "quantity": 1},
+            {"product": self.pear, "quantity": 2},
+        ]
+
+        self.assertEqual(self.cart.items, [{"product": self.pear, "quantity": 3}])
+        self.assertEqual(self.cart.total, 9)
+
+    def test_shopping_cart_checkout(self):
+        """
+        Checks checkout prints the running total
+        """
+        self.cart.add_product(self.apple, 3)
+
+        with patch("builtins.print") as mock_print:
+            self.cart.checkout()
+
+        mock_print.assert_any_call("Total: $6")
+
+    def test_shopping_cart_checkout_rounds_to_cents(self):
+        """
+        Checks checkout prints the total of the prices rounded to the cent
+        """
+        self.cart.add_product(Product("pin", 0.333), 3)
+        self.cart.add_product(Product("cup", 2.5), 2)
+
+        with patch("builtins.print") as mock_print:
+            self.cart.checkout()
+
+        mock_print.assert_any_call("Total: $5.99")
+
+    def test_shopping_cart_price_change(self):
+        """
+        Checks removing a product takes back the cents it added, even when
+        its price changed in between
+        """
+        self.cart.add_product(self.apple, 3)
+        self.apple.price = 4
+        self.cart.remove_product(self.apple)
+
+        self.assertEqual(self.cart.total, 4)
+
+        self.cart.remove_product(self.apple, 2)
+        self.assertEqual(self.cart.total, 0)
+
+    def test_shopping_cart_fractional_quantity(self):
+        """
+        Checks fractional quantities are rejected and leave the cart as it was
+        """
+        self.cart.add_product(self.apple)
+
+        with self.assertRaises(TypeError):
+            self.cart.add_product(self.apple, 1.5)
+
+        self.assertEqual(self.cart.items, [{"product": self.apple, "quantity": 1}])
+        self.assertEqual(self.cart.total, 2)
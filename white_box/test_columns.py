@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+
+"""
+Column comparison unit tests.
+"""
+import math
+import operator
+import random
+import unittest
+from array import array
+
+from white_box.columns import DoubleColumn, double_bytes, int64_bytes
+
+SPECIAL = [math.nan, math.inf, -math.inf, 0.0, -0.0, 1, -1, 10, -10, 5e-324]
+LIMITS = [0, -0.0, 1, -1, 10, 10.5, -33.3, 1e-300, 5e-324, math.inf, -math.inf]
+COMPARISONS = {
+    "equal": operator.eq,
+    "above": operator.gt,
+    "below": operator.lt,
+    "at_least": operator.ge,
+    "at_most": operator.le,
+}
+
+
+class TestDoubleColumn(unittest.TestCase):
+    """
+    Comparisons of columns of doubles with limits.
+    """
+
+    def test_matches_python_comparisons(self):
+        """
+        Checks every comparison matches the Python operators
+        """
+        rng = random.Random(1)
+        values = SPECIAL + [
+            rng.choice([rng.uniform(-50, 50), rng.randint(-20, 20)] + SPECIAL)
+            for _ in range(2000)
+        ]
+        column = DoubleColumn(values)
+
+        for limit in LIMITS:
+            for name, compare in COMPARISONS.items():
+                with self.subTest(limit=limit, comparison=name):
+                    self.assertEqual(
+                        getattr(column, name)(limit).to_bytes(column.count, "big"),
+                        bytes(compare(value, limit) for value in values),
+                    )
+
+    def test_nan_limit_and_empty_column(self):
+        """
+        Checks NaN limits are rejected and empty columns compare to nothing
+        """
+        with self.assertRaises(ValueError):
+            DoubleColumn([1.0]).above(math.nan)
+
+        self.assertEqual(DoubleColumn([]).at_most(10), 0)
+
+    def test_bytes(self):
+        """
+        Checks the little-endian bytes of integer and double columns
+        """
+        self.assertEqual(int64_bytes([1, -1]), b"\x01" + bytes(7) + b"\xff" * 8)
+        self.assertEqual(int64_bytes(array("q", [2])), b"\x02" + bytes(7))
+        self.assertEqual(int64_bytes(array("l", [2])), b"\x02" + bytes(7))
+        self.assertEqual(double_bytes([1.0])[1], bytes(6) + b"\xf0\x3f")
+
+        with self.assertRaises(TypeError):
+            int64_bytes(array("d", [1.0]))
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+"""
+Credential store unit tests.
+"""
+import unittest
+from unittest.mock import patch
+
+from white_box.class_exercises import BankingSystem, authenticate_user
+from white_box.credentials import CredentialStore
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    """
+    Manually advanced clock.
+    """
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCredentialStore(unittest.TestCase):
+    """
+    Salted password hashes with a verification cache.
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.store = CredentialStore(
+            iterations=10, cache_size=2, cache_ttl=60, clock=self.clock
+        )
+        self.store.set_password("alice", "secret")
+
+    def test_credential_store_verify(self):
+        """
+        Checks right and wrong passwords and unknown users
+        """
+        self.assertIn("alice", self.store)
+        self.assertTrue(self.store.verify("alice", "secret"))
+        self.assertFalse(self.store.verify("alice", "Secret"))
+        self.assertFalse(self.store.verify("bob", "secret"))
+
+    def test_credential_store_salted(self):
+        """
+        Checks the same password gets a different hash for each user
+        """
+        self.store.set_password("bob", "secret")
+
+        # pylint: disable=protected-access
+        self.assertNotEqual(self.store._hashes["alice"], self.store._hashes["bob"])
+
+    def test_credential_store_cache_hit(self):
+        """
+        Checks a repeated login does not hash the password again
+        """
+        self.store.verify("alice", "secret")
+
+        with patch.object(CredentialStore, "_hash", return_value=b"") as mock_hash:
+            self.assertTrue(self.store.verify("alice", "secret"))
+            self.assertFalse(self.store.verify("alice", "wrong"))
+
+        self.assertEqual(mock_hash.call_count, 1)
+
+    def test_credential_store_cache_clear(self):
+        """
+        Checks the cache can be emptied
+        """
+        self.store.verify("alice", "secret")
+        self.store.cache_clear()
+
+        with patch.object(CredentialStore, "_hash", return_value=b"") as mock_hash:
+            self.assertFalse(self.store.verify("alice", "secret"))
+
+        mock_hash.assert_called_once()
+
+    def test_credential_store_cache_ttl(self):
+        """
+        Checks cached verifications expire
+        """
+        self.store.verify("alice", "secret")
+        self.clock.now = 61
+
+        with patch.object(CredentialStore, "_hash", return_value=b"") as mock_hash:
+            self.assertFalse(self.store.verify("alice", "secret"))
+
+        mock_hash.assert_called_once()
+
+    def test_credential_store_cache_lru(self):
+        """
+        Checks the least recently verified user is evicted first
+        """
+        for user in ("bob", "carol"):
+            self.store.set_password(user, "secret")
+
+        for user in ("alice", "bob", "alice", "carol"):
+            self.store.verify(user, "secret")
+
+        # pylint: disable=protected-access
+        self.assertEqual(list(self.store._cache), ["alice", "carol"])
+
+    def test_credential_store_password_change(self):
+        """
+        Checks changing or removing a password invalidates the cache
+        """
+        self.store.verify("alice", "secret")
+        self.store.set_password("alice", "new secret")
+
+        self.assertFalse(self.store.verify("alice", "secret"))
+
+        self.store.remove_user("alice")
+
+        self.assertFalse(self.store.verify("alice", "new secret"))
+
+    def test_credential_store_password_change_during_verify(self):
+        """
+        Checks a verification racing a password change caches nothing
+        """
+        hash_password = CredentialStore._hash  # pylint: disable=protected-access
+
+        def change_during_hash(password, salt, iterations):
+            # set_password runs while verify is hashing the old password
+            if password == "secret":
+                self.store.set_password("alice", "new secret")
+            return hash_password(password, salt, iterations)
+
+        with patch.object(self.store, "_hash", change_during_hash):
+            self.store.verify("alice", "secret")
+
+        self.assertFalse(self.store.verify("alice", "secret"))
+        self.assertTrue(self.store.verify("alice", "new secret"))
+
+
+class TestCredentialStoreIntegration(unittest.TestCase):
+    """
+    Exercises #20 and #27 with a credential store.
+    """
+
+    def setUp(self):
+        self.store = CredentialStore(iterations=10)
+
+    def test_authenticate_user_with_credentials(self):
+        """
+        Checks the admin password comes from the store
+        """
+        self.store.set_password("admin", "n3w-admin-pass")
+
+        self.assertEqual(
+            authenticate_user("admin", "n3w-admin-pass", self.store), "Admin"
+        )
+        self.assertEqual(authenticate_user("admin", "admin123", self.store), "User")
+
+    def test_banking_system_with_credentials(self):
+        """
+        Checks BankingSystem authenticates against the store
+        """
+        self.store.set_password("user123", "hashed-pass")
+        bank = BankingSystem(quiet=True, credentials=self.store)
+
+        self.assertFalse(bank.authenticate("user123", "pass123"))
+        self.assertTrue(bank.authenticate("user123", "hashed-pass"))
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+"""
+State machine fleet unit tests.
+"""
+import unittest
+
+from white_box.class_exercises import ElevatorSystem, TrafficLight
+from white_box.fleet import Fleet
+
+
+class TestTrafficLightFleet(unittest.TestCase):
+    """
+    Fleet of Exercise #23 traffic lights.
+    """
+
+    def setUp(self):
+        self.fleet = Fleet(TrafficLight, 5)
+
+    def test_fleet_initial_state(self):
+        """
+        Checks every machine starts in the initial state
+        """
+        self.assertEqual(len(self.fleet), 5)
+        self.assertEqual(self.fleet.count("Red"), 5)
+
+    def test_fleet_apply(self):
+        """
+        Checks a tick changes every light like TrafficLight.change_state
+        """
+        self.fleet[0].state = "Yellow"
+
+        self.fleet.apply("change_state")
+
+        self.assertEqual(self.fleet[0].state, "Red")
+        self.assertEqual(self.fleet.count("Green"), 4)
+
+    def test_fleet_machine_view(self):
+        """
+        Checks views read and write the shared state array
+        """
+        view = self.fleet[-1]
+        view.fire("change_state")
+
+        self.assertEqual(view.index, 4)
+        self.assertEqual(self.fleet[4].state, "Green")
+
+        with self.assertRaises(ValueError):
+            view.state = "Blue"
+
+        with self.assertRaises(IndexError):
+            self.fleet[5]  # pylint: disable=pointless-statement
+
+
+class TestElevatorSystemFleet(unittest.TestCase):
+    """
+    Fleet of Exercise #26 elevators.
+    """
+
+    def setUp(self):
+        self.fleet = Fleet(ElevatorSystem, 4)
+        self.codes = self.fleet.event_codes
+
+    def test_fleet_apply_events(self):
+        """
+        Checks every machine gets its own event, invalid ones are ignored
+        """
+        self.fleet.apply_events(
+            [0, self.codes["move_up"], self.codes["move_down"], self.codes["stop"]]
+        )
+
+        states = [self.fleet[i].state for i in range(4)]
+        self.assertEqual(states, ["Idle", "Moving Up", "Moving Down", "Idle"])
+
+        self.fleet.apply_events(bytes([self.codes["stop"]]) * 4)
+
+        self.assertEqual(self.fleet.count("Idle"), 4)
+
+    def test_fleet_apply_events_matches_machines(self):
+        """
+        Checks the fleet behaves like independent ElevatorSystem objects
+        """
+        machines = [ElevatorSystem() for _ in range(4)]
+        events = [["move_up", "move_down", "stop", "stop"], ["stop", "stop"] * 2]
+
+        for step in events:
+            self.fleet.apply_events([self.codes[event] for event in step])
+            for machine, event in zip(machines, step):
+                getattr(machine, event)()
+
+        for index, machine in enumerate(machines):
+            self.assertEqual(self.fleet[index].state, machine.state)
+
+    def test_fleet_fire_messages(self):
+        """
+        Checks a view returns the machine messages
+        """
+        self.assertEqual(self.fleet[0].fire("move_up"), "Elevator moving up")
+        self.assertEqual(
+            self.fleet[0].fire("move_down"), "Invalid operation in current state"
+        )
+
+    def test_fleet_apply_events_invalid(self):
+        """
+        Checks the event vector size and codes are validated
+        """
+        with self.assertRaises(ValueError):
+            self.fleet.apply_events([0])
+
+        with self.assertRaises(ValueError):
+            self.fleet.apply_events([9, 0, 0, 0])
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+Finite state machine core unit tests.
+"""
+import inspect
+import unittest
+
+from white_box.fsm import StateMachine, event_method
+
+
+class Door(StateMachine):
+    """
+    Door used to test the state machine core.
+    """
+
+    __slots__ = ()
+
+    STATES = ("Closed", "Open")
+    INITIAL_STATE = "Closed"
+    TRANSITIONS = {
+        "open": {"Closed": ("Open", "Door opened")},
+        "close": {"Open": ("Closed", "Door closed")},
+    }
+
+    @event_method
+    def open(self):
+        """
+        Opens the door.
+        """
+
+    @event_method
+    def close(self):
+        """
+        Closes the door.
+        """
+
+
+class TestStateMachine(unittest.TestCase):
+    """
+    Table-driven state machines.
+    """
+
+    def setUp(self):
+        self.door = Door()
+
+    def test_state_machine_initial_state(self):
+        """
+        Checks the machine starts in INITIAL_STATE
+        """
+        self.assertEqual(self.door.state, "Closed")
+
+    def test_state_machine_event_methods(self):
+        """
+        Checks event methods fire their transitions
+        """
+        self.assertEqual(self.door.open(), "Door opened")
+        self.assertEqual(self.door.state, "Open")
+        self.assertEqual(self.door.close(), "Door closed")
+        self.assertEqual(self.door.state, "Closed")
+        self.assertEqual(inspect.getdoc(Door.open), "Opens the door.")
+        self.assertEqual(Door.open.__qualname__, "Door.open")
+        self.assertEqual(Door.open.__name__, "open")
+
+    def test_state_machine_invalid_event(self):
+        """
+        Checks an event not allowed in the current state keeps the state
+        """
+        self.assertEqual(self.door.close(), "Invalid operation in current state")
+        self.assertEqual(self.door.state, "Closed")
+
+    def test_state_machine_fire(self):
+        """
+        Checks events can be fired by name
+        """
+        self.assertEqual(self.door.fire("open"), "Door opened")
+
+    def test_state_machine_set_state(self):
+        """
+        Checks the state can be set by name but only to a known state
+        """
+        self.door.state = "Open"
+        self.assertEqual(self.door.state, "Open")
+
+        with self.assertRaises(ValueError):
+            self.door.state = "Locked"
+
+    def test_state_machine_slots(self):
+        """
+        Checks instances have no per-instance dict
+        """
+        self.assertFalse(hasattr(self.door, "__dict__"))
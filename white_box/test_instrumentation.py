@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""
+Instrumentation unit tests.
+"""
+import io
+import json
+import types
+import unittest
+
+from white_box import class_exercises
+from white_box.instrumentation import MAX_OUTCOMES, Instrumentation
+from white_box.pricing import calculate_shipping_costs
+from white_box.validate import validate_stream
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Opt-in metrics for the class exercises.
+    """
+
+    def setUp(self):
+        self.original = class_exercises.check_loan_eligibility
+        self.instrumentation = Instrumentation(buckets=(0.5, 10))
+
+    def tearDown(self):
+        self.instrumentation.disable()
+
+    def test_instrumentation_enable_and_disable(self):
+        """
+        Checks the module functions are swapped and restored
+        """
+        self.instrumentation.enable(["check_loan_eligibility"])
+
+        self.assertTrue(self.instrumentation.enabled)
+        self.assertIsNot(class_exercises.check_loan_eligibility, self.original)
+
+        self.instrumentation.disable()
+
+        self.assertFalse(self.instrumentation.enabled)
+        self.assertIs(class_exercises.check_loan_eligibility, self.original)
+
+    def test_instrumentation_functions(self):
+        """
+        Checks only public functions defined in the module are listed
+        """
+        functions = self.instrumentation.functions()
+
+        self.assertIn("validate_email", functions)
+        self.assertNotIn("ShoppingCart", functions)
+        self.assertNotIn("deque", functions)
+
+    def test_instrumentation_records_calls_and_outcomes(self):
+        """
+        Checks calls, latency and branch outcomes are recorded
+        """
+        with self.instrumentation:
+            class_exercises.check_loan_eligibility(70000, 800)
+            class_exercises.check_loan_eligibility(40000, 800)
+            class_exercises.check_loan_eligibility(70000, 700)
+
+        metrics = self.instrumentation.snapshot()["check_loan_eligibility"]
+        self.assertEqual(metrics["calls"], 3)
+        self.assertEqual(metrics["outcomes"], {"Premium Loan": 1, "Standard Loan": 2})
+        self.assertEqual(
+            metrics["latency_seconds"]["buckets"], {"0.5": 3, "10": 3, "+Inf": 3}
+        )
+
+    def test_instrumentation_sees_the_cli_and_batch_callers(self):
+        """
+        Checks the validate CLI and the small pricing batches are recorded
+        """
+        with self.instrumentation:
+            validate_stream(
+                io.StringIO("email\nemail@test.com\nemail.test\n"),
+                io.StringIO(),
+                ["email"],
+            )
+            calculate_shipping_costs([1, 10], [5, 40], [5, 40], [5, 40])
+
+        snapshot = self.instrumentation.snapshot()
+        self.assertEqual(
+            snapshot["validate_email"]["outcomes"],
+            {"Valid Email": 1, "Invalid Email": 1},
+        )
+        self.assertEqual(snapshot["calculate_shipping_cost"]["calls"], 2)
+
+    def test_instrumentation_outcome_labels_are_bounded(self):
+        """
+        Checks numbers are not labels and distinct labels are capped
+        """
+        module = types.ModuleType("labels")
+        module.label = str
+
+        with Instrumentation(module) as instrumentation:
+            instrumentation.enable(["label"])
+            label = getattr(module, "label")
+            for number in range(MAX_OUTCOMES + 10):
+                label(number)
+
+        with self.instrumentation:
+            class_exercises.calculate_shipping_cost(1, 10, 10, 10)
+
+        outcomes = instrumentation.snapshot()["label"]["outcomes"]
+        self.assertEqual(len(outcomes), MAX_OUTCOMES + 1)
+        self.assertEqual(outcomes["other"], 10)
+        shipping = self.instrumentation.snapshot()["calculate_shipping_cost"]
+        self.assertEqual(shipping["outcomes"], {})
+
+    def test_instrumentation_order_total_tiers(self):
+        """
+        Checks calculate_order_total reports the tier of every item
+        """
+        items = [{"quantity": 2, "price": 1}, {"quantity": 20, "price": 1}]
+
+        with self.instrumentation:
+            class_exercises.calculate_order_total(items)
+            class_exercises.calculate_total_discount(150)
+
+        snapshot = self.instrumentation.snapshot()
+        self.assertEqual(
+            snapshot["calculate_order_total"]["outcomes"],
+            {"No Discount": 1, "10% Discount": 1},
+        )
+        self.assertEqual(snapshot["calculate_total_discount"]["outcomes"], {"10%": 1})
+
+    def test_instrumentation_exception(self):
+        """
+        Checks exceptions are counted and raised again
+        """
+        with self.instrumentation:
+            with self.assertRaises(ValueError):
+                class_exercises.calculate_items_shipping_cost([], "overnight")
+
+        outcomes = self.instrumentation.snapshot()["calculate_items_shipping_cost"]
+        self.assertEqual(outcomes["outcomes"], {"exception": 1})
+
+    def test_instrumentation_reset(self):
+        """
+        Checks the metrics can be cleared
+        """
+        with self.instrumentation:
+            class_exercises.is_even(2)
+
+        self.instrumentation.reset()
+
+        self.assertEqual(self.instrumentation.snapshot(), {})
+
+    def test_instrumentation_exports(self):
+        """
+        Checks the JSON and Prometheus exports
+        """
+        with self.instrumentation:
+            class_exercises.validate_email("email@test.com")
+
+        self.assertEqual(
+            json.loads(self.instrumentation.to_json())["validate_email"]["calls"], 1
+        )
+
+        text = self.instrumentation.to_prometheus()
+        self.assertIn('white_box_calls_total{function="validate_email"} 1', text)
+        self.assertIn(
+            "white_box_call_duration_seconds_bucket"
+            '{function="validate_email",le="+Inf"} 1',
+            text,
+        )
+        self.assertIn(
+            "white_box_branch_outcomes_total"
+            '{function="validate_email",outcome="Valid Email"} 1',
+            text,
+        )
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""
+Loan decision grid unit tests.
+"""
+import math
+import unittest
+from array import array
+
+from white_box.class_exercises import check_loan_eligibility
+from white_box.loans import LOAN_GRID, LoanDecisionGrid, LoanDecisions, loan_decisions
+from white_box.rules import ThresholdTable
+
+INCOMES = [0, 29999.99, 30000, 45000, 60000, 60000.01, 90000, math.nan]
+SCORES = [300, 699, 700, 700.5, 750, 751, 850, math.nan]
+
+
+class TestLoanDecisionGrid(unittest.TestCase):
+    """
+    Exercise #17 decided in batches.
+    """
+
+    def test_matches_check_loan_eligibility(self):
+        """
+        Checks every income and score pair gets the same label
+        """
+        pairs = [(income, score) for income in INCOMES for score in SCORES]
+        incomes, scores = zip(*pairs)
+
+        codes, _ = loan_decisions(incomes, scores)
+
+        self.assertEqual(
+            [LOAN_GRID.label(code) for code in codes],
+            [check_loan_eligibility(income, score) for income, score in pairs],
+        )
+
+    def test_nan_matches_the_original_ladder(self):
+        """
+        Checks NaN incomes and scores get the labels of the original else branches
+        """
+        scores = [300, 700, 751, math.nan]
+
+        codes, _ = loan_decisions([math.nan] * 4 + [40000] * 4, scores * 2)
+
+        self.assertEqual(
+            [LOAN_GRID.label(code) for code in codes],
+            ["Standard Loan"] * 2
+            + ["Premium Loan", "Standard Loan"]
+            + ["Secured Loan"] * 2
+            + ["Standard Loan", "Secured Loan"],
+        )
+        self.assertEqual(check_loan_eligibility(math.nan, 800), "Premium Loan")
+
+    def test_codes_and_reasons(self):
+        """
+        Checks the codes and the reason bitmasks of a few applicants
+        """
+        decisions = loan_decisions(
+            array("q", [20000, 40000, 40000, 80000]), array("q", [800, 700, 701, 751])
+        )
+
+        self.assertEqual(
+            decisions, LoanDecisions(bytes([0, 1, 2, 3]), bytes([12, 1, 5, 15]))
+        )
+        self.assertEqual(LOAN_GRID.decide(40000, 701), (2, 5))
+        self.assertEqual(
+            LOAN_GRID.explain(5), ["income >= 30000", "credit_score > 700"]
+        )
+        self.assertEqual(
+            LOAN_GRID.labels,
+            ("Not Eligible", "Secured Loan", "Standard Loan", "Premium Loan"),
+        )
+
+    def test_scores_outside_the_grid(self):
+        """
+        Checks integer scores outside SCORE_DOMAIN and float scores
+        """
+        incomes = [40000, 40000, 80000, 80000]
+
+        for scores in ([-1, 701, 70000, 750], array("d", [699, 701, 751, 750.5])):
+            codes, _ = loan_decisions(incomes, scores)
+
+            self.assertEqual(
+                [LOAN_GRID.label(code) for code in codes],
+                list(map(check_loan_eligibility, incomes, scores)),
+            )
+
+    def test_custom_table(self):
+        """
+        Checks a grid of another two-level table and plain label tiers
+        """
+        grid = LoanDecisionGrid(
+            ThresholdTable(
+                ["No", ThresholdTable(["Small", "Big"], [(600, ">=")])], [(10, ">")]
+            )
+        )
+
+        codes, _ = grid.decide_many([5, 11, 11], [700, 599, 600])
+
+        self.assertEqual(list(codes), [0, 1, 2])
+        self.assertEqual(grid.reasons, ("income > 10", "credit_score >= 600"))
+
+    def test_empty_and_mismatched_columns(self):
+        """
+        Checks empty columns and columns of different lengths
+        """
+        self.assertEqual(loan_decisions([], []), LoanDecisions(b"", b""))
+
+        with self.assertRaises(ValueError):
+            loan_decisions([40000], [])
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+"""
+Memoization cache unit tests.
+"""
+import unittest
+from unittest.mock import Mock
+
+from white_box.class_exercises import validate_email
+from white_box.memo import MemoCache, memoize
+
+
+class FakeClock:  # pylint: disable=too-few-public-methods
+    """
+    Manually advanced clock.
+    """
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestMemoCache(unittest.TestCase):
+    """
+    Size-bounded LRU cache.
+    """
+
+    def test_memo_cache_get_and_put(self):
+        """
+        Checks hits, misses and statistics
+        """
+        cache = MemoCache()
+
+        self.assertEqual(cache.get(("a",)), (False, None))
+
+        cache.put(("a",), "Valid Email")
+
+        self.assertEqual(cache.get(("a",)), (True, "Valid Email"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertEqual(stats["bytes"], MemoCache.entry_size(("a",), "Valid Email"))
+
+    def test_memo_cache_evicts_by_bytes(self):
+        """
+        Checks the least recently used entries are evicted to fit the limit
+        """
+        size = MemoCache.entry_size(("a",), True)
+        cache = MemoCache(max_bytes=2 * size)
+
+        cache.put(("a",), True)
+        cache.put(("b",), True)
+        cache.get(("a",))
+        cache.put(("c",), True)
+
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.get(("a",))[0])
+        self.assertFalse(cache.get(("b",))[0])
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertLessEqual(cache.size, cache.max_bytes)
+
+    def test_memo_cache_skips_oversized_entries(self):
+        """
+        Checks an entry bigger than the cache is not stored
+        """
+        cache = MemoCache(max_bytes=100)
+        cache.put(("x" * 1000,), True)
+
+        self.assertEqual(len(cache), 0)
+
+    def test_memo_cache_ttl(self):
+        """
+        Checks entries expire after the time to live
+        """
+        clock = FakeClock()
+        cache = MemoCache(ttl=10, clock=clock)
+        cache.put(("a",), True)
+        clock.now = 10
+
+        self.assertFalse(cache.get(("a",))[0])
+        self.assertEqual(cache.size, 0)
+
+    def test_memo_cache_replace_and_clear(self):
+        """
+        Checks replacing an entry keeps the size right and clear resets
+        """
+        cache = MemoCache()
+        cache.put(("a",), "x")
+        cache.put(("a",), "y")
+
+        self.assertEqual(cache.size, MemoCache.entry_size(("a",), "y"))
+
+        cache.clear()
+
+        self.assertEqual(cache.stats()["entries"], 0)
+        self.assertEqual(cache.size, 0)
+
+    def test_memo_cache_invalid_size(self):
+        """
+        Checks a negative size limit is rejected
+        """
+        with self.assertRaises(ValueError):
+            MemoCache(max_bytes=-1)
+
+
+class TestMemoize(unittest.TestCase):
+    """
+    Memoized validators.
+    """
+
+    def test_memoize_validator(self):
+        """
+        Checks a memoized validator gives the same results
+        """
+        cached_validate_email = memoize(validate_email)
+
+        self.assertEqual(cached_validate_email("email@test.com"), "Valid Email")
+        self.assertEqual(cached_validate_email("email@test.com"), "Valid Email")
+        self.assertEqual(cached_validate_email("email.test"), "Invalid Email")
+        self.assertEqual(cached_validate_email.cache.stats()["hits"], 1)
+
+    def test_memoize_calls_function_once(self):
+        """
+        Checks repeated inputs don't call the function again
+        """
+        function = Mock(return_value="Valid URL", __name__="validate_url")
+        cached = memoize(max_bytes=10_000)(function)
+
+        for _ in range(3):
+            cached("http://test.com")
+
+        function.assert_called_once_with("http://test.com")
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+
+"""
+Integer-cents money unit tests.
+"""
+import unittest
+from decimal import Decimal
+
+from white_box.class_exercises import (
+    Product,
+    ShoppingCart,
+    calculate_order_total,
+    calculate_total_discount,
+)
+from white_box.money import (
+    Money,
+    cart_total,
+    order_total,
+    order_totals,
+    to_basis_points,
+    to_cents,
+    total_discount,
+    total_discounts,
+    transfer_fee,
+    transfer_fees,
+)
+
+
+class TestMoney(unittest.TestCase):
+    """
+    Exact amounts of money.
+    """
+
+    def test_to_cents(self):
+        """
+        Checks amounts are converted exactly, rounding half away from zero
+        """
+        self.assertEqual(to_cents(3), 300)
+        self.assertEqual(to_cents("19.99"), 1999)
+        self.assertEqual(to_cents(0.1), 10)
+        self.assertEqual(to_cents(1.005), 101)
+        self.assertEqual(to_cents(Decimal("-1.005")), -101)
+        self.assertEqual(to_basis_points(0.95), 9500)
+
+        for amount in ("ten", None, float("nan")):
+            with self.assertRaises(ValueError):
+                to_cents(amount)
+
+    def test_arithmetic(self):
+        """
+        Checks additions and multiplications are exact
+        """
+        dime = Money.of(0.1)
+
+        self.assertEqual(sum([dime] * 3), Money.of("0.3"))
+        self.assertEqual(dime * 3 - Money(30), Money())
+        self.assertEqual(3 * dime, -(-dime * 3))
+        self.assertLess(dime, Money(11))
+        self.assertEqual(Money(7).apply_rate(5_000), Money(4))
+        self.assertEqual(Money(-7).apply_rate(5_000), Money(-4))
+        self.assertEqual(Money.of("12.34").to_decimal(), Decimal("12.34"))
+
+        with self.assertRaises(TypeError):
+            Money(0.5)
+
+        with self.assertRaises(TypeError):
+            dime * 0.5  # pylint: disable=pointless-statement
+
+    def test_str(self):
+        """
+        Checks amounts are shown in dollars
+        """
+        self.assertEqual(str(Money(123456)), "$1234.56")
+        self.assertEqual(str(Money(-5)), "-$0.05")
+
+
+class TestMoneyKernels(unittest.TestCase):
+    """
+    Exact versions of Exercises #3, #4, #21 and #23
+    """
+
+    def test_order_total(self):
+        """
+        Checks the total rounds once and matches the float version
+        """
+        items = [{"quantity": 7, "price": 0.1}, {"quantity": 3, "price": 19.99}]
+
+        self.assertEqual(order_total(items), Money(6064))
+        self.assertAlmostEqual(calculate_order_total(items), 60.635)
+
+        with self.assertRaises(TypeError):
+            order_total([{"quantity": 5.5, "price": 1}])
+
+    def test_total_discount(self):
+        """
+        Checks the discount tiers in cents
+        """
+        self.assertEqual(total_discount(Money.of(99.99)), Money())
+        self.assertEqual(total_discount(Money.of(500)), Money.of(50))
+        self.assertEqual(total_discount(Money.of("500.01")), Money.of(100))
+        self.assertAlmostEqual(calculate_total_discount(500.01), 100.002)
+
+    def test_transfer_fee(self):
+        """
+        Checks the fee of every transaction type
+        """
+        amount = Money.of("33.33")
+
+        self.assertEqual(transfer_fee(amount, "regular"), Money(67))
+        self.assertEqual(transfer_fee(amount, "express"), Money(167))
+        self.assertEqual(transfer_fee(amount, "scheduled"), Money(33))
+
+        with self.assertRaises(ValueError):
+            transfer_fee(amount, "instant")
+
+    def test_cart_total(self):
+        """
+        Checks the cart total is exact
+        """
+        cart = ShoppingCart()
+        cart.add_product(Product("pen", 0.1), 3)
+        cart.add_product(Product("book", 0.2))
+
+        self.assertEqual(cart_total(cart), Money(50))
+        self.assertEqual(cart_total(ShoppingCart()), Money())
+
+    def test_order_totals(self):
+        """
+        Checks the batch totals match order_total
+        """
+        quantities, prices = [7, 3, 12, 0], [10, 1999, 333, 500]
+
+        totals = order_totals(quantities, prices, [2, 1, 1])
+
+        self.assertEqual(list(totals), [6064, 3596, 0])
+        items = [{"quantity": 7, "price": Money(10)}, {"quantity": 3, "price": 19.99}]
+        self.assertEqual(totals[0], order_total(items).cents)
+
+        with self.assertRaises(ValueError):
+            order_totals(quantities, prices, [2, 1])
+
+        with self.assertRaises(ValueError):
+            order_totals([1], [-1], [1])
+
+    def test_total_discounts(self):
+        """
+        Checks the batch discounts match total_discount
+        """
+        totals = [9_999, 10_000, 50_000, 50_001]
+
+        self.assertEqual(
+            list(total_discounts(totals)),
+            [total_discount(Money(total)).cents for total in totals],
+        )
+
+    def test_transfer_fees(self):
+        """
+        Checks the batch fees match transfer_fee
+        """
+        amounts, types = [3333, 3333, 100], ["regular", "express", "scheduled"]
+
+        self.assertEqual(list(transfer_fees(amounts, types)), [67, 167, 1])
+
+        with self.assertRaises(ValueError):
+            transfer_fees([100], ["instant"])
+
+        with self.assertRaises(ValueError):
+            transfer_fees([100], [])
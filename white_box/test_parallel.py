@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+"""
+Process-pool map unit tests.
+"""
+import unittest
+
+from white_box.class_exercises import check_loan_eligibility, is_even
+from white_box.parallel import parallel_map
+
+
+class TestParallelMap(unittest.TestCase):
+    """
+    Parallel execution of the exercises.
+    """
+
+    def test_parallel_map_keeps_order(self):
+        """
+        Checks results come back in input order
+        """
+        results = parallel_map(is_even, iter(range(50)), workers=2, chunk_size=3)
+
+        self.assertEqual(list(results), [n % 2 == 0 for n in range(50)])
+
+    def test_parallel_map_star(self):
+        """
+        Checks items are unpacked as arguments with star=True
+        """
+        pairs = [(20000, 800), (40000, 800), (40000, 600), (70000, 800)]
+
+        results = parallel_map(check_loan_eligibility, pairs, workers=2, star=True)
+
+        self.assertEqual(list(results), [check_loan_eligibility(*p) for p in pairs])
+
+    def test_parallel_map_empty(self):
+        """
+        Checks an empty input gives no results
+        """
+        self.assertEqual(list(parallel_map(is_even, [], workers=1)), [])
+
+    def test_parallel_map_invalid_chunk_size(self):
+        """
+        Checks the chunk size must be positive
+        """
+        with self.assertRaises(ValueError):
+            list(parallel_map(is_even, [1], chunk_size=0))
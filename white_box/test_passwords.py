@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+"""
+Fast password validation unit tests.
+"""
+import unittest
+
+from white_box.class_exercises import validate_password
+from white_box.passwords import is_valid_password, validate_passwords
+
+
+class TestIsValidPassword(unittest.TestCase):
+    """
+    Single-pass version of Exercise #02
+    """
+
+    def test_is_valid_password_correct_passwords(self):
+        """
+        Checks passwords with every special character
+        """
+        for special in "!@#$%&":
+            self.assertTrue(is_valid_password(f"Password{special}123"))
+
+    def test_is_valid_password_wrong_length(self):
+        """
+        Checks password with length less than 8
+        """
+        self.assertFalse(is_valid_password("Pass@1"))
+
+    def test_is_valid_password_missing_classes(self):
+        """
+        Checks passwords missing uppercase, lowercase, digits or specials
+        """
+        for password in (
+            "password@123",
+            "PASSWORD@123",
+            "Password@abc",
+            "Password-123",
+        ):
+            self.assertFalse(is_valid_password(password))
+
+    def test_is_valid_password_unicode_digit(self):
+        """
+        Checks non-ASCII digits count as digits like in validate_password
+        """
+        self.assertTrue(validate_password("Password@٣"))
+        self.assertTrue(is_valid_password("Password@٣"))
+
+
+class TestValidatePasswords(unittest.TestCase):
+    """
+    Batch password validation.
+    """
+
+    def test_validate_passwords_matches_scalar(self):
+        """
+        Checks the batch results match validate_password
+        """
+        passwords = ["Password@123", "Pass@1", "password123", "PASSWORD@123", ""]
+
+        self.assertEqual(
+            list(validate_passwords(iter(passwords))),
+            [validate_password(password) for password in passwords],
+        )
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch pricing unit tests.
+"""
+import math
+import random
+import unittest
+from array import array
+
+from white_box.class_exercises import (
+    Product,
+    ShoppingCart,
+    calculate_items_shipping_cost,
+    calculate_order_total,
+    calculate_shipping_cost,
+    calculate_total_discount,
+)
+from white_box.money import Money
+from white_box.pricing import (
+    SHIPPING_CHUNK,
+    CheckoutQuote,
+    calculate_order_totals,
+    calculate_shipping_costs,
+    quantity_discount_factor,
+    quote_cart,
+    quote_checkout,
+    quote_checkouts,
+    quote_items_shipping,
+)
+
+
+class TestQuantityDiscountFactor(unittest.TestCase):
+    """
+    Quantity discount tiers.
+    """
+
+    def test_quantity_discount_factor_between_1_and_5(self):
+        """
+        Checks no discount for 1 <= quantity <= 5
+        """
+        self.assertEqual(quantity_discount_factor(1), 1)
+        self.assertEqual(quantity_discount_factor(5), 1)
+
+    def test_quantity_discount_factor_between_6_and_10(self):
+        """
+        Checks 5% discount for 6 <= quantity <= 10
+        """
+        self.assertEqual(quantity_discount_factor(6), 0.95)
+        self.assertEqual(quantity_discount_factor(10), 0.95)
+
+    def test_quantity_discount_factor_greater_than_10(self):
+        """
+        Checks 10% discount for quantity > 10
+        """
+        self.assertEqual(quantity_discount_factor(11), 0.9)
+
+
+class TestCalculateOrderTotals(unittest.TestCase):
+    """
+    Columnar version of Exercise #04
+    """
+
+    def test_calculate_order_totals_matches_scalar(self):
+        """
+        Checks every order total matches calculate_order_total
+        """
+        orders = [
+            [],
+            [{"quantity": 1, "price": 10}],
+            [{"quantity": 6, "price": 10.1}, {"quantity": 10, "price": 3.3}],
+            [
+                {"quantity": 2, "price": 5},
+                {"quantity": 8, "price": 10},
+                {"quantity": 20, "price": 2.7},
+            ],
+            [{"quantity": 150, "price": 1.1}, {"quantity": 5.5, "price": 2.2}],
+        ]
+        quantities = [i["quantity"] for o in orders for i in o]
+        prices = array("d", [i["price"] for o in orders for i in o])
+        sizes = (len(order) for order in orders)
+
+        totals = calculate_order_totals(quantities, prices, sizes)
+
+        self.assertEqual(list(totals), [calculate_order_total(o) for o in orders])
+
+    def test_calculate_order_totals_length_mismatch(self):
+        """
+        Checks quantities and prices of different length are rejected
+        """
+        with self.assertRaises(ValueError):
+            calculate_order_totals([1, 2], [10], [2])
+
+    def test_calculate_order_totals_wrong_order_sizes(self):
+        """
+        Checks order sizes must cover every order line
+        """
+        with self.assertRaises(ValueError):
+            calculate_order_totals([1, 2], [10, 20], [1])
+
+        with self.assertRaises(ValueError):
+            calculate_order_totals([1, 2], [10, 20], [3])
+
+
+class TestQuoteItemsShipping(unittest.TestCase):
+    """
+    Bulk version of Exercise #05
+    """
+
+    def test_quote_items_shipping_matches_scalar(self):
+        """
+        Checks every quote matches calculate_items_shipping_cost
+        """
+        carts = [
+            [{"weight": 5}],
+            [{"weight": 2.5}, {"weight": 2.51}],
+            [{"weight": 10}],
+            [{"weight": 4}, {"weight": 6.01}],
+        ]
+
+        quotes = quote_items_shipping(carts)
+
+        for items, quote in zip(carts, quotes):
+            for method in ("standard", "express"):
+                self.assertEqual(
+                    quote[method], calculate_items_shipping_cost(items, method)
+                )
+
+    def test_quote_items_shipping_single_method(self):
+        """
+        Checks only the requested methods are quoted
+        """
+        self.assertEqual(quote_items_shipping([[]], ["express"]), [{"express": 20}])
+
+    def test_quote_items_shipping_invalid_method(self):
+        """
+        Checks an unknown shipping method is rejected
+        """
+        with self.assertRaises(ValueError):
+            quote_items_shipping([[{"weight": 1}]], ["overnight"])
+
+
+class TestCalculateShippingCosts(unittest.TestCase):
+    """
+    Columnar version of Exercise #18
+    """
+
+    def test_calculate_shipping_costs_matches_scalar(self):
+        """
+        Checks every package cost matches calculate_shipping_cost
+        """
+        packages = [(1, 10, 10, 10), (5, 30, 30, 30), (3, 11, 40, 11), (6, 5, 5, 5)]
+        columns = [array("d", column) for column in zip(*packages)]
+
+        self.assertEqual(
+            calculate_shipping_costs(*columns),
+            [calculate_shipping_cost(*package) for package in packages],
+        )
+
+    def test_calculate_shipping_costs_large_batch(self):
+        """
+        Checks a batch priced with column masks, boundaries and NaN included
+        """
+        values = [0, 1, 1.5, 5, 5.5, 10, 10.5, 11, 30, 30.5, -1, math.nan, math.inf]
+        rng = random.Random(3)
+        columns = [
+            [rng.choice(values) for _ in range(SHIPPING_CHUNK + 10)] for _ in range(4)
+        ]
+
+        self.assertEqual(
+            calculate_shipping_costs(*columns),
+            list(map(calculate_shipping_cost, *columns)),
+        )
+
+    def test_calculate_shipping_costs_length_mismatch(self):
+        """
+        Checks columns of different length are rejected
+        """
+        with self.assertRaises(ValueError):
+            calculate_shipping_costs([1], [10], [10], [])
+
+
+class TestQuoteCheckout(unittest.TestCase):
+    """
+    One-pass version of Exercises #3, #4, #5 and #23
+    """
+
+    def setUp(self):
+        self.items = [
+            {"quantity": 7, "price": 0.1, "weight": 3},
+            {"quantity": 3, "price": 19.99, "weight": 4},
+            {"quantity": 12, "price": 50, "weight": 1},
+        ]
+
+    def test_quote_checkout_matches_scalar(self):
+        """
+        Checks the quote matches the separate functions, to the cent
+        """
+        quote = quote_checkout(iter(self.items), "express")
+
+        order_total = calculate_order_total(self.items)
+        subtotal = sum(item["quantity"] * item["price"] for item in self.items)
+        self.assertAlmostEqual(quote.subtotal.cents, subtotal * 100)
+        self.assertAlmostEqual(
+            quote.quantity_discount.cents, (subtotal - order_total) * 100, delta=0.5
+        )
+        self.assertAlmostEqual(
+            quote.order_discount.cents,
+            calculate_total_discount(order_total) * 100,
+            delta=0.5,
+        )
+        self.assertEqual(
+            quote.shipping,
+            Money.of(calculate_items_shipping_cost(self.items, "express")),
+        )
+        self.assertEqual(
+            quote.total,
+            quote.subtotal
+            - quote.quantity_discount
+            - quote.order_discount
+            + quote.shipping,
+        )
+
+    def test_quote_checkout_empty(self):
+        """
+        Checks an empty checkout only pays the lightest shipping tier
+        """
+        self.assertEqual(
+            quote_checkout([]),
+            CheckoutQuote(Money(), Money(), Money(), Money(1000), Money(1000)),
+        )
+
+    def test_quote_checkout_invalid_method(self):
+        """
+        Checks an unknown shipping method is rejected
+        """
+        with self.assertRaises(ValueError):
+            quote_checkout(self.items, "overnight")
+
+    def test_quote_checkout_fractional_quantity(self):
+        """
+        Checks fractional quantities are rejected instead of giving cents
+        that are not integers
+        """
+        with self.assertRaises(TypeError):
+            quote_checkout([{"quantity": 5.5, "price": 1}])
+
+    def test_quote_checkouts(self):
+        """
+        Checks every cart is quoted like quote_checkout
+        """
+        carts = [self.items, self.items[:1], []]
+
+        self.assertEqual(
+            quote_checkouts(carts, "express"),
+            [quote_checkout(items, "express") for items in carts],
+        )
+
+    def test_quote_cart(self):
+        """
+        Checks a ShoppingCart is quoted from its products
+        """
+        cart = ShoppingCart()
+        cart.add_product(Product("pen", 0.1), 7)
+        cart.add_product(Product("book", 19.99), 3)
+
+        quote = quote_cart(cart)
+
+        self.assertEqual(quote.subtotal, Money(6067))
+        self.assertEqual(quote.quantity_discount, Money(3))
+        self.assertEqual(quote.total, Money(7064))
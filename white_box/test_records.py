@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+"""
+Fixed-width record files unit tests.
+"""
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from itertools import count
+
+from white_box.records import RecordFile, ScanReport, main, scan_file
+
+# name (8) + card (16) + date (8) + newline
+RECORDS = (
+    b"nicolas 411111111111111120240229\n"
+    b"ana     411111111111111220230229\n"
+    b"luis     37828224631000519991231\n"
+)
+FIELDS = {"name": (0, 8), "card": (8, 16), "date": (24, 8)}
+CHECKS = {"card": "card", "date": "date"}
+
+
+class TestRecordFile(unittest.TestCase):
+    """
+    Memory-mapped fixed-width records.
+    """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "records.dat")
+        with open(self.path, "wb") as stream:
+            stream.write(RECORDS)
+
+    def test_records_and_fields(self):
+        """
+        Checks records and fields are memoryview slices
+        """
+        with RecordFile(self.path, 33, FIELDS) as records:
+            self.assertEqual(len(records), 3)
+            record = records[-1]
+            field = records.field(1, "name")
+
+            self.assertIsInstance(field, memoryview)
+            self.assertEqual(bytes(field), b"ana     ")
+            self.assertEqual(bytes(record), RECORDS[66:])
+
+            with self.assertRaises(IndexError):
+                records[3]  # pylint: disable=pointless-statement
+
+            record.release()
+            field.release()
+
+    def test_blocks(self):
+        """
+        Checks the blocks hold whole records
+        """
+        with RecordFile(self.path, 33) as records:
+            blocks = [(start, bytes(block)) for start, block in records.blocks(2)]
+
+        self.assertEqual(blocks, [(0, RECORDS[:66]), (2, RECORDS[66:])])
+
+    def test_scan(self):
+        """
+        Checks every block gets a validity mask per checked field
+        """
+        with RecordFile(self.path, 33, FIELDS) as records:
+            results = [
+                (start, {name: list(mask) for name, mask in masks.items()})
+                for start, masks in records.scan(CHECKS, block_records=2)
+            ]
+
+        self.assertEqual(
+            results,
+            [
+                (0, {"card": [1, 0], "date": [1, 0]}),
+                (2, {"card": [1], "date": [1]}),
+            ],
+        )
+
+    def test_invalid_layouts(self):
+        """
+        Checks the layouts that do not match the file are rejected
+        """
+        with self.assertRaises(ValueError):
+            RecordFile(self.path, 32)
+
+        with self.assertRaises(ValueError):
+            RecordFile(self.path, 33, {"card": (20, 16)})
+
+        with RecordFile(self.path, 33, FIELDS) as records:
+            with self.assertRaises(ValueError):
+                next(records.scan({"email": "card"}))
+
+            with self.assertRaises(ValueError):
+                next(records.scan({"card": "date"}))
+
+    def test_empty_file(self):
+        """
+        Checks an empty file has no records
+        """
+        open(self.path, "wb").close()  # pylint: disable=consider-using-with
+
+        with RecordFile(self.path, 33) as records:
+            self.assertEqual(len(records), 0)
+            self.assertEqual(list(records.blocks()), [])
+
+    def test_scan_file(self):
+        """
+        Checks the report counts the valid rows and the throughput
+        """
+        ticks = count()
+
+        checks = {"card": (8, 16, "card"), "date": (24, 8, "date")}
+
+        report = scan_file(self.path, 33, checks, clock=lambda: next(ticks))
+
+        self.assertEqual(report, ScanReport(3, 99, 1, {"card": 2, "date": 2}))
+        self.assertEqual(report.rows_per_second, 3)
+        self.assertEqual(report.bytes_per_second, 99)
+
+    def test_main(self):
+        """
+        Checks the CLI prints the report as JSON
+        """
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            main([self.path, "--record-size", "33", "--card", "8", "--date", "24"])
+
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(report["rows"], 3)
+        self.assertEqual(report["valid"], {"card": 2, "date": 2})
+        self.assertIn("rows_per_second", report)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+"""
+Performance regression suite unit tests.
+"""
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from white_box import class_exercises
+from white_box.regression import CASES, compare, main, mann_whitney_p, run_suite
+
+
+def _results(seconds, operations=10):
+    """
+    Builds suite results with a single case.
+    """
+    return {"cases": {"is_even": {"operations": operations, "seconds": seconds}}}
+
+
+class TestRegressionSuite(unittest.TestCase):
+    """
+    Benchmark cases and regression detection.
+    """
+
+    def test_regression_cases_cover_class_exercises(self):
+        """
+        Checks every public function and class has a benchmark case
+        """
+        public = {
+            name
+            for name, value in vars(class_exercises).items()
+            if callable(value)
+            and getattr(value, "__module__", None) == class_exercises.__name__
+            and not name.startswith("_")
+        }
+
+        self.assertEqual(public - set(CASES), set())
+
+    def test_regression_run_suite(self):
+        """
+        Checks the selected cases are timed with the scaled sizes
+        """
+        results = run_suite(["is_even", "ShoppingCart"], scale=0.001, samples=2)
+
+        self.assertEqual(set(results["cases"]), {"is_even", "ShoppingCart"})
+        self.assertEqual(results["cases"]["is_even"]["operations"], 100)
+        self.assertEqual(len(results["cases"]["ShoppingCart"]["seconds"]), 2)
+
+    def test_mann_whitney_p(self):
+        """
+        Checks clearly slower samples give a small p-value and others do not
+        """
+        baseline = [1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 1.02]
+        slower = [2.0, 2.1, 1.9, 2.05, 1.95, 2.0, 2.02]
+
+        self.assertLess(mann_whitney_p(baseline, slower), 0.01)
+        self.assertGreater(mann_whitney_p(slower, baseline), 0.99)
+        self.assertEqual(mann_whitney_p([1.0, 1.0], [1.0, 1.0]), 1.0)
+
+    def test_compare_per_operation(self):
+        """
+        Checks results are compared per operation
+        """
+        baseline = _results([1.0, 1.1, 0.9, 1.0, 1.0], operations=10)
+        current = _results([2.0, 2.2, 1.8, 2.0, 2.0], operations=20)
+
+        rows = compare(baseline, current)
+
+        self.assertEqual(len(rows), 1)
+        name, before, after, change, _, regressed = rows[0]
+
+        self.assertEqual(name, "is_even")
+        self.assertAlmostEqual(before, after)
+        self.assertAlmostEqual(change, 0)
+        self.assertFalse(regressed)
+
+    def test_compare_regression(self):
+        """
+        Checks a significant slowdown over the threshold is a regression
+        """
+        baseline = _results([1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 1.02])
+        current = _results([1.5, 1.6, 1.4, 1.55, 1.45, 1.5, 1.52])
+
+        self.assertTrue(compare(baseline, current)[0][-1])
+        self.assertFalse(compare(baseline, current, threshold=0.6)[0][-1])
+        self.assertEqual(compare({"cases": {}}, current), [])
+
+    def test_main_compare_exit_status(self):
+        """
+        Checks the command line fails when a regression is found
+        """
+        fast = _results([1e-9] * 7, operations=1)
+
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, "baseline.json")
+            with open(baseline, "w", encoding="utf-8") as stream:
+                json.dump(fast, stream)
+
+            with redirect_stdout(io.StringIO()) as output:
+                with self.assertRaises(SystemExit) as exit_info:
+                    main(["is_even", "--scale", "0.001", "--compare", baseline])
+
+        self.assertEqual(exit_info.exception.code, 1)
+        self.assertIn("REGRESSION", output.getvalue())
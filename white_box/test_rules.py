@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+"""
+Threshold table unit tests.
+"""
+import unittest
+from array import array
+
+from white_box.rules import ThresholdTable
+
+
+class TestThresholdTable(unittest.TestCase):
+    """
+    Declarative threshold ladders.
+    """
+
+    def setUp(self):
+        self.table = ThresholdTable(["low", "mid", "high"], [(10, ">="), (20, ">")])
+
+    def test_threshold_table_inclusive_breakpoint(self):
+        """
+        Checks a value equal to a ">=" breakpoint gets the next label
+        """
+        self.assertEqual(self.table.classify(9.99), "low")
+        self.assertEqual(self.table.classify(10), "mid")
+
+    def test_threshold_table_exclusive_breakpoint(self):
+        """
+        Checks a value equal to a ">" breakpoint keeps the previous label
+        """
+        self.assertEqual(self.table.classify(20), "mid")
+        self.assertEqual(self.table.classify(20.01), "high")
+
+    def test_threshold_table_index(self):
+        """
+        Checks index returns the label position
+        """
+        self.assertEqual([self.table.index(v) for v in (0, 15, 25)], [0, 1, 2])
+
+    def test_threshold_table_index_many(self):
+        """
+        Checks index_many matches index at and around the breakpoints
+        """
+        values = [9, 9.99, 10, 10.0, 15, 20, 20.01, float("nan"), float("inf")]
+
+        self.assertEqual(
+            self.table.index_many(values), [self.table.index(v) for v in values]
+        )
+        self.assertEqual(self.table.breakpoints, [(10, ">="), (20, ">")])
+        strict = ThresholdTable(["a", "b"], [(0, ">")])
+        self.assertEqual(strict.index_many([0, 1]), [0, 1])
+
+    def test_threshold_table_unordered(self):
+        """
+        Checks NaN gets the unordered label, in index and index_many
+        """
+        table = ThresholdTable(["low", "mid", "high"], [(10, ">="), (20, ">")], 2)
+        values = [5, float("nan"), 25, float("nan")]
+
+        self.assertEqual(self.table.index(float("nan")), 0)
+        self.assertEqual(table.index(float("nan")), 2)
+        self.assertEqual(table.index_many(values), [0, 2, 2, 2])
+        self.assertEqual(table.index_many(array("q", [5, 15])), [0, 1])
+
+        with self.assertRaises(ValueError):
+            ThresholdTable(["low", "high"], [(10, ">=")], unordered=2)
+
+    def test_threshold_table_lower_bound(self):
+        """
+        Checks lower_bound finds where each label starts in sorted values
+        """
+        values = [5, 10, 10, 15, 20, 20, 25]
+
+        bounds = [self.table.lower_bound(values, position) for position in range(4)]
+
+        self.assertEqual(bounds, [0, 1, 6, 7])
+        self.assertEqual(self.table.lower_bound(values, 3, hi=5), 5)
+        self.assertEqual(self.table.lower_bound(values, 2, hi=5), 5)
+        items = [("a", 5), ("b", 10), ("c", 25)]
+        self.assertEqual(self.table.lower_bound(items, 2, key=lambda i: i[1]), 2)
+
+    def test_threshold_table_classify_many(self):
+        """
+        Checks many values are classified at once
+        """
+        self.assertEqual(
+            self.table.classify_many(iter([5, 10, 20, 21])),
+            ["low", "mid", "mid", "high"],
+        )
+
+    def test_threshold_table_without_breakpoints(self):
+        """
+        Checks a table with a single label classifies everything the same
+        """
+        self.assertEqual(ThresholdTable(["only"]).classify(-1), "only")
+
+    def test_threshold_table_wrong_label_count(self):
+        """
+        Checks labels and breakpoints sizes must agree
+        """
+        with self.assertRaises(ValueError):
+            ThresholdTable(["a", "b"], [])
+
+    def test_threshold_table_invalid_operator(self):
+        """
+        Checks only ">=" and ">" breakpoints are accepted
+        """
+        with self.assertRaises(ValueError):
+            ThresholdTable(["a", "b"], [(1, "<")])
+
+    def test_threshold_table_unsorted_breakpoints(self):
+        """
+        Checks breakpoints must be strictly increasing
+        """
+        with self.assertRaises(ValueError):
+            ThresholdTable(["a", "b", "c"], [(2, ">="), (2, ">")])
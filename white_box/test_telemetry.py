@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+"""
+Batch and streaming sensor mode unit tests.
+"""
+import math
+import unittest
+
+from white_box.class_exercises import celsius_to_fahrenheit, get_weather_advisory
+from white_box.telemetry import (
+    ADVISORIES,
+    COLD_ADVISORY,
+    HEAT_ADVISORY,
+    NO_ADVISORY,
+    SensorStream,
+    WindowStats,
+    process_readings,
+)
+
+TEMPERATURES = [-150, -100, -5.5, 0, -0.0, 25, 30, 31, 35.5, 100, 100.5, 1e-300]
+HUMIDITIES = [80, 50, 90, 75, 75, 75, 80, 70, 71, 100, 20, 50]
+# Readings a faulty sensor may send
+SPECIAL = [math.nan, math.inf, -math.inf, 35, 70.000001]
+SPECIAL_HUMIDITIES = [90, 90, 50, math.nan, 70.000001]
+
+
+async def _chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+class TestProcessReadings(unittest.TestCase):
+    """
+    Columns of readings through celsius_to_fahrenheit and get_weather_advisory.
+    """
+
+    def test_matches_scalar_functions(self):
+        """
+        Checks every reading matches the scalar functions
+        """
+        temperatures = TEMPERATURES + SPECIAL
+        humidities = HUMIDITIES + SPECIAL_HUMIDITIES
+        batch = process_readings(temperatures, humidities)
+
+        for index, (celsius, humidity) in enumerate(zip(temperatures, humidities)):
+            expected = celsius_to_fahrenheit(celsius)
+            if expected == "Invalid Temperature":
+                self.assertEqual(batch.valid[index], 0)
+                self.assertTrue(math.isnan(batch.fahrenheit[index]))
+            else:
+                self.assertEqual(batch.valid[index], 1)
+                self.assertEqual(batch.fahrenheit[index], expected)
+
+            self.assertEqual(
+                ADVISORIES[batch.advisories[index]],
+                get_weather_advisory(celsius, humidity),
+            )
+
+    def test_advisory_codes(self):
+        """
+        Checks the advisory codes of the boundary readings
+        """
+        batch = process_readings([30, 30.5, 30.5, -0.5, -150], [90, 70, 70.5, 99, 0])
+
+        self.assertEqual(
+            list(batch.advisories),
+            [NO_ADVISORY, NO_ADVISORY, HEAT_ADVISORY, COLD_ADVISORY, COLD_ADVISORY],
+        )
+
+    def test_empty_and_mismatched_columns(self):
+        """
+        Checks empty columns and columns of different lengths
+        """
+        self.assertEqual(list(map(len, process_readings([], []))), [0, 0, 0])
+
+        with self.assertRaises(ValueError):
+            process_readings([20, 21], [50])
+
+
+class TestSensorStream(unittest.IsolatedAsyncioTestCase):
+    """
+    Sliding windows of readings per sensor.
+    """
+
+    def test_windows(self):
+        """
+        Checks every sensor keeps its last valid readings
+        """
+        stream = SensorStream(window=3)
+
+        stream.process([10, 20, 500, 30], [50] * 4, ["a", "b", "a", "a"])
+        stream.process([40, 60], [50, 50], ["a", "b"])
+
+        self.assertEqual(stream.stats("a"), WindowStats(3, 80 / 3, 10, 40))
+        self.assertEqual(stream.stats("b"), WindowStats(2, 40, 20, 60))
+        self.assertNotIn("c", stream)
+        self.assertEqual(stream.stats("c").count, 0)
+        self.assertTrue(math.isnan(stream.stats("c").mean))
+
+    def test_invalid_arguments(self):
+        """
+        Checks the window size and the sensor column are validated
+        """
+        with self.assertRaises(ValueError):
+            SensorStream(window=0)
+
+        with self.assertRaises(ValueError):
+            SensorStream().process([20, 21], [50, 50], ["a"])
+
+    async def test_stream(self):
+        """
+        Checks an async iterator of chunks yields a batch per chunk
+        """
+        stream = SensorStream(window=2)
+        chunks = [
+            ([35, -5], [80, 10], ["a", "b"]),
+            ([150], [50]),
+            ([25, 27], [60, 60], ["a", "a"]),
+        ]
+
+        batches = [batch async for batch in stream.stream(_chunks(chunks))]
+
+        self.assertEqual(
+            [bytes(batch.advisories) for batch in batches],
+            [bytes([HEAT_ADVISORY, COLD_ADVISORY]), bytes([NO_ADVISORY]), bytes(2)],
+        )
+        self.assertEqual(list(batches[1].valid), [0])
+        self.assertEqual(stream.stats("a"), WindowStats(2, 26, 25, 27))
+        self.assertEqual(stream.stats("b"), WindowStats(1, -5, -5, -5))
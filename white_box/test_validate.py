@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""
+Validation pipeline unit tests.
+"""
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+from white_box.validate import main, run_validator, validate_stream
+
+CSV_INPUT = (
+    "email,card_number,year,month,day\n"
+    "email@test.com,4111111111111111,2020,2,28\n"
+    "email.test,1234,2020,13,1\n"
+    "em@.,,x,1,1\n"
+)
+
+
+class TestValidateStream(unittest.TestCase):
+    """
+    Streaming validation of CSV/JSONL records.
+    """
+
+    def test_validate_stream_csv(self):
+        """
+        Checks CSV records are annotated and counted
+        """
+        output = io.StringIO()
+
+        summary = validate_stream(
+            io.StringIO(CSV_INPUT), output, ["email", "date"], chunk_size=2
+        )
+
+        lines = output.getvalue().splitlines()
+        self.assertEqual(
+            lines[0], "email,card_number,year,month,day,email_result,date_result"
+        )
+        self.assertTrue(lines[1].endswith("Valid Email,Valid Date"))
+        self.assertTrue(lines[2].endswith("Invalid Email,Invalid Date"))
+        self.assertTrue(lines[3].endswith("Invalid Email,"))
+        self.assertEqual(
+            summary,
+            {
+                "email": {"valid": 1, "invalid": 2},
+                "date": {"valid": 1, "invalid": 2},
+            },
+        )
+
+    def test_validate_stream_jsonl(self):
+        """
+        Checks JSONL records are annotated and blank lines skipped
+        """
+        source = io.StringIO(
+            '{"username": "nicolas", "password": "password"}\n'
+            "\n"
+            '{"username": "nico", "password": "password"}\n'
+        )
+        output = io.StringIO()
+
+        summary = validate_stream(source, output, ["login"], "jsonl")
+
+        results = [
+            json.loads(line)["login_result"] for line in output.getvalue().splitlines()
+        ]
+        self.assertEqual(results, ["Login Successful", "Login Failed"])
+        self.assertEqual(summary, {"login": {"valid": 1, "invalid": 1}})
+
+    def test_validate_stream_malformed_records(self):
+        """
+        Checks ragged CSV rows and non-object JSONL lines count as invalid
+        """
+        output = io.StringIO()
+
+        summary = validate_stream(
+            io.StringIO(CSV_INPUT + "a@b.com,1,2,3,4,5\n"), output, ["email"]
+        )
+
+        self.assertEqual(output.getvalue().splitlines()[-1], "a@b.com,1,2,3,4,")
+        self.assertEqual(summary, {"email": {"valid": 1, "invalid": 3}})
+
+        source = io.StringIO(
+            '[1, 2]\n{"url": "http://a.com"\n"x"\n{"url": "https://example.com"}\n'
+        )
+        output = io.StringIO()
+
+        summary = validate_stream(source, output, ["url"], "jsonl")
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(results[:3], [{"url_result": None}] * 3)
+        self.assertEqual(results[3]["url_result"], "Valid URL")
+        self.assertEqual(summary, {"url": {"valid": 1, "invalid": 3}})
+
+    def test_validate_stream_empty_input(self):
+        """
+        Checks an empty input writes nothing
+        """
+        output = io.StringIO()
+
+        summary = validate_stream(io.StringIO(""), output, ["url"])
+
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(summary, {"url": {"valid": 0, "invalid": 0}})
+
+    def test_validate_stream_invalid_options(self):
+        """
+        Checks unknown validators and formats are rejected
+        """
+        with self.assertRaises(ValueError):
+            validate_stream(io.StringIO(""), io.StringIO(), ["phone"])
+
+        with self.assertRaises(ValueError):
+            validate_stream(io.StringIO(""), io.StringIO(), ["url"], "xml")
+
+    def test_run_validator_missing_field(self):
+        """
+        Checks a missing field gives no result instead of an error
+        """
+        self.assertIsNone(run_validator("credit_card", {}))
+
+    def test_validate_stream_short_rows(self):
+        """
+        Checks the fields missing from short CSV rows count as invalid
+        """
+        output = io.StringIO()
+
+        summary = validate_stream(
+            io.StringIO("email,url,username,password\nc@d.org\n"),
+            output,
+            ["email", "url", "login"],
+        )
+
+        self.assertEqual(output.getvalue().splitlines()[-1], "c@d.org,,,,Valid Email,,")
+        self.assertEqual(
+            summary,
+            {
+                "email": {"valid": 1, "invalid": 0},
+                "url": {"valid": 0, "invalid": 1},
+                "login": {"valid": 0, "invalid": 1},
+            },
+        )
+        self.assertIsNone(run_validator("login", {"username": None}))
+
+
+class TestValidateMain(unittest.TestCase):
+    """
+    Command line entry point.
+    """
+
+    def test_main_writes_output_and_summary(self):
+        """
+        Checks the CLI reads a file, writes the output file and the summary
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "input.csv")
+            destination = os.path.join(directory, "output.csv")
+            with open(source, "w", encoding="utf-8") as stream:
+                stream.write(CSV_INPUT)
+
+            stderr = io.StringIO()
+            with redirect_stderr(stderr):
+                main([source, "-o", destination, "-v", "credit_card"])
+
+            with open(destination, encoding="utf-8") as stream:
+                self.assertEqual(len(stream.readlines()), 4)
+
+        self.assertEqual(
+            json.loads(stderr.getvalue()),
+            {"credit_card": {"valid": 1, "invalid": 2}},
+        )
+
+    def test_main_invalid_options_keep_output(self):
+        """
+        Checks invalid options exit before the output file is truncated
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "input.csv")
+            destination = os.path.join(directory, "output.csv")
+            for path in (source, destination):
+                with open(path, "w", encoding="utf-8") as stream:
+                    stream.write(CSV_INPUT)
+
+            with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+                main([source, "-o", destination, "-v", "phone"])
+
+            with open(destination, encoding="utf-8") as stream:
+                self.assertEqual(stream.read(), CSV_INPUT)
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+
+"""
+Structured validators unit tests.
+"""
+import unittest
+from array import array
+from datetime import date
+
+from white_box.class_exercises import validate_credit_card, validate_date
+from white_box.validators import (
+    CARD_ISSUER_NAMES,
+    EmailParts,
+    UrlParts,
+    card_issuer,
+    card_issuers,
+    date_to_epoch_day,
+    is_valid_card,
+    is_valid_date,
+    is_valid_email,
+    is_valid_hostname,
+    is_valid_url,
+    parse_email,
+    parse_url,
+    passes_luhn,
+    scan_card_records,
+    scan_date_records,
+    validate_cards,
+    validate_dates,
+    validate_emails,
+    validate_urls,
+)
+
+
+class TestParseUrl(unittest.TestCase):
+    """
+    Structured version of Exercise #14
+    """
+
+    def test_parse_url_components(self):
+        """
+        Checks a URL is split into its components
+        """
+        self.assertEqual(
+            parse_url("https://www.test.com:8080/path?q=1#top"),
+            UrlParts("https", "www.test.com", 8080, "/path", "q=1", "top"),
+        )
+
+    def test_parse_url_ip_hosts(self):
+        """
+        Checks IPv4 and IPv6 hosts are accepted
+        """
+        self.assertEqual(parse_url("http://127.0.0.1/").host, "127.0.0.1")
+        self.assertEqual(parse_url("http://[::1]:80/").host, "::1")
+
+    def test_parse_url_prefilter(self):
+        """
+        Checks long URLs, other schemes and spaces are rejected early
+        """
+        self.assertIsNone(parse_url("https://test.com/" + "a" * 255))
+        self.assertIsNone(parse_url("ftp://test.com"))
+        self.assertIsNone(parse_url("http://te st.com"))
+        self.assertIsNone(parse_url("http://tést.com"))
+        self.assertIsNone(parse_url("http://test.com/\n"))
+        self.assertIsNone(parse_url("http://test.com/?q=\x7f"))
+
+    def test_parse_url_invalid_hosts_and_ports(self):
+        """
+        Checks missing or malformed hosts and ports are rejected
+        """
+        for url in (
+            "http://",
+            "https://-test.com",
+            "http://a..com",
+            "http://a.com:99999",
+            "http://a.com:abc",
+            "http://[test]/",
+            "http://a-.com",
+            "http://a.-b.com",
+            "http://a.com.",
+            "http://" + "a" * 64 + ".com",
+        ):
+            self.assertIsNone(parse_url(url), url)
+
+        self.assertEqual(parse_url("http://" + "a" * 63 + ".com").host[-5:], "a.com")
+        self.assertEqual(parse_url("http://a-b.c-d.com").host, "a-b.c-d.com")
+
+    def test_validate_urls(self):
+        """
+        Checks URLs are validated in batch
+        """
+        self.assertEqual(
+            list(validate_urls(iter(["http://test.com", "test.com"]))), [True, False]
+        )
+        self.assertTrue(is_valid_url("http://test.com"))
+
+
+class TestParseEmail(unittest.TestCase):
+    """
+    Structured version of Exercise #09
+    """
+
+    def test_parse_email_components(self):
+        """
+        Checks an email is split into local part and domain
+        """
+        self.assertEqual(
+            parse_email("first.last+tag@mail.test.com"),
+            EmailParts("first.last+tag", "mail.test.com"),
+        )
+
+    def test_parse_email_invalid(self):
+        """
+        Checks malformed addresses are rejected
+        """
+        for email in (
+            "em@.",
+            "email.test",
+            "email@test",
+            "a@@test.com",
+            "a@b@test.com",
+            ".email@test.com",
+            "em..ail@test.com",
+            "email@test.c",
+            "email@-test.com",
+            "email@123.456",
+            "a" * 65 + "@test.com",
+            "email@test-.com",
+            "email@" + "a" * 64 + ".com",
+        ):
+            self.assertIsNone(parse_email(email), email)
+
+    def test_validate_emails(self):
+        """
+        Checks emails are validated in batch
+        """
+        self.assertEqual(
+            list(validate_emails(["email@test.com", "email.test"])), [True, False]
+        )
+        self.assertTrue(is_valid_email("email@test.com"))
+
+
+class TestIsValidHostname(unittest.TestCase):
+    """
+    DNS hostnames.
+    """
+
+    def test_is_valid_hostname(self):
+        """
+        Checks label rules and length limits
+        """
+        self.assertTrue(is_valid_hostname("sub-domain.test.com"))
+        self.assertFalse(is_valid_hostname(""))
+        self.assertFalse(is_valid_hostname("test-.com"))
+        self.assertFalse(is_valid_hostname("a" * 64 + ".com"))
+        self.assertFalse(is_valid_hostname("a." * 127 + "com"))
+
+
+class TestCardValidation(unittest.TestCase):
+    """
+    Luhn version of Exercise #11
+    """
+
+    def test_passes_luhn(self):
+        """
+        Checks the Luhn checksum
+        """
+        self.assertTrue(passes_luhn("4111111111111111"))
+        self.assertTrue(passes_luhn("79927398713"))
+        self.assertFalse(passes_luhn("4111111111111112"))
+
+    def test_is_valid_card(self):
+        """
+        Checks length, digits and checksum
+        """
+        self.assertTrue(is_valid_card("378282246310005"))
+        self.assertFalse(is_valid_card("79927398713"))
+        self.assertFalse(is_valid_card("4111111111111112"))
+        self.assertFalse(is_valid_card("4111 1111 1111 1111"))
+        self.assertEqual(validate_credit_card("4111111111111112"), "Valid Card")
+
+    def test_card_issuer(self):
+        """
+        Checks the issuer is detected from the card prefix
+        """
+        cards = {
+            "4111111111111111": "Visa",
+            "5555555555554444": "Mastercard",
+            "2223000048400011": "Mastercard",
+            "378282246310005": "American Express",
+            "6011111111111117": "Discover",
+            "6221260000000000": "Discover",
+            "3530111333300000": "JCB",
+            "30569309025904": "Diners Club",
+            "9999999999999995": None,
+            "": None,
+        }
+        for number, issuer in cards.items():
+            self.assertEqual(card_issuer(number), issuer, number)
+
+    def test_scan_card_records(self):
+        """
+        Checks fixed-width records are validated in bulk
+        """
+        records = (
+            b"  4111111111111111;"
+            b"   378282246310005;"
+            b"  4111111111111112;"
+            b"  4111 11111111111;"
+            b"        7992739871;"
+            b"  41111111111111x1;"
+        )
+
+        mask, issuers = scan_card_records(records, width=18, record_size=19)
+
+        self.assertEqual(list(mask), [1, 1, 0, 0, 0, 0])
+        self.assertEqual(
+            [CARD_ISSUER_NAMES[code] for code in issuers],
+            ["Visa", "American Express", None, None, None, None],
+        )
+
+    def test_scan_card_records_offset(self):
+        """
+        Checks the card field can be anywhere in the record
+        """
+        records = b"id1 4111111111111111id2 4111111111111112"
+
+        self.assertEqual(
+            list(scan_card_records(records, width=16, record_size=20, offset=4)[0]),
+            [1, 0],
+        )
+
+    def test_scan_card_records_invalid_layout(self):
+        """
+        Checks the record layout is validated
+        """
+        with self.assertRaises(ValueError):
+            scan_card_records(b"4111111111111111", width=16, record_size=15)
+
+        with self.assertRaises(ValueError):
+            scan_card_records(b"41111111111111111", width=16)
+
+    def test_validate_cards(self):
+        """
+        Checks bulk validation matches is_valid_card
+        """
+        numbers = [
+            "4111111111111111",
+            "378282246310005",
+            "4111111111111112",
+            "41111111111111111",
+            " 378282246310005",
+            "411111111111111é",
+            "",
+        ]
+
+        self.assertEqual(validate_cards(numbers), [is_valid_card(n) for n in numbers])
+
+    def test_card_issuers(self):
+        """
+        Checks bulk issuers match card_issuer for the valid numbers
+        """
+        numbers = [
+            "4111111111111111",
+            "5555555555554444",
+            "2223000048400011",
+            "2720999999999996",
+            "378282246310005",
+            "6011111111111117",
+            "6221261111111116",
+            "6229251111111119",
+            "6229261111111118",
+            "3530111333300000",
+            "30569309025904",
+            "6441111111111117",
+            "9999999999999995",
+            "4111111111111112",
+            "",
+        ]
+
+        self.assertEqual(
+            card_issuers(numbers),
+            [card_issuer(n) if is_valid_card(n) else None for n in numbers],
+        )
+
+
+class TestDateValidation(unittest.TestCase):
+    """
+    Calendar version of Exercise #12
+    """
+
+    def test_is_valid_date(self):
+        """
+        Checks month lengths and leap years
+        """
+        self.assertTrue(is_valid_date(2024, 2, 29))
+        self.assertTrue(is_valid_date(2000, 2, 29))
+        self.assertTrue(is_valid_date(2100, 12, 31))
+        self.assertFalse(is_valid_date(1900, 2, 29))
+        self.assertFalse(is_valid_date(2023, 2, 29))
+        self.assertFalse(is_valid_date(2023, 4, 31))
+        self.assertFalse(is_valid_date(2023, 13, 1))
+        self.assertFalse(is_valid_date(2023, 1, 0))
+        self.assertFalse(is_valid_date(2101, 1, 1))
+        self.assertEqual(validate_date(2023, 2, 31), "Valid Date")
+
+    def test_date_to_epoch_day(self):
+        """
+        Checks epoch days match datetime.date
+        """
+        epoch = date(1970, 1, 1)
+        for day in (date(1900, 1, 1), date(1969, 12, 31), epoch, date(2100, 12, 31)):
+            self.assertEqual(
+                date_to_epoch_day(day.year, day.month, day.day), (day - epoch).days
+            )
+        self.assertIsNone(date_to_epoch_day(2023, 2, 31))
+
+    def test_validate_dates(self):
+        """
+        Checks the columns give the same results as date_to_epoch_day
+        """
+        dates = [
+            (2024, 2, 29),
+            (2023, 2, 29),
+            (1970, 1, 1),
+            (1969, 12, 31),
+            (1900, 1, 1),
+            (2100, 12, 31),
+            (2101, 1, 1),
+            (1899, 12, 31),
+            (2023, 0, 10),
+            (2023, 1, 32),
+            (2023, -1, 1),
+            (2023, 1, 257),
+            (-2023, 1, 1),
+            (0x10000 + 2023, 1, 1),
+        ]
+        years, months, days = zip(*dates)
+
+        mask, epoch_days = validate_dates(years, months, days)
+
+        expected = [date_to_epoch_day(*row) for row in dates]
+        self.assertEqual(list(mask), [day is not None for day in expected])
+        self.assertEqual(list(epoch_days), [day or 0 for day in expected])
+
+    def test_validate_dates_arrays(self):
+        """
+        Checks array columns are accepted as they are
+        """
+        years, months, days = array("q", [2000]), array("q", [2]), array("q", [29])
+
+        mask, epoch_days = validate_dates(years, months, days)
+
+        self.assertEqual(list(mask), [1])
+        self.assertEqual(list(epoch_days), [11016])
+        self.assertEqual(list(years), [2000])
+
+    def test_validate_dates_lengths(self):
+        """
+        Checks the columns must have the same length
+        """
+        self.assertEqual(validate_dates([], [], []), (bytearray(), array("q")))
+
+        with self.assertRaises(ValueError):
+            validate_dates([2000], [1, 2], [1])
+
+    def test_scan_date_records(self):
+        """
+        Checks YYYYMMDD records give the same results as validate_dates
+        """
+        records = b"#20240229#20230229#19000101#21010101#2024-1-1#1999123 "
+
+        mask, epoch_days = scan_date_records(records, record_size=9, offset=1)
+
+        self.assertEqual(list(mask), [1, 0, 1, 0, 0, 0])
+        self.assertEqual(list(epoch_days), [19782, 0, -25567, 0, 0, 0])
+
+        with self.assertRaises(ValueError):
+            scan_date_records(records, record_size=8, offset=1)
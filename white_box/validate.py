@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+"""
+Streams CSV/JSONL records through the validator exercises.
+Usage: python -m white_box.validate INPUT [-o OUTPUT] [-v email,date] [--format csv]
+"""
+import argparse
+import csv
+import json
+import sys
+from collections import Counter
+
+from white_box import class_exercises
+from white_box.chunks import read_chunks
+
+FORMATS = ("csv", "jsonl")
+
+# name: (class_exercises validator, record fields, field converter, valid result)
+# The validators are looked up on the module for every record, so that
+# instrumentation.Instrumentation sees the calls.
+VALIDATORS = {
+    "email": ("validate_email", ("email",), str, "Valid Email"),
+    "url": ("validate_url", ("url",), str, "Valid URL"),
+    "credit_card": ("validate_credit_card", ("card_number",), str, "Valid Card"),
+    "date": ("validate_date", ("year", "month", "day"), int, "Valid Date"),
+    "login": ("validate_login", ("username", "password"), str, "Login Successful"),
+}
+
+
+class MalformedRecord(dict):
+    """
+    A record that could not be read as is: a CSV row with extra fields
+    (dropped) or a JSONL line that is not a JSON object (empty record).
+    Every validator gives it an invalid result.
+    """
+
+
+def read_records(stream, file_format):
+    """
+    Lazily reads dict records from a CSV or JSONL stream.
+    """
+    if file_format == "csv":
+        for record in csv.DictReader(stream):
+            if None in record:
+                del record[None]
+                record = MalformedRecord(record)
+            yield record
+        return
+
+    for line in stream:
+        if line.strip():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield record if isinstance(record, dict) else MalformedRecord()
+
+
+def run_validator(name, record):
+    """
+    Runs a validator on a record.
+    Missing, empty (None: short CSV rows, JSON null) or malformed fields
+    count as an invalid result.
+    """
+    validator, fields, converter, _ = VALIDATORS[name]
+
+    values = [record.get(field) for field in fields]
+    if None in values:
+        return None
+
+    try:
+        return getattr(class_exercises, validator)(*map(converter, values))
+    except (TypeError, ValueError):
+        return None
+
+
+def annotate(chunks, names, summary):
+    """
+    Adds a <name>_result field to every record for each validator and
+    counts the valid and invalid results in summary.
+    """
+    for chunk in chunks:
+        for record in chunk:
+            malformed = isinstance(record, MalformedRecord)
+            for name in names:
+                result = None if malformed else run_validator(name, record)
+                record[f"{name}_result"] = result
+                valid = result == VALIDATORS[name][3]
+                summary[(name, "valid" if valid else "invalid")] += 1
+        yield chunk
+
+
+def write_chunks(chunks, stream, file_format):
+    """
+    Writes annotated chunks to a CSV or JSONL stream.
+    """
+    writer = None
+    for chunk in chunks:
+        if file_format == "jsonl":
+            stream.writelines(json.dumps(record) + "\n" for record in chunk)
+            continue
+
+        if writer is None:
+            writer = csv.DictWriter(stream, fieldnames=list(chunk[0]))
+            writer.writeheader()
+        writer.writerows(chunk)
+
+
+def check_options(names, file_format):
+    """
+    Checks the validator names and the file format.
+    """
+    for name in names:
+        if name not in VALIDATORS:
+            raise ValueError(f"Invalid validator: {name}")
+
+    if file_format not in FORMATS:
+        raise ValueError(f"Invalid format: {file_format}")
+
+
+def validate_stream(source, destination, names, file_format="csv", chunk_size=1000):
+    """
+    Runs the pipeline from source to destination and returns the counts
+    as {validator: {"valid": n, "invalid": n}}. Malformed records are
+    written with empty results and counted as invalid.
+    """
+    check_options(names, file_format)
+
+    summary = Counter()
+    chunks = read_chunks(read_records(source, file_format), chunk_size)
+    write_chunks(annotate(chunks, names, summary), destination, file_format)
+
+    return {
+        name: {
+            "valid": summary[(name, "valid")],
+            "invalid": summary[(name, "invalid")],
+        }
+        for name in names
+    }
+
+
+def main(argv=None):
+    """
+    Command line entry point.
+    """
+    parser = argparse.ArgumentParser(description="Validate CSV/JSONL records.")
+    parser.add_argument("input", help="input file, - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file")
+    parser.add_argument(
+        "-v",
+        "--validators",
+        default=",".join(VALIDATORS),
+        help=f"comma separated list of: {', '.join(VALIDATORS)}",
+    )
+    parser.add_argument("--format", choices=FORMATS, help="defaults to extension")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    file_format = args.format
+    if file_format is None:
+        file_format = "jsonl" if args.input.endswith(".jsonl") else "csv"
+
+    names = [name for name in args.validators.split(",") if name]
+    # Before opening, and truncating, the output file
+    try:
+        check_options(names, file_format)
+    except ValueError as error:
+        parser.error(str(error))
+
+    # pylint: disable=consider-using-with
+    source = (
+        sys.stdin
+        if args.input == "-"
+        else open(args.input, encoding="utf-8", newline="")
+    )
+    destination = (
+        sys.stdout
+        if args.output == "-"
+        else open(args.output, "w", encoding="utf-8", newline="")
+    )
+
+    try:
+        summary = validate_stream(
+            source, destination, names, file_format, args.chunk_size
+        )
+    finally:
+        for stream in (source, destination):
+            if stream not in (sys.stdin, sys.stdout):
+                stream.close()
+
+    print(json.dumps(summary), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
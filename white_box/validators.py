@@ -0,0 +1,668 @@
+# -*- coding: utf-8 -*-
+
+"""
+Structured validators for the validation exercises.
+"""
+import calendar
+import ipaddress
+import re
+import sys
+from array import array
+from collections import namedtuple
+from datetime import date
+
+from white_box.columns import int64_bytes
+
+UrlParts = namedtuple("UrlParts", "scheme host port path query fragment")
+EmailParts = namedtuple("EmailParts", "local domain")
+
+MAX_URL_LENGTH = 255
+MAX_EMAIL_LENGTH = 254
+MAX_LOCAL_PART_LENGTH = 64
+MAX_HOSTNAME_LENGTH = 253
+CARD_LENGTHS = range(13, 17)
+DATE_YEARS = range(1900, 2101)
+
+# (prefix length, first prefix, last prefix, issuer), most specific first
+CARD_ISSUERS = (
+    (6, 622126, 622925, "Discover"),
+    (4, 2221, 2720, "Mastercard"),
+    (4, 3528, 3589, "JCB"),
+    (4, 6011, 6011, "Discover"),
+    (3, 300, 305, "Diners Club"),
+    (3, 644, 649, "Discover"),
+    (2, 34, 34, "American Express"),
+    (2, 36, 36, "Diners Club"),
+    (2, 37, 37, "American Express"),
+    (2, 38, 38, "Diners Club"),
+    (2, 51, 55, "Mastercard"),
+    (2, 65, 65, "Discover"),
+    (1, 4, 4, "Visa"),
+)
+
+
+def _visible(excluded=""):
+    """
+    Provides a regex class of the printable ASCII characters other than
+    space and the excluded ones.
+    """
+    return (
+        "["
+        + re.escape("".join(sorted(set(map(chr, range(33, 127))) - set(excluded))))
+        + "]"
+    )
+
+
+LABEL = r"(?!-)[A-Za-z0-9-]{1,63}(?<!-)"
+HOSTNAME = re.compile(rf"(?=.{{1,{MAX_HOSTNAME_LENGTH}}}\Z)(?:{LABEL}\.)*{LABEL}")
+ATOM = r"[A-Za-z0-9!#$%&'*+/=?^_`{|}~-]+"
+# Domain labels without the lookarounds of LABEL, which are slow in re:
+# _has_valid_labels checks their hyphens and lengths after the match
+EMAIL = re.compile(
+    rf"(?=.{{1,{MAX_LOCAL_PART_LENGTH}}}@)({ATOM}(?:\.{ATOM})*)"
+    r"@((?:[A-Za-z0-9][A-Za-z0-9-]*\.)+(?:[A-Za-z]{2,63}|xn--[A-Za-z0-9-]{1,59}))",
+    re.ASCII,
+)
+# Printable ASCII without spaces only, so no isprintable() pre-filter
+URL = re.compile(
+    rf"(https?)://(?:{_visible('@/?#')}*@)?"
+    r"(\[[^\]/?#]*\]|[A-Za-z0-9](?:[A-Za-z0-9.-]*[A-Za-z0-9])?)(?::(\d{1,5}))?"
+    rf"((?:/{_visible('?#')}*)?)(?:\?({_visible('#')}*))?(?:#({_visible()}*))?",
+    re.ASCII,
+)
+
+
+def is_valid_hostname(hostname):
+    """
+    Checks a DNS hostname: dot separated labels of letters, digits and
+    hyphens, not starting or ending with a hyphen.
+    """
+    return HOSTNAME.fullmatch(hostname) is not None
+
+
+def _has_valid_labels(hostname):
+    """
+    Checks the labels of a hostname made of letters, digits, dots and
+    hyphens, starting and ending with a letter or digit: none empty, none
+    starting or ending with a hyphen and none longer than 63 characters.
+    """
+    if ".." in hostname or "-" in hostname and (".-" in hostname or "-." in hostname):
+        return False
+
+    return len(hostname) <= 63 or max(map(len, hostname.split("."))) <= 63
+
+
+def _is_valid_url_host(host):
+    """
+    Checks the host of a URL: a hostname or a (bracketed IPv6) IP address.
+    """
+    if host.startswith("["):
+        try:
+            return ipaddress.ip_address(host[1:-1]).version == 6
+        except ValueError:
+            return False
+
+    return _has_valid_labels(host)
+
+
+def _match_url(url):
+    """
+    Provides the URL match of a valid http(s) URL, or None. The length
+    and scheme are checked before the full parse.
+    """
+    if len(url) > MAX_URL_LENGTH or not url.startswith(("http://", "https://")):
+        return None
+
+    match = URL.fullmatch(url)
+    if match is None or not _is_valid_url_host(match[2]):
+        return None
+
+    if match[3] is not None and int(match[3]) > 65535:
+        return None
+
+    return match
+
+
+def parse_url(url):
+    """
+    Splits an http(s) URL into its components, or returns None when it is
+    invalid.
+    """
+    match = _match_url(url)
+    if match is None:
+        return None
+
+    scheme, host, port, path, query, fragment = match.groups()
+    host = host.strip("[]").lower()
+    port = None if port is None else int(port)
+    return UrlParts(scheme, host, port, path, query or "", fragment or "")
+
+
+def _match_email(email):
+    """
+    Provides the email match of a valid email address, or None. The
+    length is checked before the full parse.
+    """
+    if not 6 <= len(email) <= MAX_EMAIL_LENGTH:
+        return None
+
+    match = EMAIL.fullmatch(email)
+    if match is None or not _has_valid_labels(match[2]):
+        return None
+
+    return match
+
+
+def parse_email(email):
+    """
+    Splits an email address into local part and domain, or returns None
+    when it is invalid. Local parts are dot-atoms (quoted strings are not
+    supported) and domains need a top level domain.
+    """
+    match = _match_email(email)
+    if match is None:
+        return None
+
+    return EmailParts(*match.groups())
+
+
+def is_valid_url(url):
+    """
+    Checks an http(s) URL.
+    """
+    return _match_url(url) is not None
+
+
+def is_valid_email(email):
+    """
+    Checks an email address.
+    """
+    return _match_email(email) is not None
+
+
+def validate_urls(urls):
+    """
+    Lazily validates an iterable of URLs, yielding one result each.
+    """
+    return map(is_valid_url, urls)
+
+
+def validate_emails(emails):
+    """
+    Lazily validates an iterable of email addresses, yielding one result each.
+    """
+    return map(is_valid_email, emails)
+
+
+def _byte_table(function):
+    """
+    Builds a bytes.translate table mapping every byte through function.
+    """
+    return bytes(function(byte) for byte in range(256))
+
+
+def _number(column):
+    """
+    Provides a bytes column as a big integer, first byte first.
+    """
+    return int.from_bytes(column, "big")
+
+
+DIGIT_VALUES = _byte_table(lambda b: b - 48 if 48 <= b <= 57 else 0)
+DOUBLED_DIGIT_VALUES = _byte_table(
+    lambda b: (2 * (b - 48)) % 9 if 48 <= b <= 56 else 9 if b == 57 else 0
+)
+IS_DIGIT = _byte_table(lambda b: 48 <= b <= 57)
+IS_NOT_PADDING = _byte_table(lambda b: not (48 <= b <= 57 or b == 32))
+IS_MULTIPLE_OF_10 = _byte_table(lambda b: b % 10 == 0)
+IS_CARD_LENGTH = _byte_table(lambda b: b in CARD_LENGTHS)
+IS_ZERO = _byte_table(lambda b: b == 0)
+IS_TWO = _byte_table(lambda b: b == 2)
+
+
+def passes_luhn(number):
+    """
+    Checks the Luhn checksum of a string of ASCII digits.
+    """
+    digits = number.encode("ascii")[::-1]
+    total = sum(digits[0::2].translate(DIGIT_VALUES))
+    total += sum(digits[1::2].translate(DOUBLED_DIGIT_VALUES))
+    return total % 10 == 0
+
+
+def is_valid_card(number):
+    """
+    Checks a card number: 13 to 16 ASCII digits with a valid Luhn checksum.
+    """
+    return (
+        len(number) in CARD_LENGTHS
+        and number.isascii()
+        and number.isdigit()
+        and passes_luhn(number)
+    )
+
+
+def card_issuer(number):
+    """
+    Provides the issuer of a card number from its prefix (BIN/IIN),
+    or None when it is unknown.
+    """
+    for length, first, last, issuer in CARD_ISSUERS:
+        prefix = number[:length]
+        if len(prefix) == length and prefix.isdigit() and first <= int(prefix) <= last:
+            return issuer
+
+    return None
+
+
+def _issuer_code(low, high):
+    """
+    Provides the issuer code of the 6-digit prefixes from low to high,
+    0 when none is known, or None when they have different issuers.
+    """
+    for length, first, last, issuer in CARD_ISSUERS:
+        scale = 10 ** (6 - length)
+        if first * scale <= high and low < (last + 1) * scale:
+            if first * scale <= low and high < (last + 1) * scale:
+                return CARD_ISSUER_NAMES.index(issuer)
+            return None
+
+    return 0
+
+
+def _issuer_tables(low=0, size=10**4):
+    """
+    Builds the issuer code table of the 100 two-digit parts of the 6-digit
+    prefixes from low, with the (part selector, tables) of the parts whose
+    prefixes have several issuers, refined on the next two digits.
+    """
+    codes = [
+        _issuer_code(low + part * size, low + (part + 1) * size - 1)
+        for part in range(100)
+    ]
+    splits = tuple(
+        (
+            _byte_table(lambda b, part=part: 255 if b == part else 0),
+            _issuer_tables(low + part * size, size // 100),
+        )
+        for part, code in enumerate(codes)
+        if code is None
+    )
+    return _byte_table(lambda b: codes[b] or 0 if b < 100 else 0), splits
+
+
+# Issuer names by code, code 0 being an unknown issuer
+CARD_ISSUER_NAMES = (None,) + tuple(sorted({issuer for *_, issuer in CARD_ISSUERS}))
+ISSUER_TABLES = _issuer_tables()
+LENGTH_SELECTORS = {
+    length: _byte_table(lambda b, length=length: 255 if b == length else 0)
+    for length in CARD_LENGTHS
+}
+
+
+def _check_card_columns(columns, count):
+    """
+    Checks the digit columns of right-aligned card numbers.
+    Returns the valid mask as a big int and the digit counts as bytes.
+    """
+    # Per-record sums stay below 256, so adding the columns as big
+    # integers never carries from one record into the next one.
+    checksum = digits = invalid = previous = 0
+    for position, column in enumerate(columns):
+        doubled = (len(columns) - position) % 2 == 0
+        checksum += _number(
+            column.translate(DOUBLED_DIGIT_VALUES if doubled else DIGIT_VALUES)
+        )
+        is_digit = _number(column.translate(IS_DIGIT))
+        digits += is_digit
+        invalid += _number(column.translate(IS_NOT_PADDING))
+        # A byte of 2 * previous + current equal to 2 is padding after a digit
+        gaps = (2 * previous + is_digit).to_bytes(count, "big").translate(IS_TWO)
+        invalid += _number(gaps)
+        previous = is_digit
+
+    def mask(total, table):
+        return _number(total.to_bytes(count, "big").translate(table))
+
+    digits = digits.to_bytes(count, "big")
+    valid = mask(checksum, IS_MULTIPLE_OF_10) & _number(
+        digits.translate(IS_CARD_LENGTH)
+    )
+    return valid & mask(invalid, IS_ZERO), digits
+
+
+def _card_prefixes(columns, digits):
+    """
+    Provides the first six digits of right-aligned card numbers as three
+    byte columns of two-digit parts, taken where each length starts.
+    """
+    pairs = {}
+    parts = [0, 0, 0]
+    for length in CARD_LENGTHS:
+        start = len(columns) - length
+        if start < 0:
+            continue
+
+        selected = _number(digits.translate(LENGTH_SELECTORS[length]))
+        if not selected:
+            continue
+
+        for index in range(3):
+            position = start + 2 * index
+            if position not in pairs:
+                pairs[position] = _number(
+                    columns[position].translate(TENS_VALUES)
+                ) + _number(columns[position + 1].translate(DIGIT_VALUES))
+            parts[index] |= pairs[position] & selected
+
+    return [part.to_bytes(len(digits), "big") for part in parts]
+
+
+def _issuer_codes(parts, tables, selected):
+    """
+    Provides the issuer codes of the prefix parts as a big int, for the
+    records with a 255 byte in selected.
+    """
+    table, splits = tables
+    codes = _number(parts[0].translate(table)) & selected
+    for selector, part_tables in splits:
+        part_selected = selected & _number(parts[0].translate(selector))
+        if part_selected:
+            codes |= _issuer_codes(parts[1:], part_tables, part_selected)
+    return codes
+
+
+def _record_columns(buffer, record_size, offset, width):
+    """
+    Provides the record count and the byte columns of a field of the
+    fixed-width records of a buffer. The buffer is copied to bytes first,
+    as strided slices of bytes are several times faster than those of a
+    memoryview. RecordFile.scan passes one block at a time, which bounds
+    the copy.
+    """
+    buffer = bytes(buffer)
+    count, remainder = divmod(len(buffer), record_size)
+    if remainder:
+        raise ValueError("The buffer size is not a multiple of the record size")
+
+    return count, [
+        buffer[offset + position :: record_size] for position in range(width)
+    ]
+
+
+def scan_card_records(buffer, width=16, record_size=None, offset=0):
+    """
+    Checks the card numbers stored in a buffer of fixed-width records,
+    each with a width bytes field at offset, left padded with spaces.
+    Returns a bytearray with 1 for every valid record and 0 otherwise,
+    and a bytearray of the issuer codes (indexes of CARD_ISSUER_NAMES)
+    of the valid records, 0 for the others.
+    Every digit position of all the records is processed at once with
+    bytes.translate, so the cost per record is a few C-level byte ops.
+    """
+    record_size = width if record_size is None else record_size
+    if not 0 < width <= 28 or offset + width > record_size:
+        raise ValueError("The card field must fit in the record (28 bytes max)")
+
+    count, columns = _record_columns(buffer, record_size, offset, width)
+    valid, digits = _check_card_columns(columns, count)
+    mask = bytearray(valid.to_bytes(count, "big"))
+
+    # Issuers are looked up on the prefixes of the valid records only
+    parts = _card_prefixes(columns, digits)
+    issuers = _issuer_codes(parts, ISSUER_TABLES, _number(mask.translate(FULL_BYTES)))
+    return mask, bytearray(issuers.to_bytes(count, "big"))
+
+
+def _card_fields(numbers):
+    """
+    Encodes card numbers as 16 bytes records for scan_card_records.
+    """
+    fields = "".join(
+        card.rjust(16) if len(card) <= 16 and " " not in card else "!" * 16
+        for card in numbers
+    )
+    return fields.encode("ascii", "replace")
+
+
+def validate_cards(numbers):
+    """
+    Validates many card numbers at once with scan_card_records.
+    Returns one boolean per number.
+    """
+    return [bool(flag) for flag in scan_card_records(_card_fields(numbers))[0]]
+
+
+def card_issuers(numbers):
+    """
+    Provides the issuers of many card numbers at once with
+    scan_card_records, None for the invalid numbers and unknown issuers.
+    """
+    issuers = scan_card_records(_card_fields(numbers))[1]
+    return [CARD_ISSUER_NAMES[code] for code in issuers]
+
+
+def _month_length(key):
+    """
+    Provides the length of a month from its key: month + 16 in leap years.
+    """
+    month, leap = key & 15, key >> 4
+    if not 1 <= month <= 12:
+        return 0
+    return calendar.mdays[month] + (leap and month == 2)
+
+
+def _days_before_month(key):
+    """
+    Provides the days of the year before a month from its key.
+    """
+    return sum(map(_month_length, range(key & ~15 | 1, key)))
+
+
+def _year_tables(high, base):
+    """
+    Builds the (selector, offset, validity) tables for the low part of the
+    years in DATE_YEARS written as high * base + low.
+    """
+
+    def offset(low):
+        year = high * base + low
+        return year - DATE_YEARS.start if low < base and year in DATE_YEARS else None
+
+    return (
+        _byte_table(lambda b: 255 if b == high else 0),
+        _byte_table(lambda b: offset(b) or 0),
+        _byte_table(lambda b: offset(b) is not None),
+    )
+
+
+def _year_start_bytes():
+    """
+    Builds one table per byte of the epoch day of January 1st of every year
+    offset, as unsigned 64-bit values (two's complement). Offsets out of
+    DATE_YEARS give zero bytes.
+    """
+    starts = [start % 2**64 for start in YEAR_STARTS]
+    starts += [0] * (256 - len(starts))
+    return tuple(
+        bytes(start >> shift & 255 for start in starts) for shift in range(0, 64, 8)
+    )
+
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+YEAR_STARTS = tuple(date(year, 1, 1).toordinal() - EPOCH_ORDINAL for year in DATE_YEARS)
+LEAP_KEYS = _byte_table(
+    lambda o: 16 if o < len(DATE_YEARS) and calendar.isleap(DATE_YEARS[o]) else 0
+)
+DAYS_IN_MONTH = _byte_table(_month_length)
+DAYS_BEFORE_MONTH = tuple(map(_days_before_month, range(32)))
+MONTH_START_BYTES = (
+    _byte_table(lambda key: _days_before_month(key) & 255),
+    _byte_table(lambda key: _days_before_month(key) >> 8),
+)
+YEAR_START_BYTES = _year_start_bytes()
+YEAR_BYTE_TABLES = [_year_tables(high, 256) for high in {y >> 8 for y in DATE_YEARS}]
+YEAR_DIGIT_TABLES = [_year_tables(high, 100) for high in {y // 100 for y in DATE_YEARS}]
+MONTH_VALUES = _byte_table(lambda b: b if 1 <= b <= 12 else 0)
+DAY_VALUES = _byte_table(lambda b: b if 1 <= b <= 31 else 63)
+DAY_INDEXES = _byte_table(lambda b: b - 1 if 1 <= b <= 31 else 0)
+TENS_VALUES = _byte_table(lambda b: 10 * (b - 48) if 48 <= b <= 57 else 0)
+IS_NOT_DIGIT = _byte_table(lambda b: not 48 <= b <= 57)
+IS_AT_LEAST_64 = _byte_table(lambda b: b >= 64)
+FULL_BYTES = _byte_table(lambda b: 255 if b else 0)
+
+
+def date_to_epoch_day(year, month, day):
+    """
+    Provides the number of days since 1970-01-01 of a date, or None when
+    the date does not exist or its year is out of DATE_YEARS.
+    """
+    if year in DATE_YEARS and 1 <= month <= 12:
+        offset = year - DATE_YEARS.start
+        key = month + LEAP_KEYS[offset]
+        if 1 <= day <= DAYS_IN_MONTH[key]:
+            return YEAR_STARTS[offset] + DAYS_BEFORE_MONTH[key] + day - 1
+
+    return None
+
+
+def is_valid_date(year, month, day):
+    """
+    Checks a date against the calendar, leap years included.
+    """
+    return date_to_epoch_day(year, month, day) is not None
+
+
+def validate_dates(years, months, days):
+    """
+    Validates columns of years, months and days (sequences or arrays of
+    integers) in a single pass.
+    Returns a bytearray with 1 for every valid date and an array("q") of
+    their epoch days (0 for the invalid ones).
+    Each step processes a whole column with bytes.translate and big-int
+    arithmetic, so no Python code runs per row.
+    """
+    count = len(years)
+    if not len(months) == count == len(days):
+        raise ValueError("The date columns must have the same length")
+
+    year_data, month_data, day_data = map(int64_bytes, (years, months, days))
+
+    def column(value):
+        return value.to_bytes(count, "big")
+
+    # Years need their two low bytes, months and days only the lowest one
+    upper = 0
+    for position in range(1, 8):
+        upper |= _number(month_data[position::8]) | _number(day_data[position::8])
+        if position > 1:
+            upper |= _number(year_data[position::8])
+    valid = _number(column(upper).translate(IS_ZERO))
+
+    return _date_bytes_to_epoch_days(
+        valid,
+        (year_data[1::8], year_data[0::8], YEAR_BYTE_TABLES),
+        month_data[0::8],
+        day_data[0::8],
+    )
+
+
+def scan_date_records(buffer, record_size=8, offset=0):
+    """
+    Checks the YYYYMMDD ASCII dates stored in a buffer of fixed-width
+    records, each with the date at offset.
+    Returns the same mask and epoch days as validate_dates.
+    """
+    if offset + 8 > record_size:
+        raise ValueError("The date field must fit in the record")
+
+    count, columns = _record_columns(buffer, record_size, offset, 8)
+    invalid = 0
+    for column in columns:
+        invalid |= _number(column.translate(IS_NOT_DIGIT))
+    valid = _number(invalid.to_bytes(count, "big").translate(IS_ZERO))
+
+    # Two digits make at most 99, so the columns can be added as big ints
+    centuries, years, months, days = (
+        (
+            _number(tens.translate(TENS_VALUES))
+            + _number(units.translate(DIGIT_VALUES))
+        ).to_bytes(count, "big")
+        for tens, units in zip(columns[0::2], columns[1::2])
+    )
+    return _date_bytes_to_epoch_days(
+        valid, (centuries, years, YEAR_DIGIT_TABLES), months, days
+    )
+
+
+def _year_offsets(year_columns):
+    """
+    Provides the offsets in DATE_YEARS of years stored as byte columns,
+    and the mask of the known years as a big int. year_columns is
+    (high part, low part, year tables).
+    """
+    high_years, low_years, year_tables = year_columns
+    offsets = known_years = 0
+    for selector, offset_table, valid_table in year_tables:
+        selected = _number(high_years.translate(selector))
+        offsets |= _number(low_years.translate(offset_table)) & selected
+        known_years |= _number(low_years.translate(valid_table)) & selected
+    return offsets.to_bytes(len(low_years), "big"), known_years
+
+
+def _sum_lanes(parts, count):
+    """
+    Sums byte columns translated into 64-bit lanes, one table per byte of
+    the lanes, into an array("q"). Epoch days never overflow the lanes.
+    """
+    total = 0
+    for source, tables in parts:
+        lanes = bytearray(8 * count)
+        for position, table in enumerate(tables):
+            lanes[position::8] = source.translate(table)
+        total += int.from_bytes(lanes, "little")
+
+    values = array("q")
+    values.frombytes(total.to_bytes(8 * count, "little"))
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _date_bytes_to_epoch_days(valid, year_columns, months, days):
+    """
+    Validates dates stored as byte columns and computes their epoch days.
+    valid is a big int with a 1 byte for every well formed row, year_columns
+    is (high part, low part, year tables) and months and days hold the raw
+    month and day numbers.
+    """
+    count = len(months)
+
+    def column(value):
+        return value.to_bytes(count, "big")
+
+    offsets, known_years = _year_offsets(year_columns)
+    valid &= known_years
+
+    # Keys and 64 + month length - day stay within a byte: no carries
+    keys = column(
+        _number(months.translate(MONTH_VALUES)) + _number(offsets.translate(LEAP_KEYS))
+    )
+    room = (
+        _number(keys.translate(DAYS_IN_MONTH))
+        + _number(b"\x40" * count)
+        - _number(days.translate(DAY_VALUES))
+    )
+    valid &= _number(column(room).translate(IS_AT_LEAST_64))
+    mask = bytearray(column(valid))
+
+    # Invalid rows get an out of range year offset and zero keys and days,
+    # which all translate to zero bytes in the epoch day lanes.
+    selected = _number(mask.translate(FULL_BYTES))
+    offsets = column(_number(offsets) | (_number(b"\xff" * count) ^ selected))
+    parts = (
+        (offsets, YEAR_START_BYTES),
+        (column(_number(keys) & selected), MONTH_START_BYTES),
+        (column(_number(days) & selected), (DAY_INDEXES,)),
+    )
+    return mask, _sum_lanes(parts, count)